@@ -9,8 +9,13 @@ Usage:
     python scripts/add_game_over_shooter.py [input.gif] [output.gif] [--stats stats.json]
     Defaults: shooter.gif -> shooter.gif (in-place), no stats (zeros)
 """
-import sys, json, random, math
+import sys, io, os, json, random, math, time
 from PIL import Image, ImageDraw
+import perf
+import gif_writer
+import frame_store
+import pixel_font
+import scene
 
 # ---------------------------------------------------------------------------
 # Palette (from actual shooter.gif analysis)
@@ -28,72 +33,8 @@ WHITE      = (255, 255, 255)
 # HUD strip dimensions
 HUD_H      = 52                  # pixels above the game (needs 2 rows: label + values)
 
-# ---------------------------------------------------------------------------
-# 5×7 pixel-art font  (7 rows × 5 cols)
-# ---------------------------------------------------------------------------
-PIXEL_FONT = {
-    ' ': [[0]*5]*7,
-    '!': [[0,0,1,0,0],[0,0,1,0,0],[0,0,1,0,0],[0,0,1,0,0],
-          [0,0,1,0,0],[0,0,0,0,0],[0,0,1,0,0]],
-    '>': [[1,0,0,0,0],[0,1,0,0,0],[0,0,1,0,0],[0,0,0,1,0],
-          [0,0,1,0,0],[0,1,0,0,0],[1,0,0,0,0]],
-    '<': [[0,0,0,0,1],[0,0,0,1,0],[0,0,1,0,0],[0,1,0,0,0],
-          [0,0,1,0,0],[0,0,0,1,0],[0,0,0,0,1]],
-    '0': [[0,1,1,1,0],[1,0,0,0,1],[1,0,0,1,1],[1,0,1,0,1],
-          [1,1,0,0,1],[1,0,0,0,1],[0,1,1,1,0]],
-    '1': [[0,0,1,0,0],[0,1,1,0,0],[0,0,1,0,0],[0,0,1,0,0],
-          [0,0,1,0,0],[0,0,1,0,0],[0,1,1,1,0]],
-    '2': [[0,1,1,1,0],[1,0,0,0,1],[0,0,0,0,1],[0,0,0,1,0],
-          [0,0,1,0,0],[0,1,0,0,0],[1,1,1,1,1]],
-    '3': [[1,1,1,1,0],[0,0,0,0,1],[0,0,0,0,1],[0,1,1,1,0],
-          [0,0,0,0,1],[0,0,0,0,1],[1,1,1,1,0]],
-    '4': [[0,0,0,1,0],[0,0,1,1,0],[0,1,0,1,0],[1,0,0,1,0],
-          [1,1,1,1,1],[0,0,0,1,0],[0,0,0,1,0]],
-    '5': [[1,1,1,1,1],[1,0,0,0,0],[1,0,0,0,0],[1,1,1,1,0],
-          [0,0,0,0,1],[0,0,0,0,1],[1,1,1,1,0]],
-    '6': [[0,1,1,1,0],[1,0,0,0,0],[1,0,0,0,0],[1,1,1,1,0],
-          [1,0,0,0,1],[1,0,0,0,1],[0,1,1,1,0]],
-    '7': [[1,1,1,1,1],[0,0,0,0,1],[0,0,0,1,0],[0,0,1,0,0],
-          [0,0,1,0,0],[0,0,1,0,0],[0,0,1,0,0]],
-    '8': [[0,1,1,1,0],[1,0,0,0,1],[1,0,0,0,1],[0,1,1,1,0],
-          [1,0,0,0,1],[1,0,0,0,1],[0,1,1,1,0]],
-    '9': [[0,1,1,1,0],[1,0,0,0,1],[1,0,0,0,1],[0,1,1,1,1],
-          [0,0,0,0,1],[0,0,0,0,1],[0,1,1,1,0]],
-    'A': [[0,1,1,1,0],[1,0,0,0,1],[1,0,0,0,1],[1,1,1,1,1],
-          [1,0,0,0,1],[1,0,0,0,1],[1,0,0,0,1]],
-    'C': [[0,1,1,1,1],[1,0,0,0,0],[1,0,0,0,0],[1,0,0,0,0],
-          [1,0,0,0,0],[1,0,0,0,0],[0,1,1,1,1]],
-    'E': [[1,1,1,1,1],[1,0,0,0,0],[1,0,0,0,0],[1,1,1,1,0],
-          [1,0,0,0,0],[1,0,0,0,0],[1,1,1,1,1]],
-    'G': [[0,1,1,1,0],[1,0,0,0,0],[1,0,0,0,0],[1,0,1,1,1],
-          [1,0,0,0,1],[1,0,0,0,1],[0,1,1,1,0]],
-    'I': [[1,1,1,1,1],[0,0,1,0,0],[0,0,1,0,0],[0,0,1,0,0],
-          [0,0,1,0,0],[0,0,1,0,0],[1,1,1,1,1]],
-    'L': [[1,0,0,0,0],[1,0,0,0,0],[1,0,0,0,0],[1,0,0,0,0],
-          [1,0,0,0,0],[1,0,0,0,0],[1,1,1,1,1]],
-    'M': [[1,0,0,0,1],[1,1,0,1,1],[1,0,1,0,1],[1,0,0,0,1],
-          [1,0,0,0,1],[1,0,0,0,1],[1,0,0,0,1]],
-    'N': [[1,0,0,0,1],[1,1,0,0,1],[1,0,1,0,1],[1,0,0,1,1],
-          [1,0,0,0,1],[1,0,0,0,1],[1,0,0,0,1]],
-    'O': [[0,1,1,1,0],[1,0,0,0,1],[1,0,0,0,1],[1,0,0,0,1],
-          [1,0,0,0,1],[1,0,0,0,1],[0,1,1,1,0]],
-    'P': [[1,1,1,1,0],[1,0,0,0,1],[1,0,0,0,1],[1,1,1,1,0],
-          [1,0,0,0,0],[1,0,0,0,0],[1,0,0,0,0]],
-    'R': [[1,1,1,1,0],[1,0,0,0,1],[1,0,0,0,1],[1,1,1,1,0],
-          [1,0,1,0,0],[1,0,0,1,0],[1,0,0,0,1]],
-    'S': [[0,1,1,1,1],[1,0,0,0,0],[1,0,0,0,0],[0,1,1,1,0],
-          [0,0,0,0,1],[0,0,0,0,1],[1,1,1,1,0]],
-    'T': [[1,1,1,1,1],[0,0,1,0,0],[0,0,1,0,0],[0,0,1,0,0],
-          [0,0,1,0,0],[0,0,1,0,0],[0,0,1,0,0]],
-    'U': [[1,0,0,0,1],[1,0,0,0,1],[1,0,0,0,1],[1,0,0,0,1],
-          [1,0,0,0,1],[1,0,0,0,1],[0,1,1,1,0]],
-    'V': [[1,0,0,0,1],[1,0,0,0,1],[1,0,0,0,1],[1,0,0,0,1],
-          [1,0,0,0,1],[0,1,0,1,0],[0,0,1,0,0]],
-    'W': [[1,0,0,0,1],[1,0,0,0,1],[1,0,0,0,1],[1,0,1,0,1],
-          [1,0,1,0,1],[1,1,0,1,1],[1,0,0,0,1]],
-    'Y': [[1,0,0,0,1],[1,0,0,0,1],[0,1,0,1,0],[0,0,1,0,0],
-          [0,0,1,0,0],[0,0,1,0,0],[0,0,1,0,0]],
-}
+# 5×7 pixel-art font (shared with the snake, see pixel_font.py)
+PIXEL_FONT = pixel_font.SMALL
 
 # ---------------------------------------------------------------------------
 # Heart bitmap  (5 wide × 4 tall; 1=filled pixel)
@@ -109,32 +50,19 @@ HEART_BITMAP = [
 def draw_pixel_text(draw, text, x, y, color, px=2, gap=1,
                     right_align_x=None, center_in_width=None):
     """Render pixel-art text. Supports left / right-aligned / centred modes."""
-    char_w  = 5 * (px + gap)
-    char_gap = px + 1
-    text_w  = len(text) * (char_w + char_gap) - char_gap
+    text_w = PIXEL_FONT.text_width(text, px, gap)
 
     if center_in_width is not None:
         x = (center_in_width - text_w) // 2
     elif right_align_x is not None:
         x = right_align_x - text_w
 
-    cx = x
-    for ch in text:
-        bm = PIXEL_FONT.get(ch, PIXEL_FONT[' '])
-        for ri, row in enumerate(bm):
-            for ci, lit in enumerate(row):
-                if lit:
-                    rx = cx + ci * (px + gap)
-                    ry = y  + ri * (px + gap)
-                    draw.rectangle([rx, ry, rx+px-1, ry+px-1], fill=color)
-        cx += char_w + char_gap
+    PIXEL_FONT.draw(draw, text, x, y, color, px, gap)
     return text_w
 
 
 def px_text_w(text, px=2, gap=1):
-    char_w   = 5 * (px + gap)
-    char_gap = px + 1
-    return len(text) * (char_w + char_gap) - char_gap
+    return PIXEL_FONT.text_width(text, px, gap)
 
 
 def draw_heart(draw, x, y, px=3, state='full'):
@@ -387,64 +315,16 @@ def blend(base: Image.Image, overlay: Image.Image) -> Image.Image:
     return b.convert('RGB')
 
 
-# ---------------------------------------------------------------------------
-# Main entry-point
-# ---------------------------------------------------------------------------
-def add_hud_and_game_over(input_path: str, output_path: str,
-                          total_score: int = 0,
-                          days_active: int = 1,
-                          missed_days: int = 0,
-                          frame_delay_ms: int = 50,
-                          flicker_count:  int = 6,
-                          solid_count:    int = 28,
-                          fade_count:     int = 10,
-                          dark_pause:     int = 4):
-
-    print(f"Opening {input_path} …")
-    src  = Image.open(input_path)
-    game_size = src.size          # e.g. (860, 230)
-    gw, gh   = game_size
-    canvas_w  = gw
-    canvas_h  = gh + HUD_H       # extended height
-
-    orig_frames, orig_durations = [], []
-    try:
-        while True:
-            orig_frames.append(src.copy().convert('RGB'))
-            orig_durations.append(src.info.get('duration', 20))
-            src.seek(src.tell() + 1)
-    except EOFError:
-        pass
-
-    n_orig = len(orig_frames)
-    print(f"  {n_orig} original frames  →  extended canvas {canvas_w}×{canvas_h}")
-
-    # Half-hearts: 10 max (5 full hearts), minus missed_days (capped 0-10)
-    lives_halves = max(0, 10 - min(10, missed_days))
-    level        = days_active
-    score_curve  = build_score_curve(n_orig, total_score)
-
-    # ---- Build extended HUD frames for original game ----
-    all_frames, all_durations = [], []
-
-    def make_extended_frame(game_frame: Image.Image, score_now: int,
-                             frame_idx: int) -> Image.Image:
-        canvas = Image.new('RGB', (canvas_w, canvas_h), BG_COLOR)
-        canvas.paste(game_frame, (0, HUD_H))
-        draw = ImageDraw.Draw(canvas)
-        draw_hud(draw, canvas_w, score_now, level, lives_halves,
-                 frame_index=frame_idx)
-        return canvas
-
-    for i, gf in enumerate(orig_frames):
-        all_frames.append(make_extended_frame(gf, score_curve[i], i))
-        all_durations.append(orig_durations[i])
-
-    last_game = orig_frames[-1]
-    final_score = total_score
-
-    # ---- STAGE CLEAR end screen ----
-    stage_clear_size = (canvas_w, canvas_h)
+def stage_clear_frames(last_game, final_score, level, lives_halves,
+                       frame_delay_ms=50, flicker_count=6, solid_count=28,
+                       fade_count=10, dark_pause=4, frame_index=9999):
+    """
+    Yield (frame, duration) for the STAGE CLEAR tail over `last_game`
+    (the final game-area frame): flicker in, blinking hold, fade, dark pause.
+    frame_index is the HUD blink phase for the whole tail.
+    """
+    gw, gh = last_game.size
+    canvas_w, canvas_h = gw, gh + HUD_H
 
     def make_sc_with_hud(sc_alpha, show_prompt):
         # Extend the stage-clear overlay to full canvas height
@@ -459,52 +339,435 @@ def add_hud_and_game_over(input_path: str, output_path: str,
         ov_ext.paste(ov_full, (0, HUD_H))
         sc_rgba.alpha_composite(ov_ext)
         result = sc_rgba.convert('RGB')
-        # Draw HUD with locked final score — frame_index continues from game
+        # Draw HUD with locked final score
         draw = ImageDraw.Draw(result)
         draw_hud(draw, canvas_w, final_score, level, lives_halves,
-                 frame_index=n_orig + 9999)  # high index = blink always on for stage clear
+                 frame_index=frame_index)
         return result
 
     # Flicker in
     flicker_seq = [0, 160, 40, 210, 90, 255]
     for i in range(flicker_count):
         a = flicker_seq[i % len(flicker_seq)]
-        all_frames.append(make_sc_with_hud(a, show_prompt=False))
-        all_durations.append(frame_delay_ms)
+        yield make_sc_with_hud(a, show_prompt=False), frame_delay_ms
 
     # Solid hold with blinking prompt
     for i in range(solid_count):
         show_p = (i // 6) % 2 == 0
-        all_frames.append(make_sc_with_hud(255, show_prompt=show_p))
-        all_durations.append(frame_delay_ms)
+        yield make_sc_with_hud(255, show_prompt=show_p), frame_delay_ms
 
-    # Fade out
+    # Fade out (a track in frame units: frame i shows the value at i + 1)
+    fade = scene.Track([(0, 1), (fade_count, 0)])
     for i in range(fade_count):
-        a = int(255 * (1 - (i + 1) / fade_count))
-        all_frames.append(make_sc_with_hud(a, show_prompt=False))
-        all_durations.append(frame_delay_ms)
+        a = int(255 * fade.at(i + 1))
+        yield make_sc_with_hud(a, show_prompt=False), frame_delay_ms
 
     # Dark pause
     dark = Image.new('RGB', (canvas_w, canvas_h), BG_COLOR)
     for _ in range(dark_pause):
-        all_frames.append(dark.copy())
-        all_durations.append(frame_delay_ms)
+        yield dark.copy(), frame_delay_ms
 
-    print(f"  Saving {len(all_frames)} frames to {output_path} …")
 
-    out_frames = [f.convert('P', palette=Image.ADAPTIVE, colors=256)
-                  for f in all_frames]
-    out_frames[0].save(
-        output_path,
-        format='GIF',
-        save_all=True,
-        append_images=out_frames[1:],
-        duration=all_durations,
-        loop=0,
-        optimize=False,
-        disposal=2,
-    )
+# ---------------------------------------------------------------------------
+# Frame pipeline
+# ---------------------------------------------------------------------------
+def decode_frames(input_path, spill_dir=None):
+    """Every frame of the input GIF as RGB -> (frames, durations)."""
+    src = Image.open(input_path)
+    put_game, finish_game = frame_store.sink(src.size, spill_dir, "game")
+    durations = []
+    with perf.stage("decode"):
+        try:
+            while True:
+                duration = src.info.get('duration', 20)
+                put_game(src.copy().convert('RGB'), duration)
+                durations.append(duration)
+                src.seek(src.tell() + 1)
+        except EOFError:
+            pass
+        frames = finish_game()
+    perf.count("frames_decoded", len(frames))
+    return frames, durations
+
+
+def hud_frames(game_frames, durations, total_score, level, lives_halves, emit):
+    """
+    emit(frame, duration) each game frame on the taller canvas, with the
+    HUD above it and the score counting up to total_score.
+    """
+    gw, gh = game_frames[0].size
+    score_curve = build_score_curve(len(game_frames), total_score)
+    with perf.stage("hud"):
+        for i, gf in enumerate(game_frames):
+            canvas = Image.new('RGB', (gw, gh + HUD_H), BG_COLOR)
+            canvas.paste(gf, (0, HUD_H))
+            draw_hud(ImageDraw.Draw(canvas), gw, score_curve[i], level, lives_halves,
+                     frame_index=i)
+            emit(canvas, durations[i])
+        perf.count("hud_frames", len(game_frames))
+
+
+def build_frames(input_path: str,
+                 total_score: int = 0,
+                 days_active: int = 1,
+                 missed_days: int = 0,
+                 frame_delay_ms: int = 50,
+                 flicker_count:  int = 6,
+                 solid_count:    int = 28,
+                 fade_count:     int = 10,
+                 dark_pause:     int = 4,
+                 spill_dir:      str = None):
+    """
+    Decode the game, add the HUD and the stage-clear tail -> (frames, durations).
+
+    With spill_dir, decoded and output frames are written to memory-mapped
+    frame_store files there instead of being held in RAM; the returned
+    frames are then a FrameStore of zero-copy views.
+    """
+
+    print(f"Opening {input_path} …")
+    orig_frames, orig_durations = decode_frames(input_path, spill_dir)
+    gw, gh = orig_frames[0].size      # e.g. (860, 230)
+    canvas_w, canvas_h = gw, gh + HUD_H   # extended height
+
+    n_orig = len(orig_frames)
+    print(f"  {n_orig} original frames  →  extended canvas {canvas_w}×{canvas_h}")
+
+    # Half-hearts: 10 max (5 full hearts), minus missed_days (capped 0-10)
+    lives_halves = max(0, 10 - min(10, missed_days))
+    level        = days_active
+
+    # ---- Build extended HUD frames for original game ----
+    put_frame, finish_frames = frame_store.sink((canvas_w, canvas_h), spill_dir, "shooter")
+    all_durations = []
+
+    def emit(frame, duration):
+        put_frame(frame, duration)
+        all_durations.append(duration)
+
+    hud_frames(orig_frames, orig_durations, total_score, level, lives_halves, emit)
+
+    last_game = orig_frames[-1]
+    with perf.stage("stage_clear"):
+        for frame, duration in stage_clear_frames(
+                last_game, total_score, level, lives_halves, frame_delay_ms,
+                flicker_count, solid_count, fade_count, dark_pause,
+                frame_index=n_orig + 9999):  # high index = blink always on for stage clear
+            emit(frame, duration)
+        perf.count("stage_clear_frames", len(all_durations) - n_orig)
+
+    all_frames = finish_frames()
+    del last_game                     # a view onto orig_frames' mapping
+    frame_store.discard(orig_frames)
+    return all_frames, all_durations
+
+
+def quantize(frames, colors=256):
+    with perf.stage("quantize"):
+        return [frame_store.rgb(f).convert('P', palette=Image.ADAPTIVE, colors=colors)
+                for f in frames]
+
+
+def encode_gif(out_frames, durations, output):
+    """Write already-quantized frames; `output` is a path or file object."""
+    with perf.stage("encode"):
+        out_frames[0].save(
+            output,
+            format='GIF',
+            save_all=True,
+            append_images=out_frames[1:],
+            duration=durations,
+            loop=0,
+            optimize=False,
+            disposal=2,
+        )
+
+
+def encode_webp(frames, durations, output, lossless=True, quality=80):
+    with perf.stage("encode"):
+        frames[0].save(
+            output,
+            format='WEBP',
+            save_all=True,
+            append_images=frames[1:],
+            duration=durations,
+            loop=0,
+            lossless=lossless,
+            quality=quality,
+            method=4,
+        )
+
+
+def encode_apng(frames, durations, output):
+    with perf.stage("encode"):
+        frames = [frame_store.rgb(f) for f in frames]   # PNG has no RGBX
+        frames[0].save(
+            output,
+            format='PNG',
+            save_all=True,
+            append_images=frames[1:],
+            duration=durations,
+            loop=0,
+            disposal=0,   # APNG_DISPOSE_OP_NONE: frames are full canvases
+            blend=0,      # APNG_BLEND_OP_SOURCE
+        )
+
+
+def encode_gif_rgb(frames, durations, output, colors=256, workers=None):
+    """
+    Quantize + encode RGB frames.  workers=None keeps Pillow's serial
+    writer; any other value uses gif_writer's process pool (0 = all CPUs).
+    """
+    if workers is None:
+        encode_gif(quantize(frames, colors), durations, output)
+    else:
+        with perf.stage("encode"):
+            gif_writer.save_gif(frames, output, duration=durations, loop=0,
+                                disposal=2, colors=colors, workers=workers or None)
+
+
+# name -> (file extension, encoder(rgb_frames, durations, output, colors, workers))
+OUTPUT_FORMATS = {
+    'gif':        ('.gif',  encode_gif_rgb),
+    'webp':       ('.webp', lambda f, d, out, colors, workers=None: encode_webp(f, d, out, lossless=True)),
+    'webp-lossy': ('.webp', lambda f, d, out, colors, workers=None: encode_webp(f, d, out, lossless=False)),
+    'apng':       ('.png',  lambda f, d, out, colors, workers=None: encode_apng(f, d, out)),
+}
+
+
+def output_path_for(path, fmt):
+    """shooter.gif + webp -> shooter.webp; keeps paths that already match."""
+    ext = OUTPUT_FORMATS[fmt][0]
+    root, cur = os.path.splitext(path)
+    return path if cur.lower() == ext else root + ext
+
+
+def variant_path(path, scale):
+    """shooter.gif, 0.5 -> shooter@0.5x.gif (scale 1 keeps the path)."""
+    if scale == 1:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}@{scale:g}x{ext}"
+
+
+def scale_frames(frames, scale, spill_dir=None):
+    """Nearest-neighbour resize (keeps the pixel art crisp)."""
+    w, h = frames[0].size
+    size = (max(1, round(w * scale)), max(1, round(h * scale)))
+    put, finish = frame_store.sink(size, spill_dir, f"shooter@{scale:g}x")
+    with perf.stage("scale"):
+        for f in frames:
+            put(f.resize(size, Image.NEAREST), 0)
+    return finish()
+
+
+def compare_formats(frames, durations, colors=256, workers=None):
+    """Encode the same frames with every format in memory; returns rows."""
+    rows = []
+    for fmt, (_, encoder) in OUTPUT_FORMATS.items():
+        buf = io.BytesIO()
+        t0 = time.perf_counter()
+        encoder(frames, durations, buf, colors, workers=workers)
+        rows.append({"format": fmt, "bytes": buf.tell(),
+                     "encode_s": round(time.perf_counter() - t0, 3)})
+    smallest = min(r["bytes"] for r in rows)
+    print(f"  {'format':<11} {'bytes':>12} {'vs best':>8} {'encode':>8}")
+    for r in rows:
+        print(f"  {r['format']:<11} {r['bytes']:>12,} {r['bytes'] / smallest:>7.2f}x "
+              f"{r['encode_s']:>7.2f}s")
+    return rows
+
+
+def retime(frames, durations, max_fps=None):
+    """
+    Cap the frame rate by merging each frame that would start less than
+    1000/max_fps ms after the previous kept frame into that frame (its
+    duration is added), so the total running time is unchanged.
+    Returns (kept_indices, new_durations).
+    """
+    if not max_fps:
+        return list(range(len(frames))), list(durations)
+    min_ms = 1000.0 / max_fps
+    kept, out_d = [], []
+    for i, d in enumerate(durations):
+        if out_d and out_d[-1] < min_ms:
+            out_d[-1] += d
+        else:
+            kept.append(i)
+            out_d.append(d)
+    return kept, out_d
+
+
+# Tried in order until the encoded GIF fits: the palette goes first (flat
+# pixel art barely changes below 256 colours), then the frame rate.
+BUDGET_COLORS = (256, 128, 64, 32, 16)
+BUDGET_MIN_FPS = 5
+
+
+def fit_budget(frames, durations, max_bytes, max_fps=None):
+    """
+    Find the richest (fps, colors) setting whose GIF is <= max_bytes.
+    Each attempt quantizes only the frames kept at its frame rate, and
+    only one attempt's P copies are held at a time.
+    Returns (gif_bytes, settings); if nothing fits, the smallest attempt.
+    """
+    native_fps = 1000.0 / max(10, min(durations))
+    fps = min(max_fps or native_fps, native_fps)
+    fps_ladder = []
+    while fps >= BUDGET_MIN_FPS:
+        fps_ladder.append(round(fps, 2))
+        fps /= 1.5
+    fps_ladder = fps_ladder or [round(fps, 2)]   # a cap below the minimum still holds
+
+    attempts = []
+    best = None
+    palette_helps = True
+    for fps in fps_ladder:
+        kept, new_d = retime(frames, durations, fps)
+        prev_size = None
+        for colors in (BUDGET_COLORS if palette_helps else BUDGET_COLORS[:1]):
+            buf = io.BytesIO()
+            encode_gif(quantize(frame_store.select(frames, kept), colors), new_d, buf)
+            size = buf.tell()
+            settings = {"max_fps": fps, "colors": colors,
+                        "frames": len(kept), "bytes": size}
+            attempts.append(settings)
+            print(f"    try fps≤{fps:<6} colors={colors:<3} frames={len(kept):<4} → {size:,} bytes")
+            if best is None or size < best[1]["bytes"]:
+                best = (buf.getvalue(), settings)
+            if size <= max_bytes:
+                settings["attempts"] = len(attempts)
+                return buf.getvalue(), settings
+            if size == prev_size:
+                # Frames already use fewer colours; only fps can help now
+                palette_helps = False
+                break
+            prev_size = size
+    best[1]["attempts"] = len(attempts)
+    best[1]["over_budget"] = True
+    return best
+
+
+# ---------------------------------------------------------------------------
+# Main entry-point
+# ---------------------------------------------------------------------------
+def add_hud_and_game_over(input_path: str, output_path: str,
+                          total_score: int = 0,
+                          days_active: int = 1,
+                          missed_days: int = 0,
+                          max_bytes: int = None,
+                          max_fps: float = None,
+                          colors: int = 256,
+                          fmt: str = 'gif',
+                          compare: bool = False,
+                          workers: int = None,
+                          spill_dir: str = None,
+                          scales=(1,),
+                          **timing):
+    """
+    Build the HUD + stage-clear animation and write it to output_path.
+
+    fmt picks the encoder (gif, webp, webp-lossy, apng).  max_fps caps the
+    frame rate by merging frames; max_bytes (GIF only) searches palette
+    size and frame rate until the file fits.  compare=True also encodes
+    every format in memory and reports size / encode time.  workers
+    switches GIF encoding to the parallel gif_writer (0 = all CPUs).
+    spill_dir keeps frames in memory-mapped files there instead of RAM
+    (they are removed afterwards).  scales adds nearest-neighbour scaled
+    copies (e.g. (1, 0.5) also writes shooter@0.5x.gif) from the same
+    composed frames; max_bytes applies to the full-size output only.
+    Returns the settings that were used.
+    """
+    if max_bytes and fmt != 'gif':
+        raise ValueError("max_bytes is only supported for GIF output")
+    output_path = output_path_for(output_path, fmt)
+    all_frames, all_durations = build_frames(
+        input_path, total_score, days_active, missed_days,
+        spill_dir=spill_dir, **timing)
+    try:
+        return write_animation(all_frames, all_durations, output_path,
+                               max_bytes=max_bytes, max_fps=max_fps, colors=colors,
+                               fmt=fmt, compare=compare, workers=workers,
+                               spill_dir=spill_dir, scales=scales)
+    finally:
+        frame_store.discard(all_frames)
+
+
+def write_animation(all_frames, all_durations, output_path, max_bytes=None,
+                    max_fps=None, colors=256, fmt='gif', compare=False,
+                    workers=None, spill_dir=None, scales=(1,)):
+    """
+    Encode composed RGB frames (list or frame_store) to output_path plus
+    any scaled variants; see add_hud_and_game_over for the options.
+    """
+    settings = _encode_output(all_frames, all_durations, output_path, max_bytes,
+                              max_fps, colors, fmt, compare, workers)
+    settings["variants"] = [{"scale": 1, "output": output_path,
+                             "bytes": settings["bytes"]}]
+    kept, durations = retime(all_frames, all_durations, max_fps)
+    for scale in sorted(set(scales) - {1}, reverse=True):
+        path = variant_path(output_path, scale)
+        small = scale_frames(frame_store.select(all_frames, kept), scale, spill_dir)
+        try:
+            OUTPUT_FORMATS[fmt][1](small, durations, path, colors, workers=workers)
+            small_size = small[0].size
+        finally:
+            frame_store.discard(small)
+        settings["variants"].append({"scale": scale, "output": path,
+                                     "bytes": os.path.getsize(path)})
+        print(f"  {scale:g}x variant: {small_size[0]}×{small_size[1]} "
+              f"→ {path} ({os.path.getsize(path):,} bytes)")
     print("  Done! ✅")
+    return settings
+
+
+def _encode_output(all_frames, all_durations, output_path, max_bytes, max_fps,
+                   colors, fmt, compare, workers):
+    print(f"  Saving {len(all_frames)} frames to {output_path} …")
+
+    comparison = None
+    if compare:
+        kept, durations = retime(all_frames, all_durations, max_fps)
+        comparison = compare_formats(frame_store.select(all_frames, kept), durations,
+                                     colors, workers)
+
+    if max_bytes:
+        data, settings = fit_budget(all_frames, all_durations, max_bytes, max_fps)
+        with open(output_path, 'wb') as f:
+            f.write(data)
+        status = "over budget!" if settings.get("over_budget") else f"≤ {max_bytes:,}"
+        print(f"  Budget: fps≤{settings['max_fps']} colors={settings['colors']} "
+              f"frames={settings['frames']} bytes={settings['bytes']:,} ({status})")
+    else:
+        kept, durations = retime(all_frames, all_durations, max_fps)
+        encoder = OUTPUT_FORMATS[fmt][1]
+        encoder(frame_store.select(all_frames, kept), durations, output_path, colors,
+                workers=workers)
+        settings = {"max_fps": max_fps, "colors": colors, "frames": len(kept),
+                    "bytes": os.path.getsize(output_path)}
+    settings["format"] = fmt
+    settings["output"] = output_path
+    if comparison:
+        settings["comparison"] = comparison
+
+    perf.count("output_frames", settings["frames"])
+    perf.count("output_bytes", settings["bytes"])
+    return settings
+
+
+def parse_scales(text):
+    """'1,0.5' -> (1, 0.5)"""
+    scales = tuple(float(s) for s in text.split(',') if s.strip())
+    if not scales or any(not 0 < s <= 1 for s in scales):
+        raise ValueError("scales must be in (0, 1]")
+    return tuple(int(s) if s == 1 else s for s in scales)
+
+
+def parse_size(text):
+    """'900000', '900K', '1.5M' -> bytes."""
+    text = text.strip().upper()
+    scale = {'K': 1024, 'M': 1024 * 1024}.get(text[-1:], 1)
+    return int(float(text.rstrip('KM')) * scale)
 
 
 if __name__ == '__main__':
@@ -514,6 +777,29 @@ if __name__ == '__main__':
     ap.add_argument('output',        nargs='?', default=None)
     ap.add_argument('--stats',       default=None,
                     help='Path to stats.json from fetch_github_stats.py')
+    ap.add_argument('--profile',     action='store_true',
+                    help='Run under cProfile + tracemalloc and write a timing/memory '
+                         'report next to the output (<output>.profile.json)')
+    ap.add_argument('--profile-report', default=None,
+                    help='Where to write the --profile report instead')
+    ap.add_argument('--max-bytes',   type=parse_size, default=None,
+                    help='Byte budget (e.g. 900K, 1.5M): shrink palette, then frame '
+                         'rate, until the GIF fits')
+    ap.add_argument('--max-fps',     type=float, default=None,
+                    help='Merge frames so no frame is shorter than 1/max-fps s')
+    ap.add_argument('--format',      choices=sorted(OUTPUT_FORMATS), default='gif',
+                    help='Output encoder; the extension of OUTPUT is adjusted to match')
+    ap.add_argument('--workers',     type=int, default=None,
+                    help='Encode GIF frames in parallel with N processes (0 = all CPUs)')
+    ap.add_argument('--compare-formats', action='store_true',
+                    help='Also encode every format in memory and print a size / '
+                         'encode-time table')
+    ap.add_argument('--scales',      type=parse_scales, default=(1,),
+                    help='Comma-separated output scales, e.g. 1,0.5 also writes '
+                         '<output>@0.5x.gif (nearest-neighbour)')
+    ap.add_argument('--spill-dir',   default=None,
+                    help='Keep decoded/output frames in memory-mapped files in this '
+                         'directory instead of RAM (for long recordings)')
     args = ap.parse_args()
 
     out = args.output or args.input   # in-place by default
@@ -533,9 +819,27 @@ if __name__ == '__main__':
         except Exception as e:
             print(f"  Warning: could not load stats — {e}", file=sys.stderr)
 
-    add_hud_and_game_over(
-        args.input, out,
-        total_score=total_score,
-        days_active=days_active,
-        missed_days=missed_days,
-    )
+    def run():
+        add_hud_and_game_over(
+            args.input, out,
+            total_score=total_score,
+            days_active=days_active,
+            missed_days=missed_days,
+            max_bytes=args.max_bytes,
+            max_fps=args.max_fps,
+            fmt=args.format,
+            compare=args.compare_formats,
+            workers=args.workers,
+            spill_dir=args.spill_dir,
+            scales=args.scales,
+        )
+
+    if args.profile:
+        report_path = args.profile_report or os.path.splitext(out)[0] + '.profile.json'
+        with perf.profiling(report_path) as rec:
+            run()
+        for name, sec in rec.as_dict().items():
+            print(f"  {name:<12} {sec:8.3f}s")
+        print(f"  Profile report: {report_path}")
+    else:
+        run()
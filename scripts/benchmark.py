@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmark the three generators against synthetic fixtures.
+
+For every generator this reports wall time, peak RSS, the per-stage
+breakdown recorded through perf.stage / perf.laps, and output size.
+Each run happens in a fresh child process so peak RSS is not polluted by
+earlier runs (or by building the fixtures).
+
+Usage:
+    python scripts/benchmark.py                       # all, JSON to stdout
+    python scripts/benchmark.py --only shooter --frames 600
+    python scripts/benchmark.py --output bench.json
+    python scripts/benchmark.py --compare bench.json  # exit 1 on regression
+"""
+import argparse, contextlib, io, json, multiprocessing, os, platform
+import sys, tempfile, time
+
+import fixtures
+import perf
+
+BENCHES = ("snake", "shooter", "skills")
+
+
+def _run_snake(fx, out_dir):
+    import generate_snake
+    out = os.path.join(out_dir, "snake.svg")
+    generate_snake.generate(out, "NISHANT", fx["grid"])
+    return out
+
+
+def _run_shooter(fx, out_dir):
+    import add_game_over_shooter
+    out = os.path.join(out_dir, "shooter.gif")
+    add_game_over_shooter.add_hud_and_game_over(
+        fx["gif"], out, total_score=2471, days_active=301, missed_days=3)
+    return out
+
+
+def _run_skills(fx, out_dir):
+    import generate_animated_skills
+    out = os.path.join(out_dir, "animated-skills.svg")
+    generate_animated_skills.main(["--offline", "--cache-dir", fx["icon_cache"],
+                                   "--config", fx["skills_config"], "--output", out])
+    return out
+
+
+RUNNERS = {"snake": _run_snake, "shooter": _run_shooter, "skills": _run_skills}
+
+
+def _child(name, fx, out_dir):
+    """Executed in a fresh process: run one generator and measure it."""
+    rss_before = perf.peak_rss_mb()
+    with contextlib.redirect_stdout(io.StringIO()), perf.recording() as rec:
+        t0 = time.perf_counter()
+        out = RUNNERS[name](fx, out_dir)
+        wall = time.perf_counter() - t0
+    return {
+        "wall_s": round(wall, 4),
+        "peak_rss_mb": perf.peak_rss_mb(),
+        "baseline_rss_mb": rss_before,
+        "stages": rec.as_dict(),
+        "output_bytes": os.path.getsize(out),
+    }
+
+
+def build_fixtures(work_dir, frames):
+    grid = fixtures.random_grid()
+    gif = fixtures.make_shooter_gif(os.path.join(work_dir, "fixture.gif"), n_frames=frames)
+    icon_cache = os.path.join(work_dir, "icons")
+    config = fixtures.seed_icon_cache(icon_cache)
+    skills_config = os.path.join(work_dir, "skills.json")
+    with open(skills_config, "w") as f:
+        json.dump(config, f)
+    return {"grid": grid, "gif": gif, "icon_cache": icon_cache,
+            "skills_config": skills_config,
+            "gif_bytes": os.path.getsize(gif), "frames": frames}
+
+
+def run(only=BENCHES, frames=300, repeat=3):
+    ctx = multiprocessing.get_context("spawn")
+    results = {}
+    with tempfile.TemporaryDirectory() as work:
+        # Built in a child too: ru_maxrss survives fork/exec, so a parent
+        # that touched a large GIF would inflate every later measurement.
+        with ctx.Pool(1) as pool:
+            fx = pool.apply(build_fixtures, (work, frames))
+        for name in only:
+            runs = []
+            for _ in range(repeat):
+                with ctx.Pool(1) as pool:
+                    runs.append(pool.apply(_child, (name, fx, work)))
+            best = min(runs, key=lambda r: r["wall_s"])
+            best["peak_rss_mb"] = max(r["peak_rss_mb"] for r in runs)
+            best["runs_wall_s"] = [r["wall_s"] for r in runs]
+            results[name] = best
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "fixture_frames": frames,
+            "fixture_gif_bytes": fx["gif_bytes"],
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(old, new, threshold):
+    """Return a list of human-readable regressions beyond `threshold`."""
+    regressions = []
+    for name, cur in new["results"].items():
+        prev = old.get("results", {}).get(name)
+        if not prev:
+            continue
+        for key in ("wall_s", "peak_rss_mb", "output_bytes"):
+            a, b = prev.get(key), cur.get(key)
+            if not a or b is None:
+                continue
+            change = (b - a) / a
+            line = f"{name}.{key}: {a} -> {b} ({change:+.1%})"
+            print(("  REGRESSION " if change > threshold else "  ") + line, file=sys.stderr)
+            if change > threshold:
+                regressions.append(line)
+    return regressions
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--only", default=",".join(BENCHES),
+                    help="comma-separated subset of: " + ", ".join(BENCHES))
+    ap.add_argument("--frames", type=int, default=300,
+                    help="frames in the synthetic shooter GIF")
+    ap.add_argument("--repeat", type=int, default=3,
+                    help="runs per generator; the fastest is reported")
+    ap.add_argument("--output", default=None, help="write JSON here instead of stdout")
+    ap.add_argument("--compare", default=None,
+                    help="previous JSON report to diff against")
+    ap.add_argument("--threshold", type=float, default=0.10,
+                    help="relative increase treated as a regression (default 10%%)")
+    args = ap.parse_args()
+
+    only = [n.strip() for n in args.only.split(",") if n.strip()]
+    unknown = set(only) - set(BENCHES)
+    if unknown:
+        ap.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+
+    report = run(only, frames=args.frames, repeat=args.repeat)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), report, args.threshold)
+        sys.exit(1 if regressions else 0)
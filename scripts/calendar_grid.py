@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Contribution-calendar grids and their colour levels.
+
+    grid = grid_from_weeks(calendar["weeks"], 52)    # one column of 7 day counts per week
+    lvl  = levels(grid, calendar_thresholds(calendar, 52))   # 7 rows × 52, 0-4
+
+Levels follow GitHub's own calendar: days without contributions are
+level 0 and the remaining days are split at the quartiles of their
+counts.  Bucketing against the single busiest day instead lets one
+outlier push every other day down to level 1.
+
+The whole grid is mapped in one pass through a count -> level table, and
+calendar_thresholds() keeps its result on the calendar dict, per drawn
+width, so anything that caches calendars (the pipeline, card_server)
+caches thresholds too.
+Grids may span several years; levels(..., window=53) scales each year on
+its own, the way GitHub shows one year at a time.
+"""
+import bisect
+from collections import Counter
+from itertools import chain
+
+ROWS = 7
+BUCKETS = 4          # non-zero levels
+TABLE_LIMIT = 1 << 16   # larger counts are bucketed with bisect instead
+
+
+def grid_from_weeks(weeks, cols=None, rows=ROWS):
+    """
+    Columns of day counts from GraphQL calendar weeks (weekday = row).
+    With cols, keep the most recent `cols` weeks and left-pad short calendars.
+    """
+    grid = []
+    for w in weeks:
+        col = [0] * rows
+        for d in w["contributionDays"]:
+            col[d["weekday"]] = d["contributionCount"]
+        grid.append(col)
+    if cols is not None:
+        grid = grid[-cols:] if len(grid) > cols else (
+            [[0] * rows for _ in range(cols - len(grid))] + grid)
+    return grid
+
+
+def quantile(hist, q):
+    """
+    Linearly interpolated quantile (numpy's default) of the values counted
+    in hist ({value: occurrences}), without expanding them into a list.
+    """
+    values = sorted(hist)
+    ranks, n = [], 0
+    for v in values:
+        n += hist[v]
+        ranks.append(n)              # values[i] fills ranks < ranks[i]
+
+    def nth(k):
+        return values[bisect.bisect_right(ranks, k)]
+    pos = q * (n - 1)
+    lo = int(pos)
+    return nth(lo) + (nth(min(lo + 1, n - 1)) - nth(lo)) * (pos - lo)
+
+
+def thresholds(counts, buckets=BUCKETS):
+    """
+    Upper bounds of levels 1..buckets-1 over the non-zero counts
+    (count <= t[0] is level 1, ... above t[-1] is level `buckets`).
+    """
+    hist = Counter(counts)
+    for v in [v for v in hist if v <= 0]:
+        del hist[v]
+    if not hist:
+        return ()
+    return tuple(quantile(hist, i / buckets) for i in range(1, buckets))
+
+
+def level_of(count, bounds):
+    return 0 if count <= 0 else bisect.bisect_left(bounds, count) + 1
+
+
+def _mapper(bounds, top):
+    """count -> level, through a lookup table when the counts are small."""
+    if top > TABLE_LIMIT:
+        return lambda c: level_of(c, bounds)
+    table = [0] * (top + 1)
+    i = 0
+    for c in range(1, top + 1):
+        while i < len(bounds) and c > bounds[i]:
+            i += 1
+        table[c] = i + 1
+    return table.__getitem__
+
+
+def levels(grid, bounds=None, window=None):
+    """
+    ROWS x len(grid) levels for a grid of week columns.  bounds: from
+    thresholds()/calendar_thresholds(), else computed from the grid
+    itself — per `window` weeks when given (multi-year grids).
+    """
+    if not grid:
+        return [[] for _ in range(ROWS)]
+    rows = len(grid[0])
+    if bounds is None and window:
+        out = [[] for _ in range(rows)]
+        for start in range(0, len(grid), window):
+            for row, part in zip(out, levels(grid[start:start + window])):
+                row.extend(part)
+        return out
+    flat = list(chain.from_iterable(grid))
+    if bounds is None:
+        bounds = thresholds(flat)
+    to_level = _mapper(tuple(bounds), max(max(flat), 0))
+    mapped = list(map(to_level, flat))
+    return [mapped[r::rows] for r in range(rows)]
+
+
+def calendar_thresholds(calendar, cols=None):
+    """
+    thresholds() over the days of a fetch_calendar dict that a
+    grid_from_weeks(weeks, cols) grid shows (every day without cols),
+    computed once per cols: weeks that are never drawn do not move the
+    level boundaries.
+    """
+    cache = calendar.setdefault("thresholds", {})
+    if cols not in cache:
+        cache[cols] = list(thresholds(
+            chain.from_iterable(grid_from_weeks(calendar["weeks"], cols))))
+    return cache[cols]
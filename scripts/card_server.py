@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+On-demand card service: the snake, HUD stats and skills sheet per request.
+
+    GET /snake.svg?user=nnish16&text=NISHANT
+    GET /stats.json?user=nnish16
+    GET /skills.svg?icons=py,js,ts&theme=dark&perline=9&mode=symbol
+    GET /healthz                                      cache counters
+
+Rendered bodies live in an LRU bounded by total bytes, each entry
+expiring after --ttl seconds.  Concurrent requests for the same key share
+one render, and calendars are cached per user too, so /snake.svg and
+/stats.json for one user cost a single GraphQL call.  Renders run in a
+thread pool; cache hits are answered straight from the event loop.
+
+Usage:
+    GITHUB_TOKEN=... python scripts/card_server.py --port 8080
+    python scripts/card_server.py --api-url http://127.0.0.1:9000/graphql   # stand-in API
+"""
+import argparse, asyncio, hashlib, json, os, re, sys, threading, time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import calendar_grid
+import fetch_github_stats
+
+USER_RE = re.compile(r"^[A-Za-z0-9](?:[A-Za-z0-9-]{0,38})$")
+ICON_RE = re.compile(r"^[a-z0-9]+$")
+MAX_ICONS = 60
+
+
+class BadRequest(ValueError):
+    pass
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+class LRUCache:
+    """
+    Least-recently-used cache bounded by the summed cost of its entries
+    (bytes for rendered cards, 1 per entry for calendars), with a TTL.
+    """
+
+    def __init__(self, capacity, ttl, clock=time.monotonic):
+        self.capacity, self.ttl, self.clock = capacity, ttl, clock
+        self._entries = OrderedDict()        # key -> (expires_at, cost, value)
+        self.used = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _drop(self, key):
+        _, cost, _ = self._entries.pop(key)
+        self.used -= cost
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= self.clock():
+            if entry is not None:
+                self._drop(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[2]
+
+    def put(self, key, value, cost=1):
+        if key in self._entries:
+            self._drop(key)
+        if cost > self.capacity:
+            return
+        self._entries[key] = (self.clock() + self.ttl, cost, value)
+        self.used += cost
+        while self.used > self.capacity:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def stats(self):
+        return {"entries": len(self._entries), "used": self.used,
+                "capacity": self.capacity, "hits": self.hits,
+                "misses": self.misses, "evictions": self.evictions}
+
+
+# ---------------------------------------------------------------------------
+# Service
+# ---------------------------------------------------------------------------
+class CardService:
+    def __init__(self, token="", api_url=None, ttl=600, cache_bytes=64 << 20,
+                 max_users=1024, workers=4, icon_cache=None, offline=False):
+        import generate_animated_skills as skills
+        self.token, self.api_url, self.ttl, self.offline = token, api_url, ttl, offline
+        self.cards = LRUCache(cache_bytes, ttl)
+        self.calendars = LRUCache(max_users, ttl)
+        self.renders = 0
+        self._inflight = {}
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._icons = skills.IconCache(icon_cache or skills.CACHE_DIR)
+        self._icons_lock = threading.Lock()   # IconCache is not thread-safe
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._pool, fn, *args)
+
+    async def cached(self, cache, key, render, cost=lambda value: 1):
+        """
+        (value, hit): from `cache`, or from one `render()` coroutine shared
+        by every request for `key` that arrives while it is running.
+        """
+        value = cache.get(key)
+        if value is not None:
+            return value, True
+        task = self._inflight.get(key)
+        if task is None:
+            async def fill():
+                value = await render()
+                cache.put(key, value, cost(value))
+                return value
+            task = self._inflight[key] = asyncio.ensure_future(fill())
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task), False
+
+    # ---- data ----
+    async def calendar(self, user):
+        """GraphQL calendar for user, or None without a token (fallback data)."""
+        if not self.token:
+            return None
+        value, _ = await self.cached(
+            self.calendars, ("calendar", user),
+            lambda: self._run(fetch_github_stats.fetch_calendar, user, self.token,
+                              self.api_url))
+        return value
+
+    # ---- renderers: params -> (key, coroutine producing (content_type, bytes)) ----
+    def snake(self, params):
+        import generate_snake
+        user = _user(params)
+        text = params.get("text", "NISHANT").upper()
+        if len(text) > generate_snake.MAX_TEXT or any(ch not in generate_snake.FONT for ch in text):
+            raise BadRequest(f"text must be up to {generate_snake.MAX_TEXT} of: "
+                             + "".join(sorted(generate_snake.FONT)))
+
+        async def render():
+            cal = await self.calendar(user)
+            grid = thresholds = None
+            if cal:
+                grid = generate_snake.grid_from_weeks(cal["weeks"])
+                # kept on the cached calendar, so computed once per user
+                thresholds = calendar_grid.calendar_thresholds(cal, generate_snake.COLS)
+            svg = await self._run(generate_snake.render, text, grid, thresholds)
+            return "image/svg+xml", svg.encode()
+        return ("snake", user, text), render
+
+    def stats(self, params):
+        user = _user(params)
+
+        async def render():
+            cal = await self.calendar(user)
+            if cal is None:
+                stats = fetch_github_stats.fallback_stats()
+            else:
+                stats = fetch_github_stats.compute_stats(
+                    cal["total"], fetch_github_stats.flatten_days(cal))
+            return "application/json", (json.dumps(stats) + "\n").encode()
+        return ("stats", user), render
+
+    def skills(self, params):
+        import generate_animated_skills as skills
+        icons = [i for i in params.get("icons", "").split(",") if i]
+        if not icons or len(icons) > MAX_ICONS or not all(ICON_RE.match(i) for i in icons):
+            raise BadRequest(f"icons must be 1-{MAX_ICONS} comma-separated names")
+        theme = params.get("theme", "dark")
+        mode = params.get("mode", "symbol")
+        try:
+            perline = int(params.get("perline", 15))
+        except ValueError:
+            raise BadRequest("perline must be an integer") from None
+        if theme not in ("dark", "light") or mode not in ("symbol", "inline") \
+                or not 1 <= perline <= 50:
+            raise BadRequest("theme: dark|light, mode: symbol|inline, perline: 1-50")
+        config = {"icons": icons, "theme": theme, "perline": perline}
+
+        def build():
+            with self._icons_lock:
+                sheet = skills.load_sheet(config, self._icons, offline=self.offline)
+            return skills.animate_sheet(sheet, mode)[0]
+
+        async def render():
+            svg = await self._run(build)
+            return "image/svg+xml", svg.encode()
+        return ("skills", tuple(icons), theme, perline, mode), render
+
+    ROUTES = {"/snake.svg": "snake", "/stats.json": "stats", "/skills.svg": "skills"}
+
+    async def respond(self, method, target, headers):
+        """-> (status, headers dict, body bytes)"""
+        if method not in ("GET", "HEAD"):
+            return 405, {"Allow": "GET, HEAD"}, b""
+        url = urlsplit(target)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        if url.path == "/healthz":
+            body = json.dumps({"cards": self.cards.stats(),
+                               "calendars": self.calendars.stats(),
+                               "renders": self.renders,
+                               "inflight": len(self._inflight)}).encode()
+            return 200, {"Content-Type": "application/json"}, body
+        route = self.ROUTES.get(url.path)
+        if route is None:
+            return 404, {"Content-Type": "text/plain"}, b"not found\n"
+        try:
+            key, render = getattr(self, route)(params)
+        except BadRequest as e:
+            return 400, {"Content-Type": "text/plain"}, f"{e}\n".encode()
+
+        async def render_card():
+            self.renders += 1
+            ctype, body = await render()
+            etag = '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+            return ctype, body, etag
+        try:
+            (ctype, body, etag), hit = await self.cached(
+                self.cards, key, render_card, cost=lambda card: len(card[1]))
+        except Exception as e:
+            print(f"  {url.path} {params}: {e}", file=sys.stderr)
+            return 502, {"Content-Type": "text/plain"}, f"render failed: {e}\n".encode()
+
+        out = {"Content-Type": ctype, "ETag": etag, "X-Cache": "HIT" if hit else "MISS",
+               "Cache-Control": f"public, max-age={self.ttl}"}
+        if headers.get("if-none-match") == etag:
+            return 304, out, b""
+        return 200, out, body
+
+    # ---- HTTP/1.1 ----
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                method, target, version = line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = h.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                # no route takes a body: discard it so that on a keep-alive
+                # connection it is not parsed as the next request line
+                await discard_body(reader, int(headers.get("content-length", 0)))
+
+                status, out, body = await self.respond(method, target, headers)
+                keep_alive = (version == "HTTP/1.1"
+                              and headers.get("connection", "").lower() != "close"
+                              and "transfer-encoding" not in headers)   # not skippable
+                out["Content-Length"] = str(len(body))
+                out["Connection"] = "keep-alive" if keep_alive else "close"
+                head = f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n" + "".join(
+                    f"{k}: {v}\r\n" for k, v in out.items()) + "\r\n"
+                writer.write(head.encode("latin-1") + (b"" if method == "HEAD" else body))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    def close(self):
+        self._pool.shutdown(wait=False)
+
+
+async def discard_body(reader, length, chunk=1 << 16):
+    """Read and drop `length` bytes of request body."""
+    if length < 0:
+        raise ValueError("negative Content-Length")
+    while length:
+        length -= len(await reader.readexactly(min(chunk, length)))
+
+
+STATUS_TEXT = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+               405: "Method Not Allowed", 502: "Bad Gateway"}
+
+
+def _user(params):
+    user = params.get("user", "")
+    if not USER_RE.match(user):
+        raise BadRequest("user must be a GitHub login")
+    return user
+
+
+async def serve(service, host="127.0.0.1", port=8080):
+    server = await asyncio.start_server(service.handle, host, port)
+    addr = server.sockets[0].getsockname()
+    print(f"Serving cards on http://{addr[0]}:{addr[1]}/")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8080)
+    ap.add_argument("--ttl", type=float, default=600, help="seconds a card stays cached")
+    ap.add_argument("--cache-mb", type=float, default=64, help="rendered-card cache size")
+    ap.add_argument("--max-users", type=int, default=1024, help="calendars kept in memory")
+    ap.add_argument("--workers", type=int, default=4, help="render threads")
+    ap.add_argument("--api-url", default=None,
+                    help="GraphQL endpoint (default $GITHUB_GRAPHQL_URL or api.github.com)")
+    ap.add_argument("--icon-cache", default=None)
+    ap.add_argument("--offline", action="store_true",
+                    help="skills from cached icons only, never skillicons.dev")
+    args = ap.parse_args(argv)
+
+    service = CardService(
+        token=os.environ.get("GITHUB_TOKEN", os.environ.get("METRICS_TOKEN", "")),
+        api_url=args.api_url, ttl=args.ttl, cache_bytes=int(args.cache_mb * 2**20),
+        max_users=args.max_users, workers=args.workers, icon_cache=args.icon_cache,
+        offline=args.offline)
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -12,9 +12,13 @@ Outputs a JSON dict to stdout:
 Usage:
     GITHUB_TOKEN=ghp_... GITHUB_USER=nnish16 python scripts/fetch_github_stats.py
     python scripts/fetch_github_stats.py > stats.json
+
+GITHUB_GRAPHQL_URL points the client at another endpoint (GHES, or a
+local stand-in such as fixtures.serve_graphql for tests).
 """
 import json, os, sys, urllib.request, datetime
 
+API_URL = os.environ.get("GITHUB_GRAPHQL_URL", "https://api.github.com/graphql")
 
 GRAPHQL_QUERY = '''
 {
@@ -26,6 +30,7 @@ GRAPHQL_QUERY = '''
           contributionDays {
             date
             contributionCount
+            weekday
           }
         }
       }
@@ -35,26 +40,32 @@ GRAPHQL_QUERY = '''
 '''
 
 
-def fetch_contributions(user: str, token: str) -> dict:
+def fetch_calendar(user: str, token: str, api_url: str = None,
+                   timeout: float = 30) -> dict:
+    """
+    One GraphQL round trip for everything the generators need:
+      {"total": 2471, "weeks": [{"contributionDays": [{date, contributionCount, weekday}]}]}
+    """
     query = json.dumps({"query": GRAPHQL_QUERY % user})
     req = urllib.request.Request(
-        "https://api.github.com/graphql",
+        api_url or API_URL,
         query.encode(),
         {"Authorization": f"bearer {token}", "Content-Type": "application/json"},
     )
-    with urllib.request.urlopen(req) as r:
+    with urllib.request.urlopen(req, timeout=timeout) as r:
         data = json.loads(r.read())
 
     cal = (data["data"]["user"]["contributionsCollection"]["contributionCalendar"])
-    total = cal["totalContributions"]
+    return {"total": cal["totalContributions"], "weeks": cal["weeks"]}
+
 
-    # Flatten all days
-    all_days = []
-    for week in cal["weeks"]:
-        for day in week["contributionDays"]:
-            all_days.append(day)
+def flatten_days(calendar: dict) -> list:
+    return [day for week in calendar["weeks"] for day in week["contributionDays"]]
 
-    return total, all_days
+
+def fetch_contributions(user: str, token: str) -> dict:
+    calendar = fetch_calendar(user, token)
+    return calendar["total"], flatten_days(calendar)
 
 
 def compute_stats(total: int, all_days: list) -> dict:
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic inputs for benchmarking the generators offline.
+
+  make_shooter_gif  — animated GIF shaped like gh-space-shooter output
+                      (860×230, 20 ms frames, contribution-cell enemies,
+                      a moving ship and bullets)
+  random_grid       — 52×7 contribution counts with a realistic spread
+  seed_icon_cache   — a canned skillicons.dev-style icon set written into
+                      an IconCache so generate_animated_skills runs offline
+  fake_calendar     — a GraphQL contributionCalendar for any user
+  serve_graphql     — local stand-in for api.github.com/graphql serving it
+
+Everything is seeded, so two runs produce byte-identical fixtures.
+"""
+import datetime, json, random, re, threading, time, zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from PIL import Image, ImageDraw
+
+BG_COLOR = (13, 17, 23)
+CELL_COLORS = [(14, 68, 41), (0, 109, 50), (38, 166, 65), (57, 211, 83)]
+SHIP_BLUE = (68, 147, 248)
+
+
+def random_grid(seed=7, cols=52, rows=7, max_count=30):
+    """Contribution counts, one list of `rows` days per week column."""
+    rng = random.Random(seed)
+    grid = []
+    for _ in range(cols):
+        week = []
+        for _ in range(rows):
+            roll = rng.random()
+            week.append(0 if roll < 0.3 else int(rng.expovariate(1 / 6)) % max_count + 1)
+        grid.append(week)
+    return grid
+
+
+def make_shooter_gif(path, n_frames=300, size=(860, 230), seed=11,
+                     duration=20):
+    """Write a shooter-like animated GIF and return its path."""
+    rng = random.Random(seed)
+    w, h = size
+    cols, rows, cell, gap = 52, 7, 11, 3
+    pitch = cell + gap
+    left = (w - cols * pitch) // 2
+    top = 16
+    alive = {(c, r): rng.choice(CELL_COLORS) for c in range(cols)
+             for r in range(rows) if rng.random() > 0.3}
+    kill_order = list(alive)
+    rng.shuffle(kill_order)
+    total = len(kill_order)
+    kills_per_frame = total / max(1, n_frames - 10)
+
+    frames = []
+    bullets = []
+    for i in range(n_frames):
+        im = Image.new('RGB', size, BG_COLOR)
+        d = ImageDraw.Draw(im)
+        for (c, r), color in alive.items():
+            x, y = left + c * pitch, top + r * pitch
+            d.rectangle([x, y, x + cell - 1, y + cell - 1], fill=color)
+
+        ship_x = int((w - 30) * (0.5 + 0.45 * ((i * 7) % 200 - 100) / 100))
+        ship_y = h - 28
+        d.polygon([(ship_x + 15, ship_y), (ship_x, ship_y + 20),
+                   (ship_x + 30, ship_y + 20)], fill=SHIP_BLUE)
+        if i % 3 == 0:
+            bullets.append([ship_x + 14, ship_y - 4])
+        for b in bullets:
+            b[1] -= 9
+            d.rectangle([b[0], b[1], b[0] + 2, b[1] + 5], fill=(255, 255, 255))
+        bullets = [b for b in bullets if b[1] > 0]
+
+        target = min(total, int((i + 1) * kills_per_frame))
+        while total - len(kill_order) < target:
+            c, r = kill_order.pop()
+            del alive[(c, r)]
+            x, y = left + c * pitch, top + r * pitch
+            d.ellipse([x - 3, y - 3, x + cell + 2, y + cell + 2], fill=(255, 213, 0))
+        frames.append(im.convert('P', palette=Image.ADAPTIVE, colors=64))
+
+    frames[0].save(path, format='GIF', save_all=True, append_images=frames[1:],
+                   duration=duration, loop=0, disposal=2)
+    return path
+
+
+def canned_icon(i, seed=5):
+    """A deterministic icon shaped like the skillicons.dev ones (~2-3 KB)."""
+    rng = random.Random(seed * 1000 + i)
+    pts = " ".join(f"L{rng.uniform(28, 228):.4f} {rng.uniform(28, 228):.4f}"
+                   for _ in range(60))
+    hue = "#%02X%02X%02X" % (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="256" height="256" fill="none" '
+            f'viewBox="0 0 256 256"><rect width="256" height="256" fill="#242938" rx="60"/>'
+            f'<path fill="url(#paint0_linear_{i})" d="M128 28 {pts}Z"/>'
+            f'<defs><linearGradient id="paint0_linear_{i}" x1="28" x2="228" y1="28" y2="228" '
+            f'gradientUnits="userSpaceOnUse"><stop stop-color="{hue}"/>'
+            f'<stop offset="1" stop-color="#FFFFFF"/></linearGradient></defs></svg>')
+
+
+def seed_icon_cache(cache_dir, n_icons=18, theme="dark", perline=9):
+    """Fill an IconCache with canned icons; returns the matching config."""
+    import generate_animated_skills as skills
+
+    cache = skills.IconCache(cache_dir)
+    names = [f"icon{i}" for i in range(n_icons)]
+    for i, name in enumerate(names):
+        cache.put(name, theme, canned_icon(i))
+    cache.save()
+    return {"icons": names, "theme": theme, "perline": perline}
+
+
+def fake_calendar(user, weeks=53, today=None):
+    """
+    GraphQL response body for `user` (seeded by the login, so every user
+    gets a different but stable calendar ending today).
+    """
+    today = today or datetime.date.today()
+    rng = random.Random(zlib.crc32(user.encode()))
+    start = today - datetime.timedelta(days=(weeks - 1) * 7 + (today.weekday() + 1) % 7)
+    out, total = [], 0
+    day = start
+    while day <= today:
+        week = []
+        for _ in range(7):
+            if day > today:
+                break
+            count = 0 if rng.random() < 0.3 else int(rng.expovariate(1 / 6)) + 1
+            total += count
+            week.append({"date": day.isoformat(), "contributionCount": count,
+                         "weekday": (day.weekday() + 1) % 7})
+            day += datetime.timedelta(days=1)
+        out.append({"contributionDays": week})
+    calendar = {"totalContributions": total, "weeks": out}
+    return {"data": {"user": {"contributionsCollection": {"contributionCalendar": calendar}}}}
+
+
+def serve_graphql(port=0, delay=0.0):
+    """
+    Start a stand-in GraphQL endpoint on localhost in a daemon thread.
+    Returns (server, url); server.requests counts the queries answered.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            m = re.search(r'user\(login:\s*"([^"]*)"\)', body["query"])
+            if delay:
+                time.sleep(delay)
+            self.server.requests += 1
+            data = json.dumps(fake_calendar(m.group(1) if m else "")).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/graphql"
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped store of decoded animation frames.
+
+Frames are spilled to one flat file so that long shooter runs do not have
+to fit in RAM, and so worker processes can read any frame by index without
+pickling pixels around:
+
+    offset 0   header   magic "FRMSTOR1", width, height, count, bands,
+                        durations_offset            (struct HEADER, 32 bytes)
+    offset 32  pixels   count × width × height × bands, row-major
+    durations_offset    count × uint32 frame durations in ms
+
+Frames are stored as RGBX (bands=4) by default because Pillow can only
+wrap 4-byte pixels zero-copy; ``FrameStore.frame(i)`` then returns an
+``Image.frombuffer`` view straight onto the mapping.  bands=3 halves the
+padding cost but every view becomes a copy.
+
+    with FrameWriter(path, (w, h)) as out:
+        out.append(image, duration_ms)
+    with FrameStore(path) as store:
+        store[i]      # PIL view,  store.array(i) -> NumPy view (if installed)
+"""
+import mmap, os, struct, tempfile
+from collections.abc import Sequence
+
+from PIL import Image
+
+MAGIC = b"FRMSTOR1"
+HEADER = struct.Struct("<8sIIIIQ")   # magic, w, h, count, bands, durations_offset
+HEADER_SIZE = 32
+MODES = {3: "RGB", 4: "RGBX"}
+
+
+class FrameWriter:
+    """Append frames to a new store file; the header is finalised on close."""
+
+    def __init__(self, path, size, bands=4):
+        if bands not in MODES:
+            raise ValueError("bands must be 3 (RGB) or 4 (RGBX)")
+        self.path, self.size, self.bands = path, tuple(size), bands
+        self.mode = MODES[bands]
+        self.frame_bytes = self.size[0] * self.size[1] * bands
+        self.durations = []
+        self._f = open(path, "wb")
+        self._f.write(b"\0" * HEADER_SIZE)
+
+    def append(self, image, duration):
+        if image.size != self.size:
+            raise ValueError(f"frame size {image.size} != store size {self.size}")
+        if image.mode != self.mode:
+            image = image.convert(self.mode)
+        self._f.write(image.tobytes())
+        self.durations.append(int(duration))
+
+    def close(self):
+        if self._f.closed:
+            return
+        offset = HEADER_SIZE + len(self.durations) * self.frame_bytes
+        self._f.write(struct.pack(f"<{len(self.durations)}I", *self.durations))
+        self._f.seek(0)
+        self._f.write(HEADER.pack(MAGIC, self.size[0], self.size[1],
+                                  len(self.durations), self.bands, offset))
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FrameStore(Sequence):
+    """Read-only, memory-mapped view of a store written by FrameWriter."""
+
+    def __init__(self, path):
+        self.path = path
+        self._f = open(path, "rb")
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, w, h, count, bands, dur_off = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a frame store")
+        self.size = (w, h)
+        self.bands = bands
+        self.mode = MODES[bands]
+        self.frame_bytes = w * h * bands
+        self._count = count
+        self.durations = list(struct.unpack_from(f"<{count}I", self._mm, dur_off))
+        self._buf = memoryview(self._mm)
+
+    def __len__(self):
+        return self._count
+
+    def _slice(self, i):
+        if not -self._count <= i < self._count:
+            raise IndexError(i)
+        start = HEADER_SIZE + (i % self._count) * self.frame_bytes
+        return self._buf[start:start + self.frame_bytes]
+
+    def frame(self, i):
+        """PIL image backed by the mapping (zero-copy for RGBX stores)."""
+        return Image.frombuffer(self.mode, self.size, self._slice(i), "raw", self.mode, 0, 1)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.select(range(*i.indices(self._count)))
+        return self.frame(i)
+
+    def array(self, i):
+        """(h, w, bands) uint8 NumPy view of frame i; needs numpy."""
+        import numpy as np
+        w, h = self.size
+        return np.frombuffer(self._slice(i), dtype=np.uint8).reshape(h, w, self.bands)
+
+    def select(self, indices):
+        return FrameSelection(self, list(indices))
+
+    def close(self):
+        if self._mm.closed:
+            return
+        try:
+            self._buf.release()
+            self._mm.close()
+        except BufferError:
+            return   # frame views are still alive; the mapping dies with them
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FrameSelection(Sequence):
+    """A subset of a store's frames (e.g. after retiming), still by reference."""
+
+    def __init__(self, store, indices):
+        self.store, self.indices = store, indices
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return FrameSelection(self.store, self.indices[i])
+        return self.store.frame(self.indices[i])
+
+
+def sink(size, spill_dir=None, name="frames"):
+    """
+    Frame collector for generators: returns (put(image, duration), finish()).
+    Without spill_dir frames stay in a list; with it they go to a new store
+    file in spill_dir and finish() returns the opened FrameStore.
+    """
+    if spill_dir is None:
+        frames = []
+        return (lambda image, duration: frames.append(image)), (lambda: frames)
+    os.makedirs(spill_dir, exist_ok=True)
+    fd, path = tempfile.mkstemp(prefix=name + "-", suffix=".frames", dir=spill_dir)
+    os.close(fd)
+    writer = FrameWriter(path, size)
+
+    def finish():
+        writer.close()
+        return FrameStore(path)
+    return writer.append, finish
+
+
+def rgb(image):
+    """RGB image for encoders that reject RGBX (copies store views only)."""
+    return image.convert("RGB") if image.mode == "RGBX" else image
+
+
+def store_refs(frames):
+    """(path, [index, ...]) if `frames` lives in a FrameStore, else None."""
+    if isinstance(frames, FrameStore):
+        return frames.path, list(range(len(frames)))
+    if isinstance(frames, FrameSelection):
+        return frames.store.path, frames.indices
+    return None
+
+
+def select(frames, indices):
+    """frames[indices] that stays by-reference for stores."""
+    if isinstance(frames, (FrameStore, FrameSelection)):
+        if isinstance(frames, FrameSelection):
+            return FrameSelection(frames.store, [frames.indices[i] for i in indices])
+        return frames.select(indices)
+    return [frames[i] for i in indices]
+
+
+_shared = {}
+
+
+def shared(path):
+    """Per-process cache of open stores, for pool workers."""
+    store = _shared.get(path)
+    if store is None:
+        store = _shared[path] = FrameStore(path)
+    return store
+
+
+def remove(path):
+    store = _shared.pop(path, None)
+    if store is not None:
+        store.close()
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def discard(frames):
+    """
+    Close the store behind `frames` (a sink()'s finish() result) and delete
+    its file; lists are left alone.  An unlinked file keeps its disk space
+    while mapped, so drop frame views first.
+    """
+    refs = store_refs(frames)
+    if refs is None:
+        return
+    with (frames.store if isinstance(frames, FrameSelection) else frames):
+        pass
+    remove(refs[0])
@@ -1,80 +1,282 @@
 import urllib.request
+import argparse
+import hashlib
+import json
+import os
 import re
 import sys
+import perf
+from scene import Track, animate
+
+DEFAULT_CONFIG = {
+    "icons": ["py", "ts", "java", "mysql", "react", "tailwind", "vite", "openai", "pytorch",
+              "tensorflow", "nodejs", "electron", "firebase", "sqlite", "postgres",
+              "githubactions", "docker", "vercel"],
+    "theme": "dark",
+    "perline": 9,
+}
+
+ICONS_URL = "https://skillicons.dev/icons?i={icons}&theme={theme}&perline={perline}"
+CACHE_DIR = os.path.join(".cache", "skillicons")
+
+# skillicons.dev layout: 256px icons on a 300px pitch, rendered at 48px
+ICON_SIZE, ICON_PITCH, RENDER_SIZE = 256, 300, 48
+
+ICON_PATTERN = r'(<g transform="translate\([^)]+\)">)\s*(<svg.*?</svg>)\s*(</g>)'
+SLOT_PATTERN = r'<g transform="translate\([^)]+\)">\s*(<svg.*?</svg>|undefined)\s*</g>'
+
+GAME_DURATION = 40.0 # seconds
+FILL_TIME = 35.0
+
+GRAYSCALE_MATRIX = "0.3333 0.3333 0.3333 0 0  0.3333 0.3333 0.3333 0 0  0.3333 0.3333 0.3333 0 0  0 0 0 1 0"
+
+
+def reveal_animation(counter, num_icons):
+    start_time = (counter / num_icons) * FILL_TIME
+    end_time = start_time + 1.0
+    reveal = Track([(0, 0), (start_time, 0), (end_time, 1), (GAME_DURATION, 1)])
+    return animate("opacity", reveal.simplified(), GAME_DURATION, repeat=False)
+
+
+def to_symbol(inner_svg, symbol_id):
+    """Turn an icon's nested <svg> into a <symbol> that can be <use>d."""
+    m = re.match(r'<svg([^>]*)>(.*)</svg>$', inner_svg, re.DOTALL)
+    attrs, body = m.group(1), m.group(2)
+    # width/height move onto the <use>; xmlns is redundant inside the sheet
+    attrs = re.sub(r'\s(?:xmlns|width|height)="[^"]*"', '', attrs)
+    width = re.search(r'\swidth="([^"]*)"', m.group(1))
+    height = re.search(r'\sheight="([^"]*)"', m.group(1))
+    size = (width.group(1) if width else "256", height.group(1) if height else "256")
+    return f'<symbol id="{symbol_id}"{attrs}>{body}</symbol>', size
 
-def main():
-    url = "https://skillicons.dev/icons?i=py,ts,java,mysql,react,tailwind,vite,openai,pytorch,tensorflow,nodejs,electron,firebase,sqlite,postgres,githubactions,docker,vercel&theme=dark&perline=9"
-    req = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
-    try:
-        with urllib.request.urlopen(req) as response:
-            svg_data = response.read().decode('utf-8')
-    except Exception as e:
-        print(f"Error fetching icons: {e}")
-        sys.exit(1)
 
+def animate_sheet(svg_data, mode="symbol"):
+    """
+    Add the staggered grayscale -> color reveal to a skillicons.dev sheet.
+
+    mode="symbol" defines every icon once in <defs> and references it twice
+    with <use>, sharing a single grayscale filter.  mode="inline" is the
+    original output that embeds each icon body twice.
+    Returns (animated_svg, num_icons).
+    """
     svg_start_match = re.search(r'<svg[^>]+>', svg_data)
     if not svg_start_match:
-        print("Could not find <svg> tag")
-        sys.exit(1)
-        
+        raise ValueError("Could not find <svg> tag")
+
     svg_start_idx = svg_start_match.end()
-    
-    pattern = r'(<g transform="translate\([^)]+\)">)\s*(<svg.*?</svg>)\s*(</g>)'
-    
-    GAME_DURATION = 40.0 # seconds
-    FILL_TIME = 35.0
-    
-    icons_found = re.findall(pattern, svg_data, re.DOTALL)
-    num_icons = len(icons_found)
-    
+
+    num_icons = len(re.findall(ICON_PATTERN, svg_data, re.DOTALL))
     if num_icons == 0:
-        print("No icons found in the SVG!")
-        sys.exit(1)
-        
+        raise ValueError("No icons found in the SVG!")
+
+    symbols = []
     counter = 0
     def replacer_staggered(match):
         nonlocal counter
         g_open = match.group(1)
         inner_svg = match.group(2)
         g_close = match.group(3)
-        
-        start_time = (counter / num_icons) * FILL_TIME
-        end_time = start_time + 1.0
-        
-        k_start = start_time / GAME_DURATION
-        k_end = end_time / GAME_DURATION
-        
-        k_str = f"0;{k_start:.4f};{k_end:.4f};1"
-        v_str = "0;0;1;1"
-        
-        res = f"{g_open}\n" + \
-              f'  <g filter="url(#grayscale_%d)">\n    {inner_svg}\n  </g>\n' % counter + \
-              f'  <g opacity="0">\n    {inner_svg}\n' + \
-              f'    <animate attributeName="opacity" values="{v_str}" keyTimes="{k_str}" dur="{GAME_DURATION}s" fill="freeze" />\n' + \
-              f'  </g>\n' + \
-              f"{g_close}"
-        
+
+        anim = reveal_animation(counter, num_icons)
+
+        if mode == "symbol":
+            symbol, (w, h) = to_symbol(inner_svg, f"icon_{counter}")
+            symbols.append(symbol)
+            use = f'<use href="#icon_{counter}" xlink:href="#icon_{counter}" width="{w}" height="{h}"/>'
+            res = f"{g_open}\n" + \
+                  f'  <g filter="url(#grayscale)">{use}</g>\n' + \
+                  f'  <g opacity="0">{use}\n' + \
+                  f'    {anim}\n' + \
+                  f'  </g>\n' + \
+                  f"{g_close}"
+        else:
+            res = f"{g_open}\n" + \
+                  f'  <g filter="url(#grayscale_%d)">\n    {inner_svg}\n  </g>\n' % counter + \
+                  f'  <g opacity="0">\n    {inner_svg}\n' + \
+                  f'    {anim}\n' + \
+                  f'  </g>\n' + \
+                  f"{g_close}"
+
         counter += 1
         return res
 
-    animated_svg_data = re.sub(pattern, replacer_staggered, svg_data, flags=re.DOTALL)
-    
-    # We create multiple grayscale filters because some SVG renderers might struggle applying one filter to many elements
-    # Or just one is fine, let's use a single one to save space.
-    # Wait, in the string interpolation I used #grayscale_%d. Let's provide multiple just in case or change it to one.
-    # Changed to multiple filters below to be safe.
-    
+    animated_svg_data = re.sub(ICON_PATTERN, replacer_staggered, svg_data, flags=re.DOTALL)
+
     defs_block = "  <defs>\n"
-    for i in range(num_icons):
-        defs_block += f'    <filter id="grayscale_{i}"><feColorMatrix type="matrix" values="0.3333 0.3333 0.3333 0 0  0.3333 0.3333 0.3333 0 0  0.3333 0.3333 0.3333 0 0  0 0 0 1 0"/></filter>\n'
+    if mode == "symbol":
+        # One filter is enough once the icons are shared symbols
+        defs_block += f'    <filter id="grayscale"><feColorMatrix type="matrix" values="{GRAYSCALE_MATRIX}"/></filter>\n'
+        for symbol in symbols:
+            defs_block += f"    {symbol}\n"
+    else:
+        for i in range(num_icons):
+            defs_block += f'    <filter id="grayscale_{i}"><feColorMatrix type="matrix" values="{GRAYSCALE_MATRIX}"/></filter>\n'
     defs_block += "  </defs>\n"
 
     animated_svg_data = animated_svg_data[:svg_start_idx] + "\n" + defs_block + animated_svg_data[svg_start_idx:]
+    return animated_svg_data, num_icons
+
+
+def load_config(path):
+    config = dict(DEFAULT_CONFIG)
+    if path and os.path.exists(path):
+        with open(path) as f:
+            config.update(json.load(f))
+    return config
+
+
+class IconCache:
+    """
+    Content-addressed store of single-icon SVGs.
+
+    Bodies live in objects/<sha256>.svg; index.json maps "<theme>/<name>"
+    to the digest, so identical icons across themes are stored once.
+    An empty digest records a name the service has no icon for, so it is
+    not re-requested on every run.
+    """
+
+    def __init__(self, root=CACHE_DIR):
+        self.root = root
+        self.index_path = os.path.join(root, "index.json")
+        try:
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {}
+
+    def _object_path(self, digest):
+        return os.path.join(self.root, "objects", f"{digest}.svg")
+
+    def get(self, name, theme):
+        digest = self.index.get(f"{theme}/{name}")
+        if not digest:
+            return digest
+        try:
+            with open(self._object_path(digest)) as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, name, theme, icon_svg):
+        if not icon_svg:
+            self.index[f"{theme}/{name}"] = ""
+            return
+        digest = hashlib.sha256(icon_svg.encode("utf-8")).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write(icon_svg)
+        self.index[f"{theme}/{name}"] = digest
+
+    def save(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.index, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.index_path)
+
+
+def split_sheet(svg_data):
+    """
+    Return the nested <svg> of every slot in a sheet, in sheet order.  The
+    service keeps a slot for names it does not know (its body is the text
+    "undefined"); those come back as "".
+    """
+    slots = re.findall(SLOT_PATTERN, svg_data, re.DOTALL)
+    return ["" if body == "undefined" else body for body in slots]
+
+
+def fetch_icons(names, theme, perline):
+    url = ICONS_URL.format(icons=",".join(names), theme=theme, perline=perline)
+    req = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
+    with urllib.request.urlopen(req, timeout=30) as response:
+        icons = split_sheet(response.read().decode('utf-8'))
+    if len(icons) != len(names):
+        raise ValueError(f"expected {len(names)} icons, sheet has {len(icons)}")
+    return dict(zip(names, icons))
+
+
+def build_sheet(icons, perline):
+    """
+    Lay out icon SVGs exactly like the skillicons.dev sheet endpoint,
+    including the empty "undefined" slot it leaves for unknown names.
+    """
+    cols = min(perline, len(icons))
+    rows = -(-len(icons) // perline)
+    width = cols * ICON_PITCH - (ICON_PITCH - ICON_SIZE)
+    height = rows * ICON_PITCH - (ICON_PITCH - ICON_SIZE)
+    scale = RENDER_SIZE / ICON_SIZE
+
+    groups = []
+    for i, icon_svg in enumerate(icons):
+        x, y = (i % perline) * ICON_PITCH, (i // perline) * ICON_PITCH
+        groups.append(f'        <g transform="translate({x}, {y})">\n'
+                      f'          {icon_svg or "undefined"}\n'
+                      f'        </g>\n')
+    return (f'\n  <svg width="{width * scale:g}" height="{height * scale:g}" '
+            f'viewBox="0 0 {width} {height}" fill="none" '
+            f'xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" version="1.1">\n'
+            f'\n    \n' + "         \n".join(groups) + '        \n  </svg>\n  ')
+
+
+def load_sheet(config, cache, offline=False, refresh=False):
+    """
+    Assemble the icon sheet from the cache, downloading only icons that are
+    missing (or all of them with refresh=True).  offline=True never touches
+    the network and fails if an icon has not been cached yet.
+    """
+    names, theme, perline = config["icons"], config["theme"], config["perline"]
+    icons = {} if refresh else {n: cache.get(n, theme) for n in names}
+    missing = [n for n in names if icons.get(n) is None]
+
+    if missing:
+        if offline:
+            raise LookupError(f"not cached for theme {theme!r}: {', '.join(missing)}")
+        for name, icon_svg in fetch_icons(missing, theme, perline).items():
+            cache.put(name, theme, icon_svg)
+            icons[name] = icon_svg
+        cache.save()
+
+    return build_sheet([icons[n] for n in names], perline)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--mode', choices=['symbol', 'inline'], default='symbol',
+                    help='symbol: one <symbol> per icon reused via <use> (default); '
+                         'inline: legacy output with duplicated icon bodies')
+    ap.add_argument('--output', default='animated-skills.svg')
+    ap.add_argument('--config', default='skills.json',
+                    help='JSON with "icons", "theme" and "perline" (defaults built in)')
+    ap.add_argument('--cache-dir', default=CACHE_DIR)
+    ap.add_argument('--offline', action='store_true',
+                    help='build the sheet from cached icons only, never hit the network')
+    ap.add_argument('--refresh', action='store_true',
+                    help='re-download every icon even if it is cached')
+    args = ap.parse_args(argv)
+
+    config = load_config(args.config)
+    try:
+        with perf.stage("load_sheet"):
+            svg_data = load_sheet(config, IconCache(args.cache_dir),
+                                  offline=args.offline, refresh=args.refresh)
+    except Exception as e:
+        print(f"Error fetching icons: {e}")
+        sys.exit(1)
+
+    try:
+        with perf.stage("animate"):
+            animated_svg_data, num_icons = animate_sheet(svg_data, args.mode)
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+
+    with perf.stage("write"):
+        with open(args.output, 'w') as f:
+            f.write(animated_svg_data)
 
-    with open('animated-skills.svg', 'w') as f:
-        f.write(animated_svg_data)
-        
-    print(f"Generated animated-skills.svg with {num_icons} animated icons!")
+    print(f"Generated {args.output} with {num_icons} animated icons!")
 
 if __name__ == "__main__":
     main()
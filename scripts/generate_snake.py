@@ -1,8 +1,16 @@
 #!/usr/bin/env python3
 """Custom snake animation: a visible snake with head + body traverses the
 contribution grid eating all cells except those forming NISHANT.
+
+The SVG animates with SMIL; the same timeline can also be sampled into a
+GIF or WebP with Pillow:
+
+    python scripts/generate_snake.py snake.svg
+    python scripts/generate_snake.py snake.gif --fps 12
 """
-import json, os, sys, urllib.request
+import functools, json, os, sys, urllib.request
+import calendar_grid, perf, pixel_font
+from scene import Track, animate, frame_times
 
 COLS, ROWS, CELL, GAP, RAD = 52, 7, 11, 3, 2
 BG = "#0d1117"
@@ -10,35 +18,70 @@ EMPTY = "#161b22"
 LV = ["#161b22", "#0e4429", "#006d32", "#26a641", "#39d353"]
 LOOP, EAT, HOLD = 20, 10, 6  # longer eat = slower visible snake; extra hold for GAME OVER
 
-FONT = {
-    'N': [[1,1,0,0,1,1],[1,1,1,0,1,1],[1,1,1,1,1,1],[1,1,0,1,1,1],
-          [1,1,0,0,1,1],[1,1,0,0,1,1],[1,1,0,0,1,1]],
-    'I': [[1,1,1,1,1,1],[0,0,1,1,0,0],[0,0,1,1,0,0],[0,0,1,1,0,0],
-          [0,0,1,1,0,0],[0,0,1,1,0,0],[1,1,1,1,1,1]],
-    'S': [[0,1,1,1,1,0],[1,1,0,0,1,1],[1,1,0,0,0,0],[0,1,1,1,1,0],
-          [0,0,0,0,1,1],[1,1,0,0,1,1],[0,1,1,1,1,0]],
-    'H': [[1,1,0,0,1,1],[1,1,0,0,1,1],[1,1,0,0,1,1],[1,1,1,1,1,1],
-          [1,1,0,0,1,1],[1,1,0,0,1,1],[1,1,0,0,1,1]],
-    'A': [[0,0,1,1,0,0],[0,1,1,1,1,0],[1,1,0,0,1,1],[1,1,1,1,1,1],
-          [1,1,0,0,1,1],[1,1,0,0,1,1],[1,1,0,0,1,1]],
-    'T': [[1,1,1,1,1,1],[0,0,1,1,0,0],[0,0,1,1,0,0],[0,0,1,1,0,0],
-          [0,0,1,1,0,0],[0,0,1,1,0,0],[0,0,1,1,0,0]],
-}
+FONT = pixel_font.BOLD          # 6x7 wordmark glyphs
+MAX_TEXT = (COLS + 1) // (FONT.width + 1)   # glyphs (1-column gaps) that fit the grid
+
+S = CELL + GAP
+PAD = 16
+SVG_W, SVG_H = COLS*S + GAP + PAD*2, ROWS*S + GAP + PAD*2
+
+# Body segments: same path as the head, `lag` cells behind per segment
+BODY_SEGMENTS = 8
+BODY_LAG = 3  # positions behind per segment
+BODY_COLORS = ["#39d353", "#31c14a", "#29ae41", "#229c38", "#1a8a2f",
+               "#127826", "#0a661d", "#025414"]
+BODY_SIZES = [CELL//2+2, CELL//2+1, CELL//2+1, CELL//2, CELL//2,
+              CELL//2-1, CELL//2-1, CELL//2-2]
+BODY_OPACITY = ["1", "0.95", "0.9", "0.85", "0.75", "0.65", "0.55", "0.4"]
+
+# GAME OVER overlay: appear at EAT+0.5, flicker in, hold until EAT+HOLD-1, then hide
+GO_START = EAT + 0.5   # 10.5s
+GO_END   = EAT + HOLD - 1  # 15s
+GO_CLEAR = EAT + HOLD + 1  # 17s (fully gone before loop)
+
+GO_FONT = pixel_font.GAME_OVER  # 5x7
+PIXEL_SIZE = 4
+PIXEL_GAP = 1
+CHAR_W = GO_FONT.width * (PIXEL_SIZE + PIXEL_GAP)
+CHAR_H = GO_FONT.height * (PIXEL_SIZE + PIXEL_GAP)
+CHAR_GAP = PIXEL_SIZE + 1
+
+GO_COLOR1 = "#39d353"   # bright green
+GO_COLOR2 = "#ff0000"   # red accent for 'OVER'
+GO_SHADOW = "#0a660d"
+
+# Opacity tracks shared by the SVG (SMIL) and raster output
+MASK_OPACITY = Track([(0, 0.4), (EAT, 0.4), (EAT+1, 1), (EAT+HOLD, 1), (LOOP, 0.4)])
+SNAKE_VIS = Track([(0, 1), (EAT, 1), (EAT+0.3, 0), (EAT+HOLD+1, 0), (LOOP, 1)])
+_GO_TIMES = [0, GO_START, GO_START+0.1, GO_START+0.2, GO_START+0.4, GO_START+0.6,
+             GO_END, GO_CLEAR, LOOP]
+GO_PANEL_VIS = Track(zip(_GO_TIMES, [0, 0, 0.7, 0, 0.9, 0.92, 0.92, 0, 0])).simplified()
+GO_TEXT_VIS = Track(zip(_GO_TIMES, [0, 0, 1, 0, 1, 1, 1, 0, 0])).simplified()
+GO_BLINK_VIS = Track(zip([0, GO_START+0.6, GO_START+1.0, GO_START+1.5, GO_START+2.0,
+                          GO_END, GO_CLEAR, LOOP], [0, 0, 1, 0, 1, 1, 0, 0])).simplified()
+
+def cell_opacity(fade_at, fade_end):
+    """Eaten cells: fade out as the head arrives, back 2s after the hold."""
+    return Track([(0, 1), (fade_at, 1), (fade_end, 0), (EAT+HOLD, 0), (EAT+HOLD+2, 1),
+                  (LOOP, 1)]).simplified()
 
 def text_mask(text):
     mask = [[False]*COLS for _ in range(ROWS)]
-    lw, g = 6, 1
+    lw, g = FONT.width, 1
     total = len(text)*lw + (len(text)-1)*g
     off = (COLS - total) // 2
     for i, ch in enumerate(text):
         bc = off + i*(lw+g)
-        for r in range(ROWS):
-            for c in range(lw):
-                gc = bc + c
-                if 0 <= gc < COLS and FONT[ch][r][c]:
-                    mask[r][gc] = True
+        for c, r in FONT.pixels(ch):
+            gc = bc + c
+            if 0 <= gc < COLS and r < ROWS:
+                mask[r][gc] = True
     return mask
 
+def grid_from_weeks(weeks):
+    """COLS x ROWS counts from GraphQL calendar weeks (most recent COLS weeks)."""
+    return calendar_grid.grid_from_weeks(weeks, COLS, ROWS)
+
 def fetch(user, token):
     q = json.dumps({"query": '{ user(login: "%s") { contributionsCollection { contributionCalendar { weeks { contributionDays { contributionCount weekday } } } } } }' % user})
     try:
@@ -47,113 +90,95 @@ def fetch(user, token):
         with urllib.request.urlopen(req) as r:
             data = json.loads(r.read())
         weeks = data["data"]["user"]["contributionsCollection"]["contributionCalendar"]["weeks"]
-        grid = []
-        for w in weeks:
-            col = [0]*ROWS
-            for d in w["contributionDays"]: col[d["weekday"]] = d["contributionCount"]
-            grid.append(col)
-        if len(grid) > COLS: grid = grid[-COLS:]
-        while len(grid) < COLS: grid.insert(0, [0]*ROWS)
-        return grid
+        return grid_from_weeks(weeks)
     except Exception as e:
         print(f"API warning: {e}", file=sys.stderr)
         return None
 
-def to_level(c, mx):
-    if c == 0 or mx == 0: return 0
-    r = c/mx
-    return 1 if r<=0.25 else 2 if r<=0.5 else 3 if r<=0.75 else 4
-
-def generate(out, text="NISHANT", grid=None):
-    mask = text_mask(text)
-
+def levels(grid, thresholds=None):
+    """
+    ROWS x COLS colour levels (0-4), bucketed at the quartiles of the
+    non-zero counts (or the given thresholds); a seeded random board
+    without a grid.
+    """
     if grid:
-        mx = max(max(w) for w in grid)
-        lvl = [[to_level(grid[c][r], mx) for c in range(COLS)] for r in range(ROWS)]
-    else:
-        import random; random.seed(7)
-        lvl = [[random.choice([0,0,1,1,2,3,4]) for _ in range(COLS)] for _ in range(ROWS)]
+        return calendar_grid.levels(grid, thresholds)
+    import random; random.seed(7)
+    return [[random.choice([0,0,1,1,2,3,4]) for _ in range(COLS)] for _ in range(ROWS)]
 
-    # Snake zigzag order
+def zigzag_order():
+    """Cells in the order the snake eats them (row by row, alternating)."""
     order = []
     for r in range(ROWS):
         rng = range(COLS) if r % 2 == 0 else range(COLS-1, -1, -1)
         for c in rng: order.append((r, c))
+    return order
+
+def cell_origin(r, c):
+    return PAD + c*S + GAP, PAD + r*S + GAP
+
+def cell_center(r, c):
+    return PAD + c*S + GAP + CELL//2, PAD + r*S + GAP + CELL//2
+
+def cell_fade(pos, n):
+    """(start, end) seconds of the fade of the cell eaten pos-th of n."""
+    fade_at = (pos / n) * EAT
+    return fade_at, min(fade_at + 0.15, EAT)
+
+def snake_track(order, lag=0):
+    """
+    (cx, cy) tracks of a snake segment `lag` cells behind the head: one key
+    per cell while eating, hold at the end, reset at LOOP.  Simplification
+    (one pass over the keys) leaves little more than the row ends.
+    """
+    N = len(order)
+    centers = [cell_center(*order[0])] * min(lag, N) + [cell_center(r, c) for r, c in order[:max(0, N - lag)]]
+    track = [((i / N) * EAT, centers[i]) for i in range(N)]
+    # Hold position (stay at last point during NISHANT glow)
+    track.append((EAT + HOLD, cell_center(*order[max(0, N - 1 - lag)])))
+    # Reset position (jump back to start for next loop)
+    track.append((LOOP, cell_center(*order[0])))
+    return (Track([(t, x) for t, (x, _) in track]).simplified(),
+            Track([(t, y) for t, (_, y) in track]).simplified())
+
+def go_layout():
+    """GAME OVER geometry: (go_x, go_y1, go_y2, panel (x, y, w, h), blink_y)."""
+    def text_pixel_width(text):
+        return len(text) * (CHAR_W + CHAR_GAP) - CHAR_GAP
+    total_w = max(text_pixel_width("GAME"), text_pixel_width("OVER"))
+    go_x = (SVG_W - total_w) // 2
+    go_y1 = SVG_H // 2 - CHAR_H - 4   # "GAME" row
+    go_y2 = SVG_H // 2 + 4             # "OVER" row
+    panel_pad = 8
+    panel = (go_x - panel_pad, go_y1 - panel_pad, total_w + 2 * panel_pad,
+             (CHAR_H * 2) + 12 + 2 * panel_pad)
+    return go_x, go_y1, go_y2, panel, go_y2 + CHAR_H + 6
+
+def render(text="NISHANT", grid=None, thresholds=None):
+    """
+    The snake SVG as a string (grid: COLS x ROWS counts, or None for random;
+    thresholds: calendar_grid level bounds, default from the grid).
+    """
+    lap = perf.laps()
+    mask = text_mask(text)
+    lvl = levels(grid, thresholds)
+    lap("levels")
+
+    order = zigzag_order()
     idx = {pos: i for i, pos in enumerate(order)}
     N = len(order)
+    pad = PAD
+    sw, sh = SVG_W, SVG_H
 
-    S = CELL + GAP
-    pad = 16
-    sw, sh = COLS*S + GAP + pad*2, ROWS*S + GAP + pad*2
-
-    def frac(sec): return f"{sec/LOOP:.4f}"
-    def cell_center(r, c):
-        return pad + c*S + GAP + CELL//2, pad + r*S + GAP + CELL//2
-
-    # Pre-compute ALL snake positions (every cell in zigzag order)
-    # Subsample every 2nd for file size balance (still smooth)
-    STEP = 2
-    sampled = list(range(0, N, STEP))
-    if sampled[-1] != N-1:
-        sampled.append(N-1)
-    n_pts = len(sampled)
-
-    # Build position arrays for the snake head
-    # keyTimes MUST span 0.0 to 1.0 for valid SMIL
-    head_cx = []
-    head_cy = []
-    head_kt = []
-    for si in sampled:
-        r, c = order[si]
-        cx, cy = cell_center(r, c)
-        head_cx.append(str(cx))
-        head_cy.append(str(cy))
-        head_kt.append(frac((si / N) * EAT))
-
-    # Add hold position (stay at last point during NISHANT glow)
-    last_r, last_c = order[-1]
-    last_cx, last_cy = cell_center(last_r, last_c)
-    head_cx.append(str(last_cx))
-    head_cy.append(str(last_cy))
-    head_kt.append(frac(EAT + HOLD))
-
-    # Add reset position (jump back to start for next loop)
-    first_r, first_c = order[0]
-    first_cx, first_cy = cell_center(first_r, first_c)
-    head_cx.append(str(first_cx))
-    head_cy.append(str(first_cy))
-    head_kt.append("1")
-
-    # Body segments: same path but offset by `lag` positions behind the head
-    BODY_SEGMENTS = 8
-    BODY_LAG = 3  # positions behind per segment
-    BODY_COLORS = ["#39d353", "#31c14a", "#29ae41", "#229c38", "#1a8a2f",
-                   "#127826", "#0a661d", "#025414"]
-    BODY_SIZES = [CELL//2+2, CELL//2+1, CELL//2+1, CELL//2, CELL//2,
-                  CELL//2-1, CELL//2-1, CELL//2-2]
-    BODY_OPACITY = ["1", "0.95", "0.9", "0.85", "0.75", "0.65", "0.55", "0.4"]
-
-    def build_body_positions(lag_cells):
-        """Build position arrays for a body segment lagging behind head."""
-        cx_arr, cy_arr = [], []
-        for si in sampled:
-            lagged = max(0, si - lag_cells)
-            r, c = order[lagged]
-            x, y = cell_center(r, c)
-            cx_arr.append(str(x))
-            cy_arr.append(str(y))
-        # Hold position (same as head's last lagged pos)
-        lagged = max(0, N - 1 - lag_cells)
-        r, c = order[lagged]
-        x, y = cell_center(r, c)
-        cx_arr.append(str(x))
-        cy_arr.append(str(y))
-        # Reset position (back to start lagged pos)
-        r, c = order[0]
-        x, y = cell_center(r, c)
-        cx_arr.append(str(x))
-        cy_arr.append(str(y))
-        return cx_arr, cy_arr
+    def move(tracks):
+        """cx/cy <animate> pair for a (cx, cy) track pair."""
+        return [animate("cx", tracks[0], LOOP), animate("cy", tracks[1], LOOP)]
+
+    head = move(snake_track(order))
+    # Visibility: visible during eat, hidden during hold, reappear for reset
+    snake_vis = animate("opacity", SNAKE_VIS, LOOP)
+    mask_anim = animate("opacity", MASK_OPACITY, LOOP)
+    lap("timeline")
 
     # --- Start SVG ---
     o = [f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {sw} {sh}">']
@@ -182,228 +207,298 @@ def generate(out, text="NISHANT", grid=None):
                 color = LV[max(3, lv)]
                 o.append(f'<rect x="{x}" y="{y}" width="{CELL}" height="{CELL}" '
                          f'rx="{RAD}" fill="{color}" filter="url(#glow)">')
-                o.append(f'<animate attributeName="opacity" '
-                         f'values="0.4;0.4;1;1;0.4" '
-                         f'keyTimes="0;{frac(EAT)};{frac(EAT+1)};{frac(EAT+HOLD)};1" '
-                         f'dur="{LOOP}s" repeatCount="indefinite"/>')
+                o.append(mask_anim)
                 o.append('</rect>')
             else:
                 color = LV[lv] if lv > 0 else EMPTY
-                pos = idx[(r, c)]
                 # Cell fades exactly when snake head arrives
-                fade_at = (pos / N) * EAT
-                fade_end = min(fade_at + 0.15, EAT)
+                fade = cell_opacity(*cell_fade(idx[(r, c)], N))
 
                 o.append(f'<rect x="{x}" y="{y}" width="{CELL}" height="{CELL}" '
                          f'rx="{RAD}" fill="{color}">')
-                o.append(f'<animate attributeName="opacity" '
-                         f'values="1;1;0;0;1;1" '
-                         f'keyTimes="0;{frac(fade_at)};{frac(fade_end)};'
-                         f'{frac(EAT+HOLD)};{frac(EAT+HOLD+2)};1" '
-                         f'dur="{LOOP}s" repeatCount="indefinite"/>')
+                o.append(animate("opacity", fade, LOOP))
                 o.append('</rect>')
 
-    # --- Snake body segments (drawn BEFORE head so head is on top) ---
-    kt_str = ";".join(head_kt)
-
-    # Visibility: visible during eat, hidden during hold, reappear for reset
-    snake_vis = (f'<animate attributeName="opacity" values="1;1;0;0;1" '
-                 f'keyTimes="0;{frac(EAT)};{frac(EAT+0.3)};{frac(EAT+HOLD+1)};1" '
-                 f'dur="{LOOP}s" repeatCount="indefinite"/>')
+    lap("cells")
 
+    # --- Snake body segments (drawn BEFORE head so head is on top) ---
     # Draw body from tail to head (so head renders on top)
     for seg in range(BODY_SEGMENTS-1, -1, -1):
         lag = (seg + 1) * BODY_LAG
-        bcx, bcy = build_body_positions(lag)
-        cx_str = ";".join(bcx)
-        cy_str = ";".join(bcy)
         r_size = BODY_SIZES[seg]
         color = BODY_COLORS[seg]
         opac = BODY_OPACITY[seg]
 
         o.append(f'<circle r="{r_size}" fill="{color}" opacity="{opac}">')
-        o.append(f'<animate attributeName="cx" values="{cx_str}" '
-                 f'keyTimes="{kt_str}" dur="{LOOP}s" repeatCount="indefinite"/>')
-        o.append(f'<animate attributeName="cy" values="{cy_str}" '
-                 f'keyTimes="{kt_str}" dur="{LOOP}s" repeatCount="indefinite"/>')
+        o.extend(move(snake_track(order, lag)))
         o.append(snake_vis)
         o.append('</circle>')
 
     # --- Snake head (on top of everything) ---
-    cx_str = ";".join(head_cx)
-    cy_str = ";".join(head_cy)
-
     # Head outer glow
     o.append(f'<circle r="{CELL//2+4}" fill="{LV[4]}" opacity="0.3" filter="url(#glow2)">')
-    o.append(f'<animate attributeName="cx" values="{cx_str}" '
-             f'keyTimes="{kt_str}" dur="{LOOP}s" repeatCount="indefinite"/>')
-    o.append(f'<animate attributeName="cy" values="{cy_str}" '
-             f'keyTimes="{kt_str}" dur="{LOOP}s" repeatCount="indefinite"/>')
+    o.extend(head)
     o.append(snake_vis)
     o.append('</circle>')
 
     # Head core
     o.append(f'<circle r="{CELL//2+2}" fill="{LV[4]}" filter="url(#glow)">')
-    o.append(f'<animate attributeName="cx" values="{cx_str}" '
-             f'keyTimes="{kt_str}" dur="{LOOP}s" repeatCount="indefinite"/>')
-    o.append(f'<animate attributeName="cy" values="{cy_str}" '
-             f'keyTimes="{kt_str}" dur="{LOOP}s" repeatCount="indefinite"/>')
+    o.extend(head)
     o.append(snake_vis)
     o.append('</circle>')
 
-    # --- GAME OVER overlay (8-bit pixel style) ---
-    # Timing: appear at EAT+0.5, flicker in, hold until EAT+HOLD-1, then hide
-    GO_START = EAT + 0.5   # 10.5s
-    GO_END   = EAT + HOLD - 1  # 15s
-    GO_CLEAR = EAT + HOLD + 1  # 17s (fully gone before loop)
-
-    def frac_abs(sec):
-        return f"{sec/LOOP:.4f}"
-
-    # 8x5 pixel font for uppercase letters (rows x cols, LSB = leftmost)
-    PIXEL_FONT = {
-        'G': [
-            [0,1,1,1,0],[1,0,0,0,0],[1,0,1,1,1],[1,0,0,0,1],
-            [1,0,0,0,1],[1,0,0,0,1],[0,1,1,1,0],
-        ],
-        'A': [
-            [0,1,1,1,0],[1,0,0,0,1],[1,0,0,0,1],[1,1,1,1,1],
-            [1,0,0,0,1],[1,0,0,0,1],[1,0,0,0,1],
-        ],
-        'M': [
-            [1,0,0,0,1],[1,1,0,1,1],[1,0,1,0,1],[1,0,0,0,1],
-            [1,0,0,0,1],[1,0,0,0,1],[1,0,0,0,1],
-        ],
-        'E': [
-            [1,1,1,1,1],[1,0,0,0,0],[1,0,0,0,0],[1,1,1,1,0],
-            [1,0,0,0,0],[1,0,0,0,0],[1,1,1,1,1],
-        ],
-        'O': [
-            [0,1,1,1,0],[1,0,0,0,1],[1,0,0,0,1],[1,0,0,0,1],
-            [1,0,0,0,1],[1,0,0,0,1],[0,1,1,1,0],
-        ],
-        'V': [
-            [1,0,0,0,1],[1,0,0,0,1],[1,0,0,0,1],[1,0,0,0,1],
-            [1,0,0,0,1],[0,1,0,1,0],[0,0,1,0,0],
-        ],
-        'R': [
-            [1,1,1,1,0],[1,0,0,0,1],[1,0,0,0,1],[1,1,1,1,0],
-            [1,0,1,0,0],[1,0,0,1,0],[1,0,0,0,1],
-        ],
-        ' ': [[0,0,0,0,0]]*7,
-    }
-
-    PIXEL_SIZE = 4
-    PIXEL_GAP = 1
-    CHAR_W = 5 * (PIXEL_SIZE + PIXEL_GAP)
-    CHAR_H = 7 * (PIXEL_SIZE + PIXEL_GAP)
-    CHAR_GAP = PIXEL_SIZE + 1
-
-    GO_COLOR1 = "#39d353"   # bright green
-    GO_COLOR2 = "#ff0000"   # red accent for 'OVER'
-    GO_SHADOW = "#0a660d"
-
-    def render_pixel_text(text, start_x, start_y, color):
-        """Render pixel-art text, return list of SVG rect strings."""
-        elems = []
-        cx = start_x
-        for ch in text:
-            bitmap = PIXEL_FONT.get(ch, PIXEL_FONT[' '])
-            for row_i, row in enumerate(bitmap):
-                for col_i, px in enumerate(row):
-                    if px:
-                        px_x = cx + col_i * (PIXEL_SIZE + PIXEL_GAP)
-                        px_y = start_y + row_i * (PIXEL_SIZE + PIXEL_GAP)
-                        elems.append(
-                            f'<rect x="{px_x}" y="{px_y}" '
-                            f'width="{PIXEL_SIZE}" height="{PIXEL_SIZE}" '
-                            f'fill="{color}" rx="0.5"/>'
-                        )
-            cx += CHAR_W + CHAR_GAP
-        return elems
-
-    # Calculate total text width for centering
-    def text_pixel_width(text):
-        return len(text) * (CHAR_W + CHAR_GAP) - CHAR_GAP
+    lap("snake")
 
-    total_w = max(text_pixel_width("GAME"), text_pixel_width("OVER"))
-    go_x = (sw - total_w) // 2
-    go_y1 = sh // 2 - CHAR_H - 4   # "GAME" row
-    go_y2 = sh // 2 + 4             # "OVER" row
+    # --- GAME OVER overlay (8-bit pixel style) ---
+    # One <g> per layer carries the layer's only opacity animation, so the
+    # whole overlay runs on three clocks; each word is a single path.
+    go_x, go_y1, go_y2, (panel_x, panel_y, panel_w, panel_h), blink_y = go_layout()
 
-    # Background panel behind GAME OVER text (semi-transparent dark box)
-    panel_pad = 8
-    panel_x = go_x - panel_pad
-    panel_y = go_y1 - panel_pad
-    panel_w = total_w + 2 * panel_pad
-    panel_h = (CHAR_H * 2) + 12 + 2 * panel_pad
-
-    # Flicker keyTimes & values:
-    # Hidden -> quick flickers -> visible -> hold -> fade out -> hidden
-    flicker_kt = f"0;{frac_abs(GO_START)};{frac_abs(GO_START+0.1)};{frac_abs(GO_START+0.2)};{frac_abs(GO_START+0.4)};{frac_abs(GO_START+0.6)};{frac_abs(GO_END)};{frac_abs(GO_CLEAR)};1"
-    panel_vis  = f"values=\"0;0;0.7;0;0.9;0.92;0.92;0;0\"  keyTimes=\"{flicker_kt}\"  dur=\"{LOOP}s\" repeatCount=\"indefinite\""
-    text_vis   = f"values=\"0;0;1;0;1;1;1;0;0\"  keyTimes=\"{flicker_kt}\"  dur=\"{LOOP}s\" repeatCount=\"indefinite\""
-
-    # Shadow panel (gives depth)
+    # Panel: shadow (gives depth) + main dark panel
+    o.append('<g opacity="0">')
+    o.append(animate("opacity", GO_PANEL_VIS, LOOP))
     o.append(f'<rect x="{panel_x+3}" y="{panel_y+3}" width="{panel_w}" height="{panel_h}" '
-             f'rx="2" fill="{GO_SHADOW}" opacity="0">')
-    o.append(f'<animate attributeName="opacity" {panel_vis}/>')
-    o.append('</rect>')
-
-    # Main dark panel
+             f'rx="2" fill="{GO_SHADOW}"/>')
     o.append(f'<rect x="{panel_x}" y="{panel_y}" width="{panel_w}" height="{panel_h}" '
-             f'rx="2" fill="#0d1117" opacity="0">')
-    o.append(f'<animate attributeName="opacity" {panel_vis}/>')
-    o.append('</rect>')
+             f'rx="2" fill="#0d1117"/>')
+    o.append('</g>')
 
-    # Border around panel (8-bit style double border)
+    # Text: 8-bit style double border, GAME, and OVER in red/danger color
+    o.append('<g opacity="0">')
+    o.append(animate("opacity", GO_TEXT_VIS, LOOP))
     o.append(f'<rect x="{panel_x}" y="{panel_y}" width="{panel_w}" height="{panel_h}" '
-             f'rx="2" fill="none" stroke="{GO_COLOR1}" stroke-width="2" opacity="0">')
-    o.append(f'<animate attributeName="opacity" {text_vis}/>')
-    o.append('</rect>')
+             f'rx="2" fill="none" stroke="{GO_COLOR1}" stroke-width="2"/>')
     o.append(f'<rect x="{panel_x+3}" y="{panel_y+3}" width="{panel_w-6}" height="{panel_h-6}" '
-             f'rx="1" fill="none" stroke="{GO_COLOR1}" stroke-width="1" opacity="0">')
-    o.append(f'<animate attributeName="opacity" {text_vis}/>')
-    o.append('</rect>')
-
-    # Render GAME pixel text
-    game_rects = render_pixel_text("GAME", go_x, go_y1, GO_COLOR1)
-    for r_elem in game_rects:
-        # Wrap in group with animation
-        base = r_elem[:-2]  # remove '/>' to add children
-        o.append(base + ' opacity="0">')
-        o.append(f'<animate attributeName="opacity" {text_vis}/>')
-        o.append('</rect>')
-
-    # Render OVER pixel text (in red/danger color)
-    over_rects = render_pixel_text("OVER", go_x, go_y2, GO_COLOR2)
-    for r_elem in over_rects:
-        base = r_elem[:-2]
-        o.append(base + ' opacity="0">')
-        o.append(f'<animate attributeName="opacity" {text_vis}/>')
-        o.append('</rect>')
+             f'rx="1" fill="none" stroke="{GO_COLOR1}" stroke-width="1"/>')
+    for word, y, color in (("GAME", go_y1, GO_COLOR1), ("OVER", go_y2, GO_COLOR2)):
+        o.append(f'<path fill="{color}" '
+                 f'd="{GO_FONT.path(word, go_x, y, PIXEL_SIZE, PIXEL_GAP, CHAR_GAP)}"/>')
+    o.append('</g>')
 
     # Blinking "PRESS START" prompt (simple text blink during hold)
-    blink_y = go_y2 + CHAR_H + 6
-    blink_kt  = f"0;{frac_abs(GO_START+0.6)};{frac_abs(GO_START+1.0)};{frac_abs(GO_START+1.5)};{frac_abs(GO_START+2.0)};{frac_abs(GO_END)};{frac_abs(GO_CLEAR)};1"
-    blink_vis = f"values=\"0;0;1;0;1;1;0;0\" keyTimes=\"{blink_kt}\" dur=\"{LOOP}s\" repeatCount=\"indefinite\""
     o.append(f'<text x="{sw//2}" y="{blink_y}" '
              f'font-family=\"monospace\" font-size=\"6\" '
              f'fill=\"#ffffff\" text-anchor=\"middle\" opacity=\"0\" '
              f'style=\"image-rendering:pixelated;font-weight:bold;letter-spacing:1px\">')
     o.append('RESTARTING...')
-    o.append(f'<animate attributeName="opacity" {blink_vis}/>')
+    o.append(animate("opacity", GO_BLINK_VIS, LOOP))
     o.append('</text>')
 
     o.append('</svg>')
-
-    with open(out, 'w') as f:
-        f.write('\n'.join(o))
+    lap("overlay")
+    return '\n'.join(o)
+
+# ---------------------------------------------------------------------------
+# Raster backend: the same timeline sampled at a fixed frame rate (Pillow)
+# ---------------------------------------------------------------------------
+RASTER_FORMATS = {".gif": "GIF", ".webp": "WEBP"}
+ALPHA_STEPS = 32      # opacities are quantized so faded sprites can be cached
+GLOW_MARGIN = 8       # px around a glowing sprite for the blur
+
+def _rgb(color):
+    return tuple(int(color[i:i+2], 16) for i in (1, 3, 5))
+
+def _fade(im, opacity):
+    if opacity < 1:
+        im = im.copy()
+        im.putalpha(im.getchannel("A").point(lambda v: round(v * opacity)))
+    return im
+
+def _glow(im, blur):
+    """feGaussianBlur + feMerge(blur, source)."""
+    from PIL import Image, ImageFilter
+    return Image.alpha_composite(im.filter(ImageFilter.GaussianBlur(blur)), im)
+
+@functools.lru_cache(maxsize=None)
+def cell_sprite(color, alpha, glow=False):
+    """RGBA rounded cell at alpha/ALPHA_STEPS opacity, padded by GLOW_MARGIN if glowing."""
+    from PIL import Image, ImageDraw
+    m = GLOW_MARGIN if glow else 0
+    im = Image.new("RGBA", (CELL + 2*m, CELL + 2*m), (0, 0, 0, 0))
+    ImageDraw.Draw(im).rounded_rectangle([m, m, m + CELL - 1, m + CELL - 1], RAD,
+                                         fill=_rgb(color))
+    if glow:
+        im = _glow(im, 2.5)
+    return _fade(im, alpha / ALPHA_STEPS)
+
+@functools.lru_cache(maxsize=None)
+def disc_sprite(radius, color, alpha, blur=0):
+    """RGBA circle (snake segment / head), optionally with a glow, centred."""
+    from PIL import Image, ImageDraw
+    m = GLOW_MARGIN + 4 if blur else 1
+    size = 2 * (radius + m)
+    im = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    c = radius + m
+    ImageDraw.Draw(im).ellipse([c - radius, c - radius, c + radius, c + radius],
+                               fill=_rgb(color))
+    if blur:
+        im = _glow(im, blur)
+    return _fade(im, alpha / ALPHA_STEPS)
+
+@functools.lru_cache(maxsize=None)
+def game_over_sprites(panel_alpha, text_alpha, blink_alpha):
+    """Full-canvas RGBA layer of the GAME OVER overlay at the given opacities."""
+    from PIL import Image, ImageDraw, ImageFont
+    go_x, go_y1, go_y2, (px, py, pw, ph), blink_y = go_layout()
+    layer = Image.new("RGBA", (SVG_W, SVG_H), (0, 0, 0, 0))
+    d = ImageDraw.Draw(layer)
+    pa = round(255 * panel_alpha / ALPHA_STEPS)
+    ta = round(255 * text_alpha / ALPHA_STEPS)
+    if pa:
+        d.rounded_rectangle([px + 3, py + 3, px + 3 + pw, py + 3 + ph], 2,
+                            fill=(*_rgb(GO_SHADOW), pa))
+        d.rounded_rectangle([px, py, px + pw, py + ph], 2, fill=(*_rgb(BG), pa))
+    if ta:
+        d.rounded_rectangle([px - 1, py - 1, px + pw + 1, py + ph + 1], 2,
+                            outline=(*_rgb(GO_COLOR1), ta), width=2)
+        d.rounded_rectangle([px + 3, py + 3, px + pw - 3, py + ph - 3], 1,
+                            outline=(*_rgb(GO_COLOR1), ta), width=1)
+        for word, y, color in (("GAME", go_y1, GO_COLOR1), ("OVER", go_y2, GO_COLOR2)):
+            GO_FONT.draw(d, word, go_x, y, (*_rgb(color), ta), PIXEL_SIZE, PIXEL_GAP,
+                         CHAR_GAP)
+    ba = round(255 * blink_alpha / ALPHA_STEPS)
+    if ba:
+        try:
+            font = ImageFont.load_default(size=6)
+        except TypeError:            # Pillow < 10.1: fixed-size bitmap font
+            font = ImageFont.load_default()
+        d.text((SVG_W // 2, blink_y), "RESTARTING...", fill=(255, 255, 255, ba),
+               font=font, anchor="ms")
+    return layer
+
+def render_frames(text="NISHANT", grid=None, fps=10, thresholds=None):
+    """
+    Sample the snake timeline at `fps` over one LOOP -> (frames, durations_ms).
+    The cell layer is kept between frames and only the boxes of cells whose
+    (quantized) opacity changed are repainted.
+    """
+    from PIL import Image
+    lap = perf.laps()
+    mask = text_mask(text)
+    lvl = levels(grid, thresholds)
+    order = zigzag_order()
+    N = len(order)
+    cells = []                       # (r, c, color, glow, opacity track)
+    for i, (r, c) in enumerate(order):
+        if mask[r][c]:
+            cells.append((r, c, LV[max(3, lvl[r][c])], True, MASK_OPACITY))
+        else:
+            color = LV[lvl[r][c]] if lvl[r][c] > 0 else EMPTY
+            cells.append((r, c, color, False, cell_opacity(*cell_fade(i, N))))
+    body = [(BODY_SIZES[seg], BODY_COLORS[seg], float(BODY_OPACITY[seg]),
+             snake_track(order, (seg + 1) * BODY_LAG))
+            for seg in range(BODY_SEGMENTS - 1, -1, -1)]
+    head = snake_track(order)
+    lap("timeline")
+
+    def position(tracks, t):
+        return tracks[0].at(t), tracks[1].at(t)
+
+    def paste(frame, sprite, cx, cy):
+        frame.paste(sprite, (round(cx) - sprite.width // 2, round(cy) - sprite.height // 2),
+                    sprite)
+
+    def sprite_box(cell, alpha):
+        r, c, color, glow, _ = cell
+        x, y = cell_origin(r, c)
+        m = GLOW_MARGIN if glow else 0
+        return cell_sprite(color, alpha, glow), (x - m, y - m)
+
+    def redraw(layer, box, alphas):
+        """Repaint box from the background and every cell sprite reaching into it."""
+        x0, y0, x1, y1 = box
+        tile = background.crop(box)
+        for cell, alpha in zip(cells, alphas):
+            if alpha:
+                sprite, (sx, sy) = sprite_box(cell, alpha)
+                if sx < x1 and sy < y1 and sx + sprite.width > x0 and sy + sprite.height > y0:
+                    tile.paste(sprite, (sx - x0, sy - y0), sprite)
+        layer.paste(tile, (x0, y0))
+
+    background = Image.new("RGB", (SVG_W, SVG_H), _rgb(BG))
+    frames, durations = [], []
+    layer, state = None, None
+    patched = rebuilt = 0
+    for t, duration in frame_times(LOOP, fps):
+        new_state = [round(cell[4].at(t) * ALPHA_STEPS) for cell in cells]
+        if layer is None:
+            layer = Image.new("RGB", (SVG_W, SVG_H))
+            redraw(layer, (0, 0, SVG_W, SVG_H), new_state)
+            rebuilt += 1
+        else:
+            changed = [k for k, (a, b) in enumerate(zip(state, new_state)) if a != b]
+            if len(changed) > len(cells) // 4:
+                redraw(layer, (0, 0, SVG_W, SVG_H), new_state)
+                rebuilt += 1
+            else:
+                for k in changed:
+                    # the sprite box (glow margin included) does not depend on alpha
+                    sprite, (x, y) = sprite_box(cells[k], new_state[k])
+                    redraw(layer, (x, y, x + sprite.width, y + sprite.height), new_state)
+                patched += len(changed)
+        state = new_state
+
+        frame = layer.copy()
+        vis = SNAKE_VIS.at(t)
+        if vis > 0:
+            for radius, color, opacity, track in body:
+                paste(frame, disc_sprite(radius, color, round(vis * opacity * ALPHA_STEPS)),
+                      *position(track, t))
+            hx, hy = position(head, t)
+            paste(frame, disc_sprite(CELL//2 + 4, LV[4], round(vis * 0.3 * ALPHA_STEPS), 4),
+                  hx, hy)
+            paste(frame, disc_sprite(CELL//2 + 2, LV[4], round(vis * ALPHA_STEPS), 2.5),
+                  hx, hy)
+        go = tuple(round(track.at(t) * ALPHA_STEPS)
+                   for track in (GO_PANEL_VIS, GO_TEXT_VIS, GO_BLINK_VIS))
+        if any(go):
+            overlay = game_over_sprites(*go)
+            frame.paste(overlay, (0, 0), overlay)
+        frames.append(frame)
+        durations.append(duration)
+    perf.count("cell_layer_rebuilds", rebuilt)
+    perf.count("cells_patched", patched)
+    lap("raster")
+    return frames, durations
+
+def generate_raster(out, text="NISHANT", grid=None, fps=10, workers=None, thresholds=None):
+    """
+    Write the animation as GIF or WebP (by extension).  GIFs go through
+    gif_writer with disposal 1, so each frame stores only its changed region.
+    """
+    fmt = RASTER_FORMATS.get(os.path.splitext(out)[1].lower())
+    if fmt is None:
+        raise ValueError(f"raster output must be one of {', '.join(RASTER_FORMATS)}")
+    frames, durations = render_frames(text, grid, fps, thresholds)
+    with perf.stage("encode"):
+        if fmt == "GIF":
+            import gif_writer
+            gif_writer.save_gif(frames, out, duration=durations, loop=0, disposal=1,
+                                workers=workers)
+        else:
+            frames[0].save(out, format="WEBP", save_all=True, append_images=frames[1:],
+                           duration=durations, loop=0, lossless=True, method=4)
+    print(f"Generated: {out} ({len(frames)} frames @ {fps} fps)")
+
+def generate(out, text="NISHANT", grid=None, fps=10, thresholds=None):
+    """snake.svg (SMIL) or, for .gif / .webp outputs, the raster rendering."""
+    if os.path.splitext(out)[1].lower() in RASTER_FORMATS:
+        return generate_raster(out, text, grid, fps, thresholds=thresholds)
+    svg = render(text, grid, thresholds)
+    with perf.stage("write"):
+        with open(out, 'w') as f:
+            f.write(svg)
     print(f"Generated: {out}")
 
 if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("out", nargs="?", default="snake.svg",
+                    help="snake.svg, or .gif / .webp for the raster version")
+    ap.add_argument("--text", default="NISHANT")
+    ap.add_argument("--fps", type=float, default=10, help="raster frame rate")
+    args = ap.parse_args()
     user = os.environ.get("GITHUB_USER", "nnish16")
     token = os.environ.get("GITHUB_TOKEN", "")
-    out = sys.argv[1] if len(sys.argv) > 1 else "snake.svg"
     grid = fetch(user, token) if token else None
-    generate(out, "NISHANT", grid)
+    generate(args.out, args.text, grid, args.fps)
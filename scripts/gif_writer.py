@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Parallel animated-GIF writer.
+
+GIF image blocks are self-contained: each frame carries its own local
+colour table and LZW stream.  So instead of one serial
+``save(save_all=True)`` call, every frame is quantized and LZW-compressed
+in a worker process (by Pillow's C encoder, on a single-frame GIF whose
+image block we lift out), and the parent only concatenates
+
+    header · logical screen · NETSCAPE loop · (GCE · descriptor · LCT · LZW)* · trailer
+
+in frame order.  Consecutive identical frames are merged (durations
+summed), like Pillow does.  With disposal 0/1 frames are additionally
+cropped to the region that changed since the previous frame.
+
+    gif_writer.save_gif(frames, "out.gif", duration=durations, loop=0, disposal=2)
+"""
+import io, multiprocessing, os, struct
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageChops
+
+import frame_store, perf
+
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+# ---------------------------------------------------------------------------
+# Single-frame encode (runs in workers)
+# ---------------------------------------------------------------------------
+def _skip_sub_blocks(data, i):
+    while data[i]:
+        i += data[i] + 1
+    return i + 1
+
+
+def _image_block(gif_bytes):
+    """
+    Pull (color_table, table_size_bits, interlaced, lzw_block) out of a
+    one-frame GIF.  lzw_block is the LZW minimum code size byte plus all
+    data sub-blocks, including the zero-length terminator.
+    """
+    flags = gif_bytes[10]
+    i = 13
+    table, bits = b"", 0
+    if flags & 0x80:
+        bits = flags & 0x07
+        table = gif_bytes[i:i + 3 * (2 << bits)]
+        i += len(table)
+    while True:
+        marker = gif_bytes[i]
+        if marker == 0x21:                       # extension: label + sub-blocks
+            i = _skip_sub_blocks(gif_bytes, i + 2)
+        elif marker == 0x2C:                     # image descriptor
+            desc_flags = gif_bytes[i + 9]
+            i += 10
+            if desc_flags & 0x80:
+                bits = desc_flags & 0x07
+                table = gif_bytes[i:i + 3 * (2 << bits)]
+                i += len(table)
+            end = _skip_sub_blocks(gif_bytes, i + 1)
+            return table, bits, bool(desc_flags & 0x40), gif_bytes[i:end]
+        else:
+            raise ValueError(f"unexpected GIF block 0x{marker:02x} at {i}")
+
+
+def _job_image(source):
+    """("store", path, index) or ("raw", mode, size, bytes, palette) -> image."""
+    if source[0] == "store":
+        return frame_store.shared(source[1]).frame(source[2])
+    _, mode, size, raw, palette = source
+    im = Image.frombytes(mode, size, raw)
+    if palette is not None:
+        im.putpalette(palette)
+    return im
+
+
+def encode_frame(job):
+    """Worker: (source, box, colors) -> (box, table, bits, interlaced, lzw)."""
+    source, box, colors = job
+    im = _job_image(source)
+    if box is not None:
+        im = im.crop(box)
+    if im.mode != 'P':
+        im = frame_store.rgb(im).convert('P', palette=Image.ADAPTIVE, colors=colors)
+    buf = io.BytesIO()
+    im.save(buf, format='GIF', optimize=False, interlace=False)
+    return (box,) + _image_block(buf.getvalue())
+
+
+# ---------------------------------------------------------------------------
+# Container
+# ---------------------------------------------------------------------------
+def _graphic_control(delay_ms, disposal):
+    packed = (disposal & 0x07) << 2
+    return struct.pack("<BBBBHBB", 0x21, 0xF9, 4, packed, int(delay_ms // 10), 0, 0)
+
+
+def _netscape_loop(loop):
+    return b"\x21\xFF\x0BNETSCAPE2.0" + struct.pack("<BBHB", 3, 1, loop, 0)
+
+
+def _descriptor(box, size, bits, interlaced):
+    x0, y0 = (box[0], box[1]) if box else (0, 0)
+    w, h = ((box[2] - box[0], box[3] - box[1]) if box else size)
+    return struct.pack("<BHHHHB", 0x2C, x0, y0, w, h,
+                       0x80 | (0x40 if interlaced else 0) | bits)
+
+
+def plan_frames(frames, durations, disposal):
+    """
+    Merge identical consecutive frames and, for disposal 0/1, find the
+    changed region of each frame.  Returns [(frame_index, box, duration)].
+    """
+    plan = []
+    prev = None
+    for i, (frame, d) in enumerate(zip(frames, durations)):
+        if prev is None:
+            plan.append([i, None, d])
+        else:
+            bbox = ImageChops.difference(frame, prev).getbbox()
+            if bbox is None:
+                plan[-1][2] += d
+                continue
+            plan.append([i, bbox if disposal in (0, 1) else None, d])
+        prev = frame
+    return plan
+
+
+def save_gif(frames, output, duration=100, loop=0, disposal=2, colors=256,
+             workers=None):
+    """
+    Write `frames` (RGB or P images of one size) as an animated GIF.
+    Frames that live in a frame_store are handed to the workers by
+    (path, index) and read from the shared mapping instead of pickled.
+
+    duration is ms per frame (int or list), loop/disposal as for Pillow's
+    GIF plugin.  Quantization and LZW run in `workers` processes
+    (default: all CPUs); `output` is a path or a binary file object.
+    """
+    durations = list(duration) if isinstance(duration, (list, tuple)) else [duration] * len(frames)
+    size = frames[0].size
+
+    with perf.stage("plan"):
+        plan = plan_frames(frames, durations, disposal)
+
+    refs = frame_store.store_refs(frames)
+
+    def jobs():
+        for idx, box, _ in plan:
+            if refs is not None:
+                yield ("store", refs[0], refs[1][idx]), box, colors
+                continue
+            im = frames[idx]
+            palette = im.getpalette() if im.mode == 'P' else None
+            yield ("raw", im.mode, size, im.tobytes(), palette), box, colors
+
+    with perf.stage("quantize+lzw"):
+        if workers == 1:
+            blocks = [encode_frame(job) for job in jobs()]
+        else:
+            # forkserver: the pipeline calls this from a stage thread while
+            # other stages run, and forking a threaded process can deadlock.
+            with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                                     mp_context=multiprocessing.get_context(START_METHOD)) as pool:
+                blocks = list(pool.map(encode_frame, jobs(), chunksize=4))
+
+    with perf.stage("assemble"):
+        parts = [b"GIF89a", struct.pack("<HHBBB", size[0], size[1], 0, 0, 0)]
+        if loop is not None:
+            parts.append(_netscape_loop(loop))
+        for (_, _, delay), (box, table, bits, interlaced, block) in zip(plan, blocks):
+            parts += [_graphic_control(delay, disposal),
+                      _descriptor(box, size, bits, interlaced), table, block]
+        parts.append(b"\x3B")
+        data = b"".join(parts)
+
+    if hasattr(output, "write"):
+        output.write(data)
+    else:
+        with open(output, "wb") as f:
+            f.write(data)
+    perf.count("gif_frames_written", len(plan))
+    return len(data)
@@ -0,0 +1,694 @@
+#!/usr/bin/env python3
+"""
+Golden-output check: render the same fixtures with a baseline version of
+the generators and with the working tree, then report whether the outputs
+are equivalent and how much faster (or slower) the working tree is.
+
+    python scripts/golden.py                        # working tree vs HEAD
+    python scripts/golden.py --baseline v1.2 --only snake,shooter
+    python scripts/golden.py --baseline /tmp/old/scripts --report golden.json
+
+The baseline is a git ref (its scripts/ is extracted with git archive) or
+a directory of scripts.  Every render runs in a fresh process with that
+tree first on sys.path, on the seeded inputs from fixtures.py.  Times
+cover the render only: the import and one warm-up render come first.
+
+Outputs are compared from strictest to loosest, and the first level that
+holds is reported:
+
+    identical    same bytes
+    same-dom     SVG: equal after normalizing the DOM (attribute order,
+                 whitespace, number formatting)
+    pixel-equal  every frame is the same, pixel for pixel
+    equivalent   every frame is within --max-delta / --max-diff-share and
+                 within --max-hash-distance bits of perceptual hash
+    DIFFERENT
+
+A case is n/a when the baseline cannot produce that output at all: a
+module or function it needs is missing from the baseline (the baseline
+never borrows modules from the working tree), or it writes another
+format (an older generate_snake writes SVG whatever the extension).
+
+GIFs are compared on a shared timeline, at every frame start of either
+file, so a rewrite that merges identical frames still lines up.  SVGs are
+rasterized at --svg-samples points of their animation cycle: the SMIL
+<animate> values are evaluated at that time and the resulting still image
+is drawn with Pillow.  That renderer knows the elements our generators
+emit (g, rect, circle, straight-edged path, text); filters are ignored,
+so blur-only changes show up in the DOM check but not in the pixels.
+
+The exit status is 1 if any case is DIFFERENT or fails to render.
+"""
+import argparse, bisect, contextlib, importlib, io, json, multiprocessing, os, re
+import shutil, subprocess, sys, tarfile, tempfile, time
+import xml.etree.ElementTree as ET
+
+from PIL import Image, ImageChops, ImageColor, ImageDraw, ImageFont
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+CASES = ("snake", "snake-gif", "shooter", "shooter-native")
+STATS = {"total_score": 2471, "days_active": 301, "missed_days": 3}
+
+
+# ---------------------------------------------------------------------------
+# Rendering (each run in a child process with `tree` first on sys.path)
+# ---------------------------------------------------------------------------
+def _render_snake(mod, fx, out_dir):
+    out = os.path.join(out_dir, "snake.svg")
+    mod.generate(out, "NISHANT", fx["grid"])
+    return out
+
+
+def _render_snake_gif(mod, fx, out_dir):
+    out = os.path.join(out_dir, "snake.gif")
+    mod.generate(out, "NISHANT", fx["grid"])
+    return out
+
+
+def _render_shooter(mod, fx, out_dir):
+    out = os.path.join(out_dir, "shooter.gif")
+    mod.add_hud_and_game_over(fx["gif"], out, **STATS)
+    return out
+
+
+def _render_shooter_native(mod, fx, out_dir):
+    out = os.path.join(out_dir, "shooter-native.gif")
+    mod.render(out, fx["grid"], days_active=STATS["days_active"],
+               missed_days=STATS["missed_days"], max_frames=fx["frames"])
+    return out
+
+
+# case -> (module, render(module, fixtures, out_dir) -> output path)
+RENDERERS = {"snake": ("generate_snake", _render_snake),
+             "snake-gif": ("generate_snake", _render_snake_gif),
+             "shooter": ("add_game_over_shooter", _render_shooter),
+             "shooter-native": ("render_shooter", _render_shooter_native)}
+
+
+def _child(conn, tree, case, fx, out_dir):
+    """
+    Executed in a fresh process: render one case with `tree`'s modules.
+    Only `tree`'s modules: a module the baseline lacks must fail to import,
+    not load from the working tree on top of baseline code.
+    """
+    if os.path.abspath(tree) != SCRIPTS_DIR:
+        sys.path[:] = [p for p in sys.path if os.path.abspath(p or os.curdir) != SCRIPTS_DIR]
+    sys.path.insert(0, tree)
+    os.makedirs(out_dir, exist_ok=True)
+    try:
+        module, render = RENDERERS[case]
+        with contextlib.redirect_stdout(io.StringIO()):
+            # import and one warm-up render stay outside the timing: every
+            # repeat is a fresh process, so best-of-N would not hide them
+            mod = importlib.import_module(module)
+            render(mod, fx, out_dir)
+            t0 = time.perf_counter()
+            out = render(mod, fx, out_dir)
+            wall = time.perf_counter() - t0
+        conn.send({"wall_s": round(wall, 4), "output": out})
+    except Exception as e:
+        # missing modules/functions: this tree predates the case
+        conn.send({"error": f"{type(e).__name__}: {e}",
+                   "unsupported": isinstance(e, (ImportError, AttributeError))})
+
+
+def run_case(tree, case, fx, out_dir, repeat):
+    """
+    Fastest of `repeat` fresh-process renders -> result dict (or error).
+    Plain processes rather than a Pool: the encoders start pools of their own.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    runs = []
+    for _ in range(repeat):
+        recv, send = ctx.Pipe(duplex=False)
+        proc = ctx.Process(target=_child, args=(send, tree, case, fx, out_dir))
+        proc.start()
+        send.close()
+        try:
+            result = recv.recv()
+        except EOFError:
+            result = {"error": f"render process exited with {proc.exitcode}"}
+        proc.join()
+        if "error" in result:
+            return result
+        runs.append(result)
+    best = min(runs, key=lambda r: r["wall_s"])
+    best["runs_wall_s"] = [r["wall_s"] for r in runs]
+    return best
+
+
+def extract_baseline(ref, dest):
+    """scripts/ of a git ref (or an existing scripts directory) -> its path."""
+    if os.path.isdir(ref):
+        return os.path.abspath(ref)
+    repo = subprocess.run(["git", "rev-parse", "--show-toplevel"], cwd=SCRIPTS_DIR,
+                          check=True, capture_output=True, text=True).stdout.strip()
+    rel = os.path.relpath(SCRIPTS_DIR, repo)
+    blob = subprocess.run(["git", "archive", "--format=tar", ref, rel], cwd=repo,
+                          check=True, capture_output=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(blob)) as tar:
+        tar.extractall(dest, filter="data")
+    return os.path.join(dest, rel)
+
+
+def build_fixtures(work_dir, frames):
+    import fixtures
+    return {"grid": fixtures.random_grid(), "frames": frames,
+            "gif": fixtures.make_shooter_gif(os.path.join(work_dir, "fixture.gif"),
+                                             n_frames=frames)}
+
+
+# ---------------------------------------------------------------------------
+# Raster comparison
+# ---------------------------------------------------------------------------
+def dhash(im):
+    """64-bit difference hash: brighter-than-right-neighbour bits of a 9x8 thumbnail."""
+    px = im.convert("L").resize((9, 8), Image.BILINEAR).tobytes()
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            bits = (bits << 1) | (px[row * 9 + col] > px[row * 9 + col + 1])
+    return bits
+
+
+def pixel_diff(a, b, delta):
+    """(largest channel difference, share of pixels differing by more than delta)."""
+    if a.size != b.size:
+        return 255, 1.0
+    diff = ImageChops.difference(a, b)
+    r, g, bl = diff.split()
+    hist = ImageChops.lighter(ImageChops.lighter(r, g), bl).histogram()
+    worst = max((v for v, n in enumerate(hist) if n), default=0)
+    return worst, sum(hist[delta + 1:]) / (a.size[0] * a.size[1])
+
+
+def gif_timeline(path):
+    """[(start_ms, RGB frame)] of an animated GIF, disposal applied."""
+    im = Image.open(path)
+    out, t = [], 0
+    for i in range(getattr(im, "n_frames", 1)):
+        im.seek(i)
+        out.append((t, im.convert("RGB")))
+        t += im.info.get("duration", 0)
+    return out, t
+
+
+def compare_timelines(base, cur, delta):
+    """
+    Compare two [(start, frame)] lists at every start time of either one.
+    Frame pairs showing at the same time are diffed once.
+    """
+    starts = sorted({t for t, _ in base} | {t for t, _ in cur})
+    base_t, cur_t = [t for t, _ in base], [t for t, _ in cur]
+    pairs, hashes = {}, {}
+    for t in starts:
+        i = max(0, bisect.bisect_right(base_t, t) - 1)
+        j = max(0, bisect.bisect_right(cur_t, t) - 1)
+        pairs.setdefault((i, j), t)
+    stats = {"samples": len(starts), "max_delta": 0, "max_diff_share": 0.0,
+             "max_hash_distance": 0, "worst_at": None}
+    for (i, j), t in pairs.items():
+        a, b = base[i][1], cur[j][1]
+        worst, share = pixel_diff(a, b, delta)
+        if ("b", i) not in hashes:
+            hashes["b", i] = dhash(a)
+        if ("c", j) not in hashes:
+            hashes["c", j] = dhash(b)
+        dist = bin(hashes["b", i] ^ hashes["c", j]).count("1")
+        if (share, worst) > (stats["max_diff_share"], stats["max_delta"]):
+            stats["worst_at"] = t
+        stats["max_delta"] = max(stats["max_delta"], worst)
+        stats["max_diff_share"] = max(stats["max_diff_share"], share)
+        stats["max_hash_distance"] = max(stats["max_hash_distance"], dist)
+    return stats
+
+
+def raster_verdict(stats, args):
+    if stats["max_delta"] == 0 and not stats.get("timing_mismatch"):
+        return "pixel-equal"
+    if (stats["max_diff_share"] <= args.max_diff_share
+            and stats["max_hash_distance"] <= args.max_hash_distance
+            and not stats.get("timing_mismatch")):
+        return "equivalent"
+    return "DIFFERENT"
+
+
+def compare_gifs(base_path, cur_path, args):
+    base, base_len = gif_timeline(base_path)
+    cur, cur_len = gif_timeline(cur_path)
+    stats = compare_timelines(base, cur, args.max_delta)
+    stats["frames"] = [len(base), len(cur)]
+    stats["duration_ms"] = [base_len, cur_len]
+    if base_len != cur_len:
+        stats["timing_mismatch"] = True
+    return raster_verdict(stats, args), stats
+
+
+# ---------------------------------------------------------------------------
+# SVG: normalized DOM, SMIL evaluation, rasterization
+# ---------------------------------------------------------------------------
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?(?:e-?\d+)?")
+
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def normalized_dom(root):
+    """Canonical text of an SVG tree: sorted attributes, rounded numbers, no blank text."""
+    def number(m):
+        return f"{float(m.group()):.3f}".rstrip("0").rstrip(".")
+
+    def walk(el, depth):
+        attrs = " ".join(f'{_local(k)}="{_NUMBER.sub(number, v)}"' for k, v in sorted(el.attrib.items()))
+        text = (el.text or "").strip()
+        lines = ["  " * depth + f"<{_local(el.tag)} {attrs}>{text}"]
+        for child in el:
+            lines.extend(walk(child, depth + 1))
+        return lines
+    return "\n".join(walk(root, 0))
+
+
+def _spline_y(points, x):
+    import scene
+    return scene.bezier(points, x)
+
+
+def _parse_value(text):
+    try:
+        return float(text)
+    except ValueError:
+        return text.strip()
+
+
+def _clock(value):
+    """SMIL clock value ("20s", "500ms", "1.5") -> seconds."""
+    value = value.strip()
+    if value.endswith("ms"):
+        return float(value[:-2]) / 1000
+    return float(value.rstrip("s"))
+
+
+class Smil:
+    """The <animate> elements of a document, evaluated at any time."""
+
+    def __init__(self, root):
+        self.anims = []                       # (target, attr, sampler)
+        self.unsupported = set()
+        parents = {child: el for el in root.iter() for child in el}
+        for el in root.iter():
+            tag = _local(el.tag)
+            if tag in ("animateTransform", "animateMotion", "set"):
+                self.unsupported.add(tag)
+            if tag != "animate":
+                continue
+            self.anims.append((parents[el], el.get("attributeName"), self._sampler(el)))
+        self.cycle = max((s.dur for _, _, s in self.anims), default=0)
+
+    @staticmethod
+    def _sampler(el):
+        if el.get("values") is not None:
+            values = [_parse_value(v) for v in el.get("values").split(";")]
+        else:
+            values = [_parse_value(el.get("from", "0")), _parse_value(el.get("to", "0"))]
+        n = len(values)
+        times = ([float(k) for k in el.get("keyTimes").split(";")] if el.get("keyTimes")
+                 else [i / max(1, n - 1) for i in range(n)])
+        mode = el.get("calcMode", "linear")
+        if any(isinstance(v, str) for v in values):
+            mode = "discrete"
+        splines = [tuple(float(c) for c in s.replace(",", " ").split())
+                   for s in (el.get("keySplines") or "").split(";") if s.strip()]
+        dur = _clock(el.get("dur", "0s"))
+        repeat = el.get("repeatCount") == "indefinite"
+        freeze = el.get("fill") == "freeze"
+
+        def at(t):
+            if dur <= 0:
+                return values[-1]
+            if t >= dur and not repeat:
+                return values[-1] if freeze else None
+            p = (t % dur) / dur
+            i = max(0, bisect.bisect_right(times, p) - 1)
+            if mode == "discrete" or i >= n - 1:
+                return values[min(i, n - 1)]
+            local = (p - times[i]) / ((times[i + 1] - times[i]) or 1)
+            if mode == "spline" and i < len(splines):
+                local = _spline_y(splines[i], local)
+            return values[i] + (values[i + 1] - values[i]) * local
+        at.dur = dur
+        return at
+
+    def frame(self, t):
+        """{element: {attr: value}} overrides at time t."""
+        out = {}
+        for target, attr, at in self.anims:
+            value = at(t)
+            if value is not None:
+                out.setdefault(target, {})[attr] = value
+        return out
+
+
+def _path_polygons(d):
+    """Subpaths of straight-edged path data (M/L/H/V/Z, absolute or relative)."""
+    polys, cur = [], []
+    x = y = 0.0
+    for cmd, args in re.findall(r"([MmLlHhVvZz])([^MmLlHhVvZz]*)", d):
+        nums = [float(n) for n in _NUMBER.findall(args)]
+        rel = cmd.islower()
+        c = cmd.upper()
+        if c == "Z":
+            if cur:
+                polys.append(cur)
+                x, y = cur[0]
+            cur = []
+            continue
+        step = 1 if c in "HV" else 2
+        for k in range(0, len(nums), step):
+            if c == "H":
+                x = x * rel + nums[k]
+            elif c == "V":
+                y = y * rel + nums[k]
+            else:
+                x, y = x * rel + nums[k], y * rel + nums[k + 1]
+            if c == "M" and k == 0:
+                if len(cur) > 1:
+                    polys.append(cur)
+                cur = [(x, y)]
+            else:
+                cur.append((x, y))
+    if len(cur) > 1:
+        polys.append(cur)
+    return polys
+
+
+class Rasterizer:
+    """Draws one SVG document at any animation time with Pillow."""
+
+    def __init__(self, root, scale=2):
+        self.root, self.scale = root, scale
+        vb = [float(v) for v in (root.get("viewBox") or "").replace(",", " ").split()]
+        if len(vb) == 4:
+            self.origin, size = (vb[0], vb[1]), (vb[2], vb[3])
+        else:
+            self.origin = (0.0, 0.0)
+            size = (float(root.get("width", 300)), float(root.get("height", 150)))
+        self.size = (round(size[0] * scale), round(size[1] * scale))
+        self.smil = Smil(root)
+        self.ignored = set(self.smil.unsupported)
+
+    def at(self, t):
+        self.overrides = self.smil.frame(t)
+        canvas = Image.new("RGBA", self.size, (0, 0, 0, 255))
+        self._children(self.root, canvas)
+        return canvas.convert("RGB")
+
+    def _get(self, el, attr, default=None):
+        value = self.overrides.get(el, {}).get(attr)
+        return el.get(attr, default) if value is None else value
+
+    def _num(self, el, attr, default=0.0):
+        value = self._get(el, attr)
+        return default if value is None else float(value)
+
+    def _xy(self, x, y):
+        return ((x - self.origin[0]) * self.scale, (y - self.origin[1]) * self.scale)
+
+    def _children(self, el, canvas):
+        for child in el:
+            self._element(child, canvas)
+
+    def _element(self, el, canvas):
+        tag = _local(el.tag)
+        if tag in ("defs", "animate", "title", "desc", "filter", "style"):
+            if tag == "style":
+                self.ignored.add("style")
+            return
+        if el.get("transform"):
+            self.ignored.add("transform")
+        opacity = self._num(el, "opacity", 1.0)
+        if opacity <= 0 or self._get(el, "visibility") == "hidden":
+            return
+        if el.get("filter"):
+            self.ignored.add("filter")
+        if tag in ("g", "svg", "a"):
+            if opacity >= 1:
+                self._children(el, canvas)
+            else:
+                layer = Image.new("RGBA", self.size, (0, 0, 0, 0))
+                self._children(el, layer)
+                canvas.alpha_composite(_faded(layer, opacity))
+            return
+        draw_shape = getattr(self, "_" + tag, None)
+        if draw_shape is None:
+            self.ignored.add(tag)
+            return
+        if opacity >= 1:
+            draw_shape(el, ImageDraw.Draw(canvas), (0, 0))
+            return
+        box = self._bbox(el)
+        if box is None:
+            return
+        x0, y0, x1, y1 = box
+        layer = Image.new("RGBA", (x1 - x0, y1 - y0), (0, 0, 0, 0))
+        draw_shape(el, ImageDraw.Draw(layer), (x0, y0))
+        canvas.alpha_composite(_faded(layer, opacity), (x0, y0))
+
+    def _bbox(self, el):
+        """Integer canvas box around a shape (generous, clipped to the canvas)."""
+        tag = _local(el.tag)
+        if tag == "rect":
+            x, y = self._num(el, "x"), self._num(el, "y")
+            pts = [(x, y), (x + self._num(el, "width"), y + self._num(el, "height"))]
+        elif tag == "circle":
+            cx, cy, r = self._num(el, "cx"), self._num(el, "cy"), self._num(el, "r")
+            pts = [(cx - r, cy - r), (cx + r, cy + r)]
+        elif tag == "path":
+            pts = [p for poly in _path_polygons(self._get(el, "d", "")) for p in poly]
+        else:
+            return (0, 0) + self.size
+        if not pts:
+            return None
+        pad = self._num(el, "stroke-width", 1.0) + 2
+        xs = [self._xy(x, y)[0] for x, y in pts]
+        ys = [self._xy(x, y)[1] for x, y in pts]
+        x0 = max(0, int(min(xs) - pad * self.scale))
+        y0 = max(0, int(min(ys) - pad * self.scale))
+        x1 = min(self.size[0], int(max(xs) + pad * self.scale) + 1)
+        y1 = min(self.size[1], int(max(ys) + pad * self.scale) + 1)
+        return (x0, y0, x1, y1) if x1 > x0 and y1 > y0 else None
+
+    def _paint(self, el, attr, default):
+        value = self._get(el, attr, default)
+        if value in (None, "none") or str(value).startswith("url("):
+            return None
+        rgb = ImageColor.getrgb(str(value))[:3]
+        alpha = self._num(el, attr + "-opacity", 1.0)
+        return (*rgb, round(255 * max(0.0, min(1.0, alpha))))
+
+    def _rect(self, el, draw, off):
+        x, y = self._xy(self._num(el, "x"), self._num(el, "y"))
+        w, h = self._num(el, "width") * self.scale, self._num(el, "height") * self.scale
+        rx = self._num(el, "rx", self._num(el, "ry")) * self.scale
+        fill, stroke = self._paint(el, "fill", "#000"), self._paint(el, "stroke", None)
+        x, y = x - off[0], y - off[1]
+        if fill:
+            draw.rounded_rectangle([x, y, x + w - 1, y + h - 1], rx, fill=fill)
+        if stroke:
+            sw = self._num(el, "stroke-width", 1.0) * self.scale
+            half = sw / 2
+            draw.rounded_rectangle([x - half, y - half, x + w - 1 + half, y + h - 1 + half],
+                                   rx + half, outline=stroke, width=max(1, round(sw)))
+
+    def _circle(self, el, draw, off):
+        cx, cy = self._xy(self._num(el, "cx"), self._num(el, "cy"))
+        r = self._num(el, "r") * self.scale
+        fill = self._paint(el, "fill", "#000")
+        if fill and r > 0:
+            cx, cy = cx - off[0], cy - off[1]
+            draw.ellipse([cx - r, cy - r, cx + r - 1, cy + r - 1], fill=fill)
+
+    def _path(self, el, draw, off):
+        fill = self._paint(el, "fill", "#000")
+        if not fill:
+            return
+        for poly in _path_polygons(self._get(el, "d", "")):
+            pts = [self._xy(x, y) for x, y in poly]
+            pts = [(x - off[0], y - off[1]) for x, y in pts]
+            xs, ys = sorted({x for x, _ in pts}), sorted({y for _, y in pts})
+            if len(xs) == 2 and len(ys) == 2:       # axis-aligned square: same as <rect>
+                draw.rectangle([xs[0], ys[0], xs[1] - 1, ys[1] - 1], fill=fill)
+            else:
+                draw.polygon(pts, fill=fill)
+
+    def _text(self, el, draw, off):
+        fill = self._paint(el, "fill", "#000")
+        text = "".join(el.itertext()).strip()
+        if not fill or not text:
+            return
+        x, y = self._xy(self._num(el, "x"), self._num(el, "y"))
+        size = self._num(el, "font-size", 16) * self.scale
+        try:
+            font = ImageFont.load_default(size=size)
+        except TypeError:            # Pillow < 10.1: fixed-size bitmap font
+            font = ImageFont.load_default()
+        anchor = {"middle": "ms", "end": "rs"}.get(el.get("text-anchor"), "ls")
+        draw.text((x - off[0], y - off[1]), text, fill=fill, font=font, anchor=anchor)
+
+
+def _faded(layer, opacity):
+    alpha = layer.getchannel("A").point(lambda a: round(a * opacity))
+    layer.putalpha(alpha)
+    return layer
+
+
+def svg_timeline(path, samples, scale):
+    """[(start_ms, frame)] of an SVG sampled over its animation cycle."""
+    raster = Rasterizer(ET.parse(path).getroot(), scale)
+    cycle = raster.smil.cycle
+    n = samples if cycle else 1
+    times = [(i + 0.5) * cycle / n for i in range(n)]
+    return [(round(t * 1000), raster.at(t)) for t in times], raster
+
+
+def compare_svgs(base_path, cur_path, args):
+    base_root, cur_root = ET.parse(base_path).getroot(), ET.parse(cur_path).getroot()
+    if normalized_dom(base_root) == normalized_dom(cur_root):
+        return "same-dom", {}
+    base, base_r = svg_timeline(base_path, args.svg_samples, args.svg_scale)
+    cur, cur_r = svg_timeline(cur_path, args.svg_samples, args.svg_scale)
+    stats = compare_timelines(base, cur, args.max_delta)
+    stats["cycle_s"] = [base_r.smil.cycle, cur_r.smil.cycle]
+    if base_r.smil.cycle != cur_r.smil.cycle:
+        stats["timing_mismatch"] = True
+    ignored = sorted(base_r.ignored | cur_r.ignored)
+    if ignored:
+        stats["not_rasterized"] = ignored
+    return raster_verdict(stats, args), stats
+
+
+def output_format(path):
+    """"gif" / "svg" from the file's first bytes (not its name), else None."""
+    with open(path, "rb") as f:
+        head = f.read(256).lstrip()
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return "gif"
+    if head.startswith((b"<svg", b"<?xml")):
+        return "svg"
+    return None
+
+
+def compare_outputs(base_path, cur_path, args):
+    """(verdict, stats); "n/a" when the two sides wrote different formats."""
+    with open(base_path, "rb") as a, open(cur_path, "rb") as b:
+        if a.read() == b.read():
+            return "identical", {}
+    fmts = output_format(base_path), output_format(cur_path)
+    if fmts[0] != fmts[1] or fmts[0] is None:
+        return "n/a", {"reason": "baseline writes %s, current writes %s" % fmts}
+    if fmts[0] == "svg":
+        return compare_svgs(base_path, cur_path, args)
+    return compare_gifs(base_path, cur_path, args)
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+def run(args):
+    work = tempfile.mkdtemp(prefix="golden-")
+    try:
+        baseline = extract_baseline(args.baseline, os.path.join(work, "baseline"))
+        fx = build_fixtures(work, args.frames)
+        rows = {}
+        for case in args.only:
+            print(f"{case}: rendering ...", file=sys.stderr)
+            base = run_case(baseline, case, fx, os.path.join(work, "base"), args.repeat)
+            cur = run_case(SCRIPTS_DIR, case, fx, os.path.join(work, "cur"), args.repeat)
+            row = {"baseline": base, "current": cur}
+            if base.get("unsupported") and "error" not in cur:
+                row["verdict"] = "n/a"
+            elif "error" in base or "error" in cur:
+                row["verdict"] = "ERROR"
+            else:
+                try:
+                    row["verdict"], row["compare"] = compare_outputs(
+                        base["output"], cur["output"], args)
+                except Exception as e:
+                    row["verdict"] = "ERROR"
+                    row["compare"] = {"reason": f"comparing: {type(e).__name__}: {e}"}
+                if row["verdict"] != "n/a":
+                    row["speedup"] = round(base["wall_s"] / max(cur["wall_s"], 1e-9), 2)
+                if args.keep:
+                    for side, res in (("baseline", base), ("current", cur)):
+                        root, ext = os.path.splitext(os.path.basename(res["output"]))
+                        os.makedirs(args.keep, exist_ok=True)
+                        shutil.copy(res["output"], os.path.join(args.keep, f"{root}.{side}{ext}"))
+            rows[case] = row
+        return {"baseline": args.baseline, "fixture_frames": args.frames,
+                "repeat": args.repeat, "cases": rows}
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def print_report(report):
+    print(f"baseline: {report['baseline']}   (fastest of {report['repeat']} runs each)")
+    print(f"  {'case':<15} {'verdict':<12} {'baseline':>9} {'current':>9} {'speedup':>8}  detail")
+    for case, row in report["cases"].items():
+        base, cur = row["baseline"], row["current"]
+        if "wall_s" not in base or "wall_s" not in cur:
+            err = base.get("error") and f"baseline: {base['error']}" or f"current: {cur['error']}"
+            print(f"  {case:<15} {row['verdict']:<12} {'':>9} {'':>9} {'':>8}  {err}")
+            continue
+        c = row["compare"]
+        detail = c.get("reason", "")
+        if "samples" in c:
+            detail = (f"{c['samples']} samples, max delta {c['max_delta']}, "
+                      f"{c['max_diff_share']:.2%} px differ, hash dist {c['max_hash_distance']}")
+            if c.get("worst_at") is not None and c["max_delta"]:
+                detail += f", worst at {c['worst_at'] / 1000:g}s"
+            if c.get("timing_mismatch"):
+                detail += f", timing {c.get('duration_ms') or c.get('cycle_s')}"
+            if c.get("not_rasterized"):
+                detail += f"; not rasterized: {', '.join(c['not_rasterized'])}"
+        speedup = f"{row['speedup']:.2f}x" if "speedup" in row else ""
+        print(f"  {case:<15} {row['verdict']:<12} {base['wall_s']:>8.2f}s {cur['wall_s']:>8.2f}s "
+              f"{speedup:>8}  {detail}")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    ap.add_argument("--baseline", default="HEAD",
+                    help="git ref or scripts directory to compare against (default HEAD)")
+    ap.add_argument("--only", default=",".join(CASES),
+                    help="comma-separated subset of: " + ", ".join(CASES))
+    ap.add_argument("--frames", type=int, default=120,
+                    help="frames in the synthetic shooter GIF / native shooter")
+    ap.add_argument("--repeat", type=int, default=3,
+                    help="renders per side; the fastest is reported")
+    ap.add_argument("--max-delta", type=int, default=8,
+                    help="channel difference still counted as the same pixel")
+    ap.add_argument("--max-diff-share", type=float, default=0.005,
+                    help="share of pixels per frame allowed to differ by more")
+    ap.add_argument("--max-hash-distance", type=int, default=4,
+                    help="perceptual hash bits allowed to differ per frame")
+    ap.add_argument("--svg-samples", type=int, default=40,
+                    help="points of the SVG animation cycle to rasterize")
+    ap.add_argument("--svg-scale", type=int, default=2,
+                    help="pixels per SVG unit when rasterizing")
+    ap.add_argument("--keep", default=None,
+                    help="copy both sides' outputs here for inspection")
+    ap.add_argument("--report", default=None, help="also write the JSON report here")
+    args = ap.parse_args()
+
+    args.only = [n.strip() for n in args.only.split(",") if n.strip()]
+    unknown = set(args.only) - set(CASES)
+    if unknown:
+        ap.error(f"unknown case(s): {', '.join(sorted(unknown))}")
+
+    report = run(args)
+    print_report(report)
+    if args.report:
+        with open(args.report, "w") as f:
+            f.write(json.dumps(report, indent=2) + "\n")
+    failed = [c for c, row in report["cases"].items() if row["verdict"] in ("DIFFERENT", "ERROR")]
+    sys.exit(1 if failed else 0)
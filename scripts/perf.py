@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Lightweight stage timers and counters shared by the generators.
+
+Generators wrap their phases in ``perf.stage("name")`` and bump counters
+with ``perf.count("name", n)``.  Outside of ``perf.recording()`` both are
+no-ops, so the scripts behave exactly as before when run on their own; the
+benchmark harness and ``--profile`` flags turn recording on.
+
+    with perf.recording() as rec:
+        generate_snake.generate("snake.svg")
+    print(rec.as_dict())
+
+Long straight-line functions can use ``perf.laps()`` instead of nesting
+every phase in a ``with`` block.  ``perf.profiling(path)`` additionally
+runs cProfile and tracemalloc and writes a JSON report.
+"""
+import cProfile, io, json, os, pstats, resource, sys, time, tracemalloc
+from contextlib import contextmanager
+
+_active = None
+
+
+class Recorder:
+    """Accumulated wall time per stage name (first-seen order) plus counters."""
+
+    def __init__(self):
+        self.stages = {}
+        self.calls = {}
+        self.mem_peaks = {}
+        self.rss_after = {}
+        self.counters = {}
+        self.traced_peak = 0      # tracemalloc peak over the whole recording
+        self._open_peaks = []     # running peak of each enclosing stage
+
+    def _fold_peak(self, peak):
+        """Credit a tracemalloc peak to every open stage and to the run."""
+        self._open_peaks = [max(p, peak) for p in self._open_peaks]
+        self.traced_peak = max(self.traced_peak, peak)
+
+    def add(self, name, seconds, mem_peak=None):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+        self.calls[name] = self.calls.get(name, 0) + 1
+        if mem_peak is not None:
+            self.mem_peaks[name] = max(self.mem_peaks.get(name, 0), mem_peak)
+        self.rss_after[name] = peak_rss_mb()
+
+    def as_dict(self):
+        return {name: round(sec, 6) for name, sec in self.stages.items()}
+
+    def report(self):
+        stages = {}
+        for name, sec in self.stages.items():
+            entry = {"seconds": round(sec, 6), "calls": self.calls[name],
+                     "peak_rss_after_mb": self.rss_after[name]}
+            if name in self.mem_peaks:
+                entry["tracemalloc_peak_mb"] = round(self.mem_peaks[name] / 2**20, 2)
+            stages[name] = entry
+        return {"stages": stages, "counters": dict(self.counters)}
+
+
+@contextmanager
+def stage(name):
+    rec = _active
+    if rec is None:
+        yield
+        return
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        # reset_peak() gives this stage its own peak; the peak so far is
+        # folded into the enclosing stages first so theirs is not lost
+        rec._fold_peak(tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        rec._open_peaks.append(0)
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        peak = None
+        if tracing:
+            peak = max(rec._open_peaks.pop(), tracemalloc.get_traced_memory()[1])
+            rec._fold_peak(peak)
+        rec.add(name, time.perf_counter() - t0, peak)
+
+
+def count(name, n=1):
+    rec = _active
+    if rec is not None:
+        rec.counters[name] = rec.counters.get(name, 0) + n
+
+
+def laps():
+    """
+    For long straight-line functions: ``lap = perf.laps()`` then call
+    ``lap("name")`` at the end of each phase to record the time since the
+    previous lap.
+    """
+    rec = _active
+    last = [time.perf_counter()]
+
+    def lap(name):
+        now = time.perf_counter()
+        if rec is not None:
+            rec.add(name, now - last[0])
+        last[0] = now
+    return lap
+
+
+@contextmanager
+def recording():
+    global _active
+    prev, _active = _active, Recorder()
+    try:
+        yield _active
+    finally:
+        _active = prev
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+@contextmanager
+def profiling(report_path, use_cprofile=True, trace_memory=True, top=25):
+    """
+    Record stages and counters, optionally under cProfile and tracemalloc,
+    then write a JSON report to `report_path`.  The raw cProfile stats go
+    next to it (same name, .prof) for snakeviz / pstats.
+    """
+    profiler = cProfile.Profile() if use_cprofile else None
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    with recording() as rec:
+        if profiler:
+            profiler.enable()
+        try:
+            yield rec
+        finally:
+            if profiler:
+                profiler.disable()
+            wall = time.perf_counter() - t0
+
+            report = {"wall_s": round(wall, 4)}
+            report.update(rec.report())
+            report["memory"] = {"peak_rss_mb": peak_rss_mb()}
+            if tracemalloc.is_tracing():
+                peak = max(rec.traced_peak, tracemalloc.get_traced_memory()[1])
+                report["memory"]["tracemalloc_peak_mb"] = round(peak / 2**20, 2)
+            if started_tracing:
+                tracemalloc.stop()
+
+            if profiler:
+                prof_path = os.path.splitext(report_path)[0] + ".prof"
+                profiler.dump_stats(prof_path)
+                report["cprofile"] = {"stats_file": prof_path,
+                                      "top_cumulative": _top_functions(profiler, top)}
+
+            with open(report_path, "w") as f:
+                json.dump(report, f, indent=2)
+                f.write("\n")
+
+
+def _top_functions(profiler, n):
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    rows = []
+    for (filename, line, func), (cc, nc, tt, ct, _) in stats.stats.items():
+        rows.append({"function": f"{os.path.basename(filename)}:{line}({func})",
+                     "calls": nc, "tottime_s": round(tt, 6), "cumtime_s": round(ct, 6)})
+    rows.sort(key=lambda r: r["cumtime_s"], reverse=True)
+    return rows[:n]
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Run the nightly profile pipeline in a single process.
+
+  1. Fetch the contribution calendar once (one GraphQL call) and derive
+     both the snake grid and the shooter HUD stats from it in memory.
+  2. Run the selected stages concurrently:
+       snake   — generate_snake.generate            -> snake.svg
+       shooter — add_hud_and_game_over (in place)   -> shooter.gif
+                 or, with --shooter-native, render_shooter from the calendar
+       skills  — icon sheet + reveal animation      -> animated-skills.svg
+  3. Skip any stage whose inputs (data, config, the source of the generator
+     and of every scripts/ module it imports, input file bytes) are
+     unchanged since the last run and whose output on disk is still the
+     one we wrote.  State lives in .cache/pipeline.json.
+
+Usage:
+    GITHUB_TOKEN=... python scripts/pipeline.py                     # all stages
+    python scripts/pipeline.py --stages shooter,skills
+    python scripts/pipeline.py --force                              # ignore state
+    python scripts/pipeline.py --watch                              # live previews (watch.py)
+"""
+import argparse, ast, hashlib, json, os, sys, time
+from concurrent.futures import ThreadPoolExecutor
+
+import fetch_github_stats
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_PATH = os.path.join(".cache", "pipeline.json")
+STAGES = ("snake", "shooter", "skills")
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    except FileNotFoundError:
+        return None
+    return h.hexdigest()
+
+
+def fingerprint(*parts):
+    """Stable digest of JSON-able values and file contents (("file", path))."""
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, tuple) and part[0] == "file":
+            h.update((file_digest(part[1]) or "missing").encode())
+        else:
+            h.update(json.dumps(part, sort_keys=True).encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def source(module_name):
+    return ("file", os.path.join(SCRIPTS_DIR, module_name + ".py"))
+
+
+def _local_imports(module_name):
+    """scripts/ modules imported anywhere in module_name (function-level too)."""
+    with open(source(module_name)[1], encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(a.name for a in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module)
+    return {n for n in names if os.path.isfile(source(n)[1])}
+
+
+def sources(module_name):
+    """
+    source() of a stage's module and of every scripts/ module it imports,
+    transitively, so a new helper module is part of the fingerprint.
+    """
+    seen, todo = set(), [module_name]
+    while todo:
+        name = todo.pop()
+        if name not in seen:
+            seen.add(name)
+            todo.extend(_local_imports(name) - seen)
+    return [source(name) for name in sorted(seen)]
+
+
+def load_state(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(path, state):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+# ---------------------------------------------------------------------------
+# Data
+# ---------------------------------------------------------------------------
+def load_calendar(user, token):
+    """Calendar dict from fetch_github_stats.fetch_calendar, or None offline."""
+    if not token:
+        return None
+    try:
+        return fetch_github_stats.fetch_calendar(user, token)
+    except Exception as e:
+        print(f"Warning: GitHub API error — {e}", file=sys.stderr)
+        return None
+
+
+def stats_from_calendar(calendar):
+    if calendar is None:
+        return fetch_github_stats.fallback_stats()
+    return fetch_github_stats.compute_stats(
+        calendar["total"], fetch_github_stats.flatten_days(calendar))
+
+
+def write_if_changed(path, text):
+    try:
+        with open(path) as f:
+            if f.read() == text:
+                return False
+    except OSError:
+        pass
+    with open(path, "w") as f:
+        f.write(text)
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Stages: each returns (inputs_fingerprint_fn, output_path, run_callable).
+# The fingerprint is a callable so it can be re-taken after the run (the
+# skills stage may have filled the icon cache in the meantime).
+# ---------------------------------------------------------------------------
+def level_thresholds(calendar):
+    """Level bounds over the weeks the snake grid shows (None offline)."""
+    import calendar_grid, generate_snake
+    return (calendar_grid.calendar_thresholds(calendar, generate_snake.COLS)
+            if calendar else None)
+
+
+def snake_stage(args, calendar, stats):
+    import generate_snake
+    grid = generate_snake.grid_from_weeks(calendar["weeks"]) if calendar else None
+    thresholds = level_thresholds(calendar)
+    inputs = lambda: fingerprint(grid, thresholds, args.text, *sources("generate_snake"))
+    return inputs, args.snake_output, lambda: generate_snake.generate(
+        args.snake_output, args.text, grid, thresholds=thresholds)
+
+
+def shooter_stage(args, calendar, stats):
+    import add_game_over_shooter
+    scales = add_game_over_shooter.parse_scales(args.shooter_scales)
+    if args.shooter_native:
+        return native_shooter_stage(args, calendar, stats, scales)
+    inputs = lambda: fingerprint(stats, ("file", args.shooter_input), args.shooter_scales,
+                                 *sources("add_game_over_shooter"))
+
+    def run():
+        add_game_over_shooter.add_hud_and_game_over(
+            args.shooter_input, args.shooter_output,
+            total_score=stats["total_contributions"],
+            days_active=stats["days_with_contributions"],
+            missed_days=stats["missed_days_last_10"],
+            workers=args.shooter_workers,
+            spill_dir=args.shooter_spill_dir,
+            scales=scales,
+        )
+    return inputs, args.shooter_output, run
+
+
+def native_shooter_stage(args, calendar, stats, scales):
+    import generate_snake, render_shooter
+    grid = (generate_snake.grid_from_weeks(calendar["weeks"]) if calendar
+            else render_shooter.random_grid())
+    thresholds = level_thresholds(calendar)
+    inputs = lambda: fingerprint(grid, thresholds, stats, scales, args.shooter_frames,
+                                 *sources("render_shooter"))
+
+    def run():
+        render_shooter.render(
+            args.shooter_output, grid,
+            days_active=stats["days_with_contributions"],
+            missed_days=stats["missed_days_last_10"],
+            max_frames=args.shooter_frames,
+            spill_dir=args.shooter_spill_dir,
+            thresholds=thresholds,
+            workers=args.shooter_workers,
+            scales=scales,
+        )
+    return inputs, args.shooter_output, run
+
+
+def skills_stage(args, calendar, stats):
+    import generate_animated_skills as skills
+    config = skills.load_config(args.skills_config)
+    cache = skills.IconCache(args.icon_cache)
+    # The cache index maps names to content digests, so it stands in for
+    # the icon bodies themselves.
+    inputs = lambda: fingerprint(config, cache.index, args.skills_mode,
+                                 *sources("generate_animated_skills"))
+
+    def run():
+        sheet = skills.load_sheet(config, cache, offline=args.offline)
+        animated, num_icons = skills.animate_sheet(sheet, args.skills_mode)
+        with open(args.skills_output, "w") as f:
+            f.write(animated)
+        print(f"Generated {args.skills_output} with {num_icons} animated icons!")
+    return inputs, args.skills_output, run
+
+
+STAGE_BUILDERS = {"snake": snake_stage, "shooter": shooter_stage, "skills": skills_stage}
+
+
+def should_skip(name, inputs, output, in_place, state):
+    prev = state.get(name)
+    if not prev or prev.get("output") != file_digest(output):
+        return False
+    if prev.get("inputs") == inputs:
+        return True
+    if in_place:
+        # The input file is our own earlier output: running again would
+        # stack a second HUD on top, so leave it alone.
+        print(f"  {name}: input is already processed output, skipping", file=sys.stderr)
+        return True
+    return False
+
+
+def run_pipeline(args):
+    t0 = time.perf_counter()
+    calendar = load_calendar(args.user, args.token)
+    stats = stats_from_calendar(calendar)
+    print(f"Calendar: {'fetched' if calendar else 'unavailable, using fallbacks'}  "
+          f"({time.perf_counter() - t0:.2f}s)")
+    if args.stats_output and write_if_changed(args.stats_output, json.dumps(stats) + "\n"):
+        print(f"Wrote {args.stats_output}")
+
+    state = {} if args.force else load_state(args.state)
+    jobs = {}
+    for name in args.stages:
+        inputs, output, run = STAGE_BUILDERS[name](args, calendar, stats)
+        in_place = name == "shooter" and not args.shooter_native and (
+            os.path.abspath(args.shooter_input) == os.path.abspath(args.shooter_output))
+        if should_skip(name, inputs(), output, in_place, state):
+            print(f"  {name}: unchanged, skipped")
+            continue
+        jobs[name] = (inputs, output, run)
+
+    def timed(name, run):
+        start = time.perf_counter()
+        run()
+        return time.perf_counter() - start
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        futures = {name: pool.submit(timed, name, run) for name, (_, _, run) in jobs.items()}
+        for name, fut in futures.items():
+            inputs, output, _ = jobs[name]
+            try:
+                elapsed = fut.result()
+            except Exception as e:
+                print(f"  {name}: FAILED — {e}", file=sys.stderr)
+                failed.append(name)
+                continue
+            state[name] = {"inputs": inputs(), "output": file_digest(output)}
+            print(f"  {name}: {elapsed:.2f}s -> {output}")
+
+    save_state(args.state, state)
+    print(f"Pipeline done in {time.perf_counter() - t0:.2f}s")
+    return failed
+
+
+def build_parser():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--stages", default=",".join(STAGES),
+                    help="comma-separated subset of: " + ", ".join(STAGES))
+    ap.add_argument("--user", default=os.environ.get("GITHUB_USER", "nnish16"))
+    ap.add_argument("--jobs", type=int, default=len(STAGES),
+                    help="stages to run concurrently")
+    ap.add_argument("--force", action="store_true", help="ignore the skip state")
+    ap.add_argument("--state", default=STATE_PATH)
+    ap.add_argument("--stats-output", default="stats.json",
+                    help="also write the HUD stats here ('' to disable)")
+    ap.add_argument("--text", default="NISHANT")
+    ap.add_argument("--snake-output", default="snake.svg")
+    ap.add_argument("--shooter-input", default="shooter.gif")
+    ap.add_argument("--shooter-output", default=None,
+                    help="defaults to --shooter-input (in place)")
+    ap.add_argument("--shooter-workers", type=int, default=None,
+                    help="encode shooter GIF frames with N processes (0 = all CPUs)")
+    ap.add_argument("--shooter-native", action="store_true",
+                    help="render the shooter from the calendar (render_shooter) "
+                         "instead of post-processing --shooter-input")
+    ap.add_argument("--shooter-frames", type=int, default=300,
+                    help="max game frames for --shooter-native")
+    ap.add_argument("--shooter-scales", default="1",
+                    help="comma-separated output scales, e.g. 1,0.5 adds shooter@0.5x.gif")
+    ap.add_argument("--shooter-spill-dir", default=None,
+                    help="keep shooter frames in memory-mapped files here instead of RAM")
+    ap.add_argument("--skills-output", default="animated-skills.svg")
+    ap.add_argument("--skills-config", default="skills.json")
+    ap.add_argument("--skills-mode", choices=["symbol", "inline"], default="symbol")
+    ap.add_argument("--icon-cache", default=None)
+    ap.add_argument("--offline", action="store_true",
+                    help="build the skills sheet from cached icons only")
+    ap.add_argument("--watch", action="store_true",
+                    help="keep inputs in memory and re-render previews as scripts/ change")
+    ap.add_argument("--preview-dir", default=os.path.join(".cache", "preview"),
+                    help="where --watch writes its previews")
+    ap.add_argument("--preview-fps", type=float, default=10,
+                    help="frame-rate cap of the --watch shooter preview")
+    ap.add_argument("--watch-interval", type=float, default=0.5,
+                    help="seconds between --watch polls")
+    return ap
+
+
+def main(argv=None):
+    ap = build_parser()
+    args = ap.parse_args(argv)
+    args.stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = set(args.stages) - set(STAGES)
+    if unknown:
+        ap.error(f"unknown stage(s): {', '.join(sorted(unknown))}")
+    args.shooter_output = args.shooter_output or args.shooter_input
+    if args.icon_cache is None:
+        import generate_animated_skills
+        args.icon_cache = generate_animated_skills.CACHE_DIR
+    args.token = os.environ.get("GITHUB_TOKEN", os.environ.get("METRICS_TOKEN", ""))
+
+    if args.watch:
+        import watch
+        calendar = load_calendar(args.user, args.token)
+        watch.watch(args, calendar, stats_from_calendar(calendar),
+                    interval=args.watch_interval)
+        return
+    failed = run_pipeline(args)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
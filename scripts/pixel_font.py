@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Bitmap pixel fonts shared by the snake, the shooter HUD and the GAME OVER /
+STAGE CLEAR screens.
+
+Each glyph is one integer: rows top to bottom, each row `width` bits with
+the most significant bit leftmost.  0x3A31FC631 is the 5×7 'A':
+
+    01110 10001 10001 11111 10001 10001 10001
+
+Glyphs are only unpacked when first drawn, and every rasterization (row
+tuples, lit pixel lists, PIL masks, SVG path data) is cached per font, so
+drawing the same HUD label every frame costs one dict lookup.
+
+    SMALL      5×7  — HUD, stage clear, GAME OVER; all printable ASCII
+                      (lowercase draws as uppercase)
+    GAME_OVER  SMALL with the snake overlay's taller 'G'
+    BOLD       6×7  — the snake's contribution-grid wordmark
+"""
+import functools
+
+
+class Font:
+    def __init__(self, width, height, glyphs, fallback=" "):
+        self.width, self.height = width, height
+        self.glyphs = dict(glyphs)
+        self.fallback = fallback
+
+    def __contains__(self, ch):
+        return ch in self.glyphs
+
+    def __iter__(self):
+        return iter(self.glyphs)
+
+    def __len__(self):
+        return len(self.glyphs)
+
+    def variant(self, overrides):
+        """A copy of this font with some glyphs replaced or added."""
+        return Font(self.width, self.height, {**self.glyphs, **overrides}, self.fallback)
+
+    def code(self, ch):
+        """Packed glyph for ch (lowercase falls back to uppercase, then fallback)."""
+        code = self.glyphs.get(ch)
+        if code is None:
+            code = self.glyphs.get(ch.upper(), self.glyphs[self.fallback])
+        return code
+
+    @functools.lru_cache(maxsize=None)
+    def rows(self, ch):
+        """Row bitmasks, top row first."""
+        code, w, h = self.code(ch), self.width, self.height
+        mask = (1 << w) - 1
+        return tuple((code >> (w * (h - 1 - r))) & mask for r in range(h))
+
+    @functools.lru_cache(maxsize=None)
+    def bitmap(self, ch):
+        """Rows of 0/1 columns, like the nested lists the fonts used to be."""
+        w = self.width
+        return tuple(tuple((row >> (w - 1 - c)) & 1 for c in range(w))
+                     for row in self.rows(ch))
+
+    @functools.lru_cache(maxsize=None)
+    def pixels(self, ch):
+        """(col, row) of each lit pixel, row-major."""
+        return tuple((c, r) for r, row in enumerate(self.bitmap(ch))
+                     for c, lit in enumerate(row) if lit)
+
+    # ---- layout ----
+    def advance(self, px, gap, char_gap=None):
+        """Horizontal distance between glyph origins at this pixel size."""
+        return self.width * (px + gap) + (px + 1 if char_gap is None else char_gap)
+
+    def text_width(self, text, px, gap, char_gap=None):
+        if not text:
+            return 0
+        return len(text) * self.advance(px, gap, char_gap) - (
+            px + 1 if char_gap is None else char_gap)
+
+    def text_pixels(self, text, x, y, px, gap, char_gap=None):
+        """Top-left corner of every lit pixel of text drawn at (x, y)."""
+        step, adv = px + gap, self.advance(px, gap, char_gap)
+        for i, ch in enumerate(text):
+            ox = x + i * adv
+            for c, r in self.pixels(ch):
+                yield ox + c * step, y + r * step
+
+    # ---- rasterization ----
+    @functools.lru_cache(maxsize=None)
+    def mask(self, ch, px, gap):
+        """PIL mode "1" image of one glyph with px-sized pixels, gap apart."""
+        from PIL import Image, ImageDraw
+        step = px + gap
+        im = Image.new("1", (self.width * step - gap, self.height * step - gap), 0)
+        d = ImageDraw.Draw(im)
+        for c, r in self.pixels(ch):
+            d.rectangle([c * step, r * step, c * step + px - 1, r * step + px - 1], fill=1)
+        return im
+
+    def draw(self, draw, text, x, y, color, px, gap, char_gap=None):
+        """Draw text with an ImageDraw, one cached glyph mask per character."""
+        adv = self.advance(px, gap, char_gap)
+        for i, ch in enumerate(text):
+            if self.pixels(ch):
+                draw.bitmap((x + i * adv, y), self.mask(ch, px, gap), fill=color)
+
+    @functools.lru_cache(maxsize=None)
+    def glyph_path(self, ch, px, gap):
+        """Relative SVG path data for one glyph starting at its origin:
+        one 'm…h v h z' square per pixel, returning to the origin."""
+        step, out = px + gap, []
+        cx = cy = 0
+        for c, r in self.pixels(ch):
+            out.append(f"m{c*step - cx} {r*step - cy}h{px}v{px}h-{px}z")
+            cx, cy = c * step, r * step
+        if out:
+            out.append(f"m{-cx} {-cy}")
+        return "".join(out)
+
+    @functools.lru_cache(maxsize=1024)
+    def path(self, text, x, y, px, gap, char_gap=None):
+        """SVG path data drawing text at (x, y) as filled squares."""
+        adv, out = self.advance(px, gap, char_gap), [f"M{x} {y}"]
+        for i, ch in enumerate(text):
+            if i:
+                out.append(f"m{adv} 0")
+            out.append(self.glyph_path(ch, px, gap))
+        return "".join(out)
+
+
+SMALL = Font(5, 7, {
+    ' ': 0x000000000,
+    '!': 0x108421004,
+    '"': 0x294000000,
+    '#': 0x295F57D4A,
+    '$': 0x11F4717C4,
+    '%': 0x632222263,
+    '&': 0x32544564D,
+    "'": 0x108800000,
+    '(': 0x088842082,
+    ')': 0x208210888,
+    '*': 0x009575480,
+    '+': 0x0084F9080,
+    ',': 0x000003088,
+    '-': 0x0000F8000,
+    '.': 0x00000018C,
+    '/': 0x002222200,
+    '0': 0x3A33AE62E,
+    '1': 0x11842108E,
+    '2': 0x3A211111F,
+    '3': 0x78217043E,
+    '4': 0x08CA97C42,
+    '5': 0x7E10F043E,
+    '6': 0x3A10F462E,
+    '7': 0x7C2221084,
+    '8': 0x3A317462E,
+    '9': 0x3A317842E,
+    ':': 0x018C03180,
+    ';': 0x018C03088,
+    '<': 0x044441041,
+    '=': 0x001F07C00,
+    '>': 0x410411110,
+    '?': 0x3A2111004,
+    '@': 0x3A216D6AE,
+    'A': 0x3A31FC631,
+    'B': 0x7A31F463E,
+    'C': 0x3E108420F,
+    'D': 0x72518C65C,
+    'E': 0x7E10F421F,
+    'F': 0x7E10F4210,
+    'G': 0x3A10BC62E,
+    'H': 0x4631FC631,
+    'I': 0x7C842109F,
+    'J': 0x1C4210A4C,
+    'K': 0x4654C5251,
+    'L': 0x42108421F,
+    'M': 0x47758C631,
+    'N': 0x47359C631,
+    'O': 0x3A318C62E,
+    'P': 0x7A31F4210,
+    'Q': 0x3A318D64D,
+    'R': 0x7A31F5251,
+    'S': 0x3E107043E,
+    'T': 0x7C8421084,
+    'U': 0x46318C62E,
+    'V': 0x46318C544,
+    'W': 0x4631AD771,
+    'X': 0x462A22A31,
+    'Y': 0x462A21084,
+    'Z': 0x7C222221F,
+    '[': 0x39084210E,
+    '\\': 0x020820820,
+    ']': 0x38421084E,
+    '^': 0x115100000,
+    '_': 0x00000001F,
+    '`': 0x208200000,
+    '{': 0x088441082,
+    '|': 0x108421084,
+    '}': 0x208411088,
+    '~': 0x0008A8800,
+})
+
+GAME_OVER = SMALL.variant({'G': 0x3A178C62E})
+
+
+def embolden(font):
+    """One column wider, every pixel doubled to the right."""
+    glyphs = {}
+    for ch in font:
+        code = 0
+        for row in font.rows(ch):
+            code = (code << (font.width + 1)) | (row << 1) | row
+        glyphs[ch] = code
+    return Font(font.width + 1, font.height, glyphs, font.fallback)
+
+
+# The wordmark letters are drawn by hand; the rest are SMALL, emboldened.
+BOLD = embolden(SMALL).variant({
+    'N': 0x33EFFDF3CF3,
+    'I': 0x3F30C30C33F,
+    'S': 0x1ECF0783CDE,
+    'H': 0x33CF3FF3CF3,
+    'A': 0x0C7B3FF3CF3,
+    'T': 0x3F30C30C30C,
+})
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Render shooter.gif natively from the contribution calendar.
+
+Replaces the gh-space-shooter action + add_game_over_shooter round trip:
+the game is simulated straight from the calendar and every frame is
+composed from cached sprites with the HUD drawn in the same pass, so no
+GIF is decoded and nothing is quantized twice.
+
+  1. simulate  — one enemy per day with contributions, its colour level
+                 doubling as hit points.  The ship flies to the nearest
+                 column that still needs shots and fires; a hit knocks the
+                 lowest cell of the column down one level, level 0 explodes
+                 and adds that day's count to the score.
+  2. compose   — the enemy field is one image patched only where a cell
+                 changed; a frame is a copy of it plus explosion, bullet
+                 and ship sprites and the (cached) HUD strip.
+  3. the STAGE CLEAR tail and encoding are shared with
+     add_game_over_shooter (stage_clear_frames / write_animation).
+
+Usage:
+    GITHUB_TOKEN=... python scripts/render_shooter.py shooter.gif
+    python scripts/render_shooter.py shooter.gif --frames 300 --format webp --scales 1,0.5
+"""
+import argparse, math, os, random, sys
+from functools import lru_cache
+
+from PIL import Image, ImageDraw
+
+import add_game_over_shooter as hud
+import calendar_grid
+import fetch_github_stats
+import frame_store
+import generate_snake
+import perf
+
+GAME_SIZE = (860, 230)
+ROWS = 7
+CELL, GAP = 11, 3
+PITCH = CELL + GAP
+FIELD_TOP = 16
+SHIP_W, SHIP_H = 30, 20
+SHIP_SPEED = 14          # px per step
+BULLET_SPEED = 12        # px per step
+BULLET_W, BULLET_H = 3, 6
+FIRE_EVERY = 2           # steps between shots
+EXPLOSION_STEPS = 8
+STEP_MS = 20
+LEVEL_COLORS = [tuple(int(c[i:i + 2], 16) for i in (1, 3, 5)) for c in generate_snake.LV]
+
+
+# ---------------------------------------------------------------------------
+# Simulation (no drawing)
+# ---------------------------------------------------------------------------
+class Game:
+    """
+    Deterministic game state.  step() advances one STEP_MS tick and returns
+    the cells whose level changed, so the renderer can patch its field.
+    """
+
+    def __init__(self, grid, size=GAME_SIZE, seed=7, thresholds=None):
+        w, h = size
+        cols = len(grid)
+        if cols * PITCH - GAP > w:
+            raise ValueError(f"{cols} columns do not fit in {w}px")
+        self.size = size
+        self.left = (w - (cols * PITCH - GAP)) // 2
+        self.ship_y = h - SHIP_H - 8
+        self.rng = random.Random(seed)
+        lvl = calendar_grid.levels(grid, thresholds)
+        self.hp, self.value = {}, {}
+        for c, week in enumerate(grid):
+            for r, count in enumerate(week):
+                level = lvl[r][c]
+                if level:
+                    self.hp[(c, r)] = level
+                    self.value[(c, r)] = count
+        self.start_levels = dict(self.hp)
+        self.column_hp = {}          # column -> summed hit points left
+        self.column_rows = {}        # column -> rows still alive
+        for (c, r), level in self.hp.items():
+            self.column_hp[c] = self.column_hp.get(c, 0) + level
+            self.column_rows.setdefault(c, set()).add(r)
+        self.pending = {}            # column -> damage already in flight
+        self.bullets = []            # [x, y, column]
+        self.explosions = []         # [x, y, age]
+        self.ship_x = (w - SHIP_W) / 2
+        self.target = None
+        self.score = 0
+        self.steps = 0
+
+    def cell_box(self, c, r):
+        x, y = self.left + c * PITCH, FIELD_TOP + r * PITCH
+        return x, y, x + CELL, y + CELL
+
+    def column_x(self, c):
+        return self.left + c * PITCH + CELL // 2
+
+    def _needs_shots(self, c):
+        return self.column_hp.get(c, 0) > self.pending.get(c, 0)
+
+    def _pick_target(self):
+        cols = [c for c in self.column_hp if self._needs_shots(c)]
+        if not cols:
+            return None
+        ship_cx = self.ship_x + SHIP_W / 2
+        best = min(abs(self.column_x(c) - ship_cx) for c in cols)
+        near = sorted(c for c in cols if abs(self.column_x(c) - ship_cx) == best)
+        return self.rng.choice(near)
+
+    @property
+    def done(self):
+        return not self.hp and not self.bullets and not self.explosions
+
+    def step(self):
+        changed = []
+        self.steps += 1
+
+        # Ship: fly to the target column, fire when lined up
+        if self.target is None or not self._needs_shots(self.target):
+            self.target = self._pick_target()
+        if self.target is not None:
+            dx = self.column_x(self.target) - (self.ship_x + SHIP_W / 2)
+            self.ship_x += max(-SHIP_SPEED, min(SHIP_SPEED, dx))
+            if abs(dx) <= SHIP_SPEED and self.steps % FIRE_EVERY == 0:
+                self.bullets.append([self.column_x(self.target) - BULLET_W // 2,
+                                     self.ship_y - BULLET_H, self.target])
+                self.pending[self.target] = self.pending.get(self.target, 0) + 1
+
+        # Bullets: hit the lowest live cell of their column
+        flying = []
+        for b in self.bullets:
+            b[1] -= BULLET_SPEED
+            c = b[2]
+            rows = self.column_rows.get(c)
+            if rows and b[1] <= self.cell_box(c, max(rows))[3]:
+                cell = (c, max(rows))
+                self.pending[c] -= 1
+                self.column_hp[c] -= 1
+                self.hp[cell] -= 1
+                changed.append(cell)
+                if self.hp[cell] == 0:
+                    del self.hp[cell]
+                    rows.discard(cell[1])
+                    if not rows:
+                        del self.column_rows[c], self.column_hp[c]
+                    self.score += self.value[cell]
+                    x0, y0, _, _ = self.cell_box(*cell)
+                    self.explosions.append([x0 + CELL // 2, y0 + CELL // 2, 0])
+            elif b[1] + BULLET_H > 0:
+                flying.append(b)
+            else:
+                self.pending[c] -= 1
+        self.bullets = flying
+
+        for e in self.explosions:
+            e[2] += 1
+        self.explosions = [e for e in self.explosions if e[2] < EXPLOSION_STEPS]
+        return changed
+
+
+def count_steps(grid, size=GAME_SIZE, seed=7, limit=100000, thresholds=None):
+    game = Game(grid, size, seed, thresholds)
+    while not game.done and game.steps < limit:
+        game.step()
+    return game.steps
+
+
+# ---------------------------------------------------------------------------
+# Sprites (built once, reused by every frame)
+# ---------------------------------------------------------------------------
+@lru_cache(maxsize=None)
+def ship_sprite():
+    im = Image.new('RGBA', (SHIP_W, SHIP_H), (0, 0, 0, 0))
+    d = ImageDraw.Draw(im)
+    d.polygon([(SHIP_W // 2, 0), (0, SHIP_H - 1), (SHIP_W - 1, SHIP_H - 1)],
+              fill=hud.SHIP_BLUE)
+    d.rectangle([SHIP_W // 2 - 1, 6, SHIP_W // 2 + 1, 9], fill=hud.WHITE)
+    return im
+
+
+@lru_cache(maxsize=None)
+def explosion_sprite(age):
+    """Expanding ring, gold -> red -> gone, centred in a square sprite."""
+    size = CELL + 12
+    im = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    d = ImageDraw.Draw(im)
+    t = age / (EXPLOSION_STEPS - 1)
+    r = 3 + t * (size / 2 - 3)
+    alpha = int(255 * (1 - t * 0.8))
+    color = hud.GOLD if t < 0.5 else hud.RED_FULL
+    c = size / 2
+    d.ellipse([c - r, c - r, c + r, c + r], outline=(*color, alpha), width=2)
+    if t < 0.4:
+        d.ellipse([c - r / 2, c - r / 2, c + r / 2, c + r / 2], fill=(*hud.WHITE, alpha))
+    return im
+
+
+@lru_cache(maxsize=256)
+def hud_strip(width, score, level, lives_halves, blink_on):
+    im = Image.new('RGB', (width, hud.HUD_H), hud.BG_COLOR)
+    hud.draw_hud(ImageDraw.Draw(im), width, score, level, lives_halves,
+                 frame_index=0 if blink_on else 4)
+    return im
+
+
+# ---------------------------------------------------------------------------
+# Rendering
+# ---------------------------------------------------------------------------
+def render_frames(grid, put, level=1, lives_halves=10, size=GAME_SIZE,
+                  max_frames=300, seed=7, thresholds=None):
+    """
+    Simulate and compose the game, handing each frame to put(frame, ms).
+    Steps are sampled evenly so at most max_frames frames are drawn; each
+    lasts (steps per frame) × STEP_MS.  Returns (durations, last game
+    area, final score).
+    """
+    w, h = size
+    total_steps = count_steps(grid, size, seed, thresholds=thresholds)
+    stride = max(1, math.ceil(total_steps / max_frames))
+    game = Game(grid, size, seed, thresholds)
+
+    canvas = Image.new('RGB', (w, h + hud.HUD_H), hud.BG_COLOR)
+    for cell, lv in game.start_levels.items():
+        x0, y0, x1, y1 = game.cell_box(*cell)
+        canvas.paste(LEVEL_COLORS[lv], (x0, y0 + hud.HUD_H, x1, y1 + hud.HUD_H))
+
+    durations = []
+    frame = canvas
+    with perf.stage("simulate+compose"):
+        while True:
+            # total_steps is capped by count_steps' limit: a game that never
+            # clears the grid stops there instead of running forever
+            finished = game.done or game.steps >= total_steps
+            if game.steps % stride == 0 or finished:
+                frame = canvas.copy()
+                blink_on = (len(durations) // 4) % 2 == 0
+                frame.paste(hud_strip(w, game.score, level, lives_halves, blink_on), (0, 0))
+                for x, y, age in game.explosions:
+                    sprite = explosion_sprite(age)
+                    frame.paste(sprite, (x - sprite.width // 2,
+                                         y - sprite.height // 2 + hud.HUD_H), sprite)
+                for x, y, _ in game.bullets:
+                    frame.paste(hud.WHITE, (x, y + hud.HUD_H, x + BULLET_W,
+                                            y + BULLET_H + hud.HUD_H))
+                frame.paste(ship_sprite(), (round(game.ship_x), game.ship_y + hud.HUD_H),
+                            ship_sprite())
+                put(frame, stride * STEP_MS)
+                durations.append(stride * STEP_MS)
+            if finished:
+                break
+            for cell in game.step():
+                x0, y0, x1, y1 = game.cell_box(*cell)
+                color = LEVEL_COLORS[game.hp[cell]] if cell in game.hp else hud.BG_COLOR
+                canvas.paste(color, (x0, y0 + hud.HUD_H, x1, y1 + hud.HUD_H))
+    perf.count("simulated_steps", game.steps)
+    perf.count("game_frames", len(durations))
+    last_game = frame.crop((0, hud.HUD_H, w, h + hud.HUD_H))
+    return durations, last_game, game.score
+
+
+def render(output_path, grid, days_active=1, missed_days=0, size=GAME_SIZE,
+           max_frames=300, seed=7, frame_delay_ms=50, spill_dir=None, thresholds=None,
+           **encode):
+    """
+    Render the full animation (game + STAGE CLEAR tail) to output_path.
+    `encode` is passed to add_game_over_shooter.write_animation (fmt,
+    max_bytes, max_fps, colors, workers, scales, compare).
+    """
+    if encode.get("max_bytes") and encode.get("fmt", "gif") != "gif":
+        raise ValueError("max_bytes is only supported for GIF output")
+    output_path = hud.output_path_for(output_path, encode.get("fmt", "gif"))
+    lives_halves = max(0, 10 - min(10, missed_days))
+    put, finish = frame_store.sink((size[0], size[1] + hud.HUD_H), spill_dir, "shooter")
+    all_durations, last_game, score = render_frames(
+        grid, put, days_active, lives_halves, size, max_frames, seed, thresholds)
+    print(f"  {len(all_durations)} game frames ({sum(all_durations) / 1000:.1f}s), "
+          f"score {score}")
+    with perf.stage("stage_clear"):
+        for f, d in hud.stage_clear_frames(last_game, score, days_active, lives_halves,
+                                           frame_delay_ms):
+            put(f, d)
+            all_durations.append(d)
+    all_frames = finish()
+
+    try:
+        return hud.write_animation(all_frames, all_durations, output_path,
+                                   spill_dir=spill_dir, **encode)
+    finally:
+        frame_store.discard(all_frames)
+
+
+def random_grid(weeks=generate_snake.COLS, seed=7):
+    """Offline stand-in: a seeded calendar shaped like a real one."""
+    rng = random.Random(seed)
+    return [[0 if rng.random() < 0.35 else int(rng.expovariate(1 / 5)) + 1
+             for _ in range(ROWS)] for _ in range(weeks)]
+
+
+def parse_game_size(text):
+    w, _, h = text.lower().partition("x")
+    return int(w), int(h)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("output", nargs="?", default="shooter.gif")
+    ap.add_argument("--user", default=os.environ.get("GITHUB_USER", "nnish16"))
+    ap.add_argument("--frames", type=int, default=300, help="max game frames")
+    ap.add_argument("--size", type=parse_game_size, default=GAME_SIZE,
+                    help="game area WxH (the HUD adds %dpx on top)" % hud.HUD_H)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--format", choices=sorted(hud.OUTPUT_FORMATS), default="gif")
+    ap.add_argument("--max-bytes", type=hud.parse_size, default=None)
+    ap.add_argument("--max-fps", type=float, default=None)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--scales", type=hud.parse_scales, default=(1,))
+    ap.add_argument("--spill-dir", default=None)
+    ap.add_argument("--profile", default=None, metavar="REPORT.json",
+                    help="write a perf.profiling report")
+    args = ap.parse_args(argv)
+
+    token = os.environ.get("GITHUB_TOKEN", os.environ.get("METRICS_TOKEN", ""))
+    calendar = None
+    if token:
+        try:
+            calendar = fetch_github_stats.fetch_calendar(args.user, token)
+        except Exception as e:
+            print(f"Warning: GitHub API error — {e}", file=sys.stderr)
+    thresholds = None
+    if calendar:
+        grid = generate_snake.grid_from_weeks(calendar["weeks"])
+        thresholds = calendar_grid.calendar_thresholds(calendar, generate_snake.COLS)
+        stats = fetch_github_stats.compute_stats(
+            calendar["total"], fetch_github_stats.flatten_days(calendar))
+    else:
+        grid = random_grid(seed=args.seed)
+        stats = fetch_github_stats.fallback_stats()
+
+    def run():
+        render(args.output, grid, stats["days_with_contributions"],
+               stats["missed_days_last_10"], size=args.size, max_frames=args.frames,
+               seed=args.seed, spill_dir=args.spill_dir, thresholds=thresholds,
+               fmt=args.format,
+               max_bytes=args.max_bytes, max_fps=args.max_fps, workers=args.workers,
+               scales=args.scales)
+
+    if args.profile:
+        with perf.profiling(args.profile) as rec:
+            run()
+        for name, sec in rec.as_dict().items():
+            print(f"  {name:<16} {sec:8.3f}s")
+    else:
+        run()
+
+
+if __name__ == "__main__":
+    main()
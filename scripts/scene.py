@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Keyframe timelines shared by the animated outputs.
+
+A Track is a list of (seconds, value) keyframes plus an easing.  It is
+declared once and then serialized by whichever backend needs it:
+
+    fade = Track([(0, 1), (10, 1), (10.15, 0), (16, 0), (18, 1), (20, 1)])
+    animate("opacity", fade, dur=20)        # SMIL <animate .../>
+    css_keyframes("fade", "opacity", fade, dur=20)   # CSS @keyframes rule
+    fade.at(t)                              # raster frames, sampled in Python
+
+Easing is "linear", "discrete" (hold each value until the next key) or a
+cubic-bezier name from EASINGS; SMIL uses calcMode/keySplines and CSS
+animation-timing-function, so all three backends agree.
+
+Track.simplified() drops keys that do not change the curve (collinear
+points on linear tracks, repeated values elsewhere).  The snake's head
+path, sampled per cell, collapses to its row corners that way.
+"""
+import bisect
+
+EASINGS = {
+    "ease": (0.25, 0.1, 0.25, 1),
+    "ease-in": (0.42, 0, 1, 1),
+    "ease-out": (0, 0, 0.58, 1),
+    "ease-in-out": (0.42, 0, 0.58, 1),
+}
+
+
+class Track:
+    """(seconds, value) keyframes with strictly ordered (or equal, for jumps) times."""
+
+    __slots__ = ("keys", "easing", "_times")
+
+    def __init__(self, keys, easing="linear"):
+        if easing not in ("linear", "discrete") and easing not in EASINGS:
+            raise ValueError(f"unknown easing {easing!r}")
+        self.keys = list(keys)
+        if not self.keys:
+            raise ValueError("a track needs at least one keyframe")
+        self._times = [t for t, _ in self.keys]
+        if self._times != sorted(self._times):
+            raise ValueError("keyframe times must not decrease")
+        self.easing = easing
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __iter__(self):
+        return iter(self.keys)
+
+    def __eq__(self, other):
+        return (isinstance(other, Track) and self.keys == other.keys
+                and self.easing == other.easing)
+
+    def __repr__(self):
+        return f"Track({self.keys!r}, {self.easing!r})"
+
+    def at(self, t):
+        """Value at time t (clamped to the first/last key outside the range)."""
+        i = bisect.bisect_right(self._times, t)
+        if i == 0:
+            return self.keys[0][1]
+        if i == len(self.keys):
+            return self.keys[-1][1]
+        (t0, v0), (t1, v1) = self.keys[i - 1], self.keys[i]
+        if self.easing == "discrete":
+            return v0
+        p = (t - t0) / (t1 - t0)
+        if self.easing != "linear":
+            p = bezier(EASINGS[self.easing], p)
+        return v0 + (v1 - v0) * p
+
+    def simplified(self, tol=1e-6):
+        """
+        Equivalent track without redundant keys.  Linear tracks drop every
+        key where the slope does not change (within tol per second), in one
+        pass; other easings only drop keys that repeat the previous value.
+        """
+        keys = self.keys
+        if len(keys) <= 2:
+            return self
+        if self.easing != "linear":
+            out = [keys[0]]
+            for i in range(1, len(keys) - 1):
+                t, v = keys[i]
+                if v == out[-1][1] and (self.easing == "discrete" or v == keys[i + 1][1]):
+                    continue
+                out.append(keys[i])
+            out.append(keys[-1])
+            return Track(out, self.easing)
+
+        # single pass: a key is a corner when the slope into it (from the
+        # last kept key) and out of it differ by more than tol
+        out = [keys[0]]
+        t0, v0 = keys[0]
+        (t, v), rest = keys[1], keys[2:]
+        for t1, v1 in rest:
+            # t == t0 or t == t1 is a jump: keeps the curve's discontinuity
+            if t == t0 or t == t1 or abs((v - v0) / (t - t0) - (v1 - v) / (t1 - t)) > tol:
+                out.append((t, v))
+                t0, v0 = t, v
+            t, v = t1, v1
+        out.append(keys[-1])
+        # equal-time pairs (jumps) survive above; collapse exact duplicates
+        out = [k for j, k in enumerate(out) if j == 0 or k != out[j - 1]]
+        return Track(out, self.easing)
+
+
+def bezier(points, x):
+    """y of the CSS cubic-bezier(x1, y1, x2, y2) easing at progress x."""
+    x1, y1, x2, y2 = points
+
+    def coord(a, b, s):
+        return ((1 - 3*b + 3*a) * s + (3*b - 6*a)) * s * s + 3*a * s
+
+    lo, hi = 0.0, 1.0
+    for _ in range(30):               # x(s) is monotonic on [0, 1]
+        mid = (lo + hi) / 2
+        if coord(x1, x2, mid) < x:
+            lo = mid
+        else:
+            hi = mid
+    return coord(y1, y2, (lo + hi) / 2)
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+def _fmt(v):
+    return f"{v:g}" if isinstance(v, (int, float)) else str(v)
+
+
+def smil_values(track, dur):
+    """(values, keyTimes) attribute strings; keyTimes span exactly 0..1."""
+    keys = track.keys
+    if keys[0][0] > 0:
+        keys = [(0, keys[0][1])] + keys
+    if keys[-1][0] < dur:
+        keys = keys + [(dur, keys[-1][1])]
+    values = ";".join(_fmt(v) for _, v in keys)
+    times = ["0"] + [f"{t/dur:.4f}" for t, _ in keys[1:-1]] + ["1"]
+    return values, ";".join(times)
+
+
+def animate(attr, track, dur, repeat=True):
+    """A SMIL <animate> element for `attr` over one `dur`-second cycle."""
+    values, times = smil_values(track, dur)
+    mode = ""
+    if track.easing == "discrete":
+        mode = ' calcMode="discrete"'
+    elif track.easing != "linear":
+        spline = " ".join(_fmt(c) for c in EASINGS[track.easing])
+        mode = f' calcMode="spline" keySplines="{";".join([spline] * (len(times.split(";")) - 1))}"'
+    end = 'repeatCount="indefinite"' if repeat else 'fill="freeze"'
+    return (f'<animate attributeName="{attr}" values="{values}" keyTimes="{times}"'
+            f'{mode} dur="{_fmt(dur)}s" {end}/>')
+
+
+def css_timing(track):
+    if track.easing == "discrete":
+        return "step-end"
+    if track.easing == "linear":
+        return "linear"
+    return "cubic-bezier(%s)" % ",".join(_fmt(c) for c in EASINGS[track.easing])
+
+
+def css_keyframes(name, prop, track, dur, unit=""):
+    """An @keyframes rule for `prop`; pair it with css_animation()."""
+    stops = []
+    for t, v in track.keys:
+        pct = f"{100 * t / dur:.2f}".rstrip("0").rstrip(".")
+        stops.append(f"{pct}%{{{prop}:{_fmt(v)}{unit}}}")
+    return f"@keyframes {name}{{{''.join(stops)}}}"
+
+
+def css_animation(name, track, dur, repeat=True):
+    """Value for the `animation` property running css_keyframes(name, ...)."""
+    tail = "infinite" if repeat else "forwards"
+    return f"{name} {_fmt(dur)}s {css_timing(track)} {tail}"
+
+
+def frame_times(dur, fps, tick_ms=10):
+    """
+    [(t_seconds, duration_ms)] for sampling one `dur` cycle at `fps`.
+    Durations are whole `tick_ms` (GIF delays are in 10 ms units) and
+    still add up to `dur`.
+    """
+    n = max(1, round(dur * fps))
+    edges = [round(i * dur * 1000 / tick_ms / n) * tick_ms for i in range(n + 1)]
+    return [(i * dur / n, edges[i + 1] - edges[i]) for i in range(n)]
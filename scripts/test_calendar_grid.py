@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Behaviour checks for calendar_grid's quantile/thresholds/levels.
+
+    python -m pytest scripts/test_calendar_grid.py
+    python scripts/test_calendar_grid.py          # same checks, no pytest
+"""
+import random, statistics
+from collections import Counter
+
+import calendar_grid
+
+
+def test_quantile_matches_statistics():
+    rng = random.Random(3)
+    for _ in range(200):
+        values = [rng.randint(1, 40) for _ in range(rng.randint(2, 60))]
+        expected = statistics.quantiles(values, n=4, method="inclusive")
+        got = [calendar_grid.quantile(Counter(values), q) for q in (0.25, 0.5, 0.75)]
+        assert all(abs(a - b) < 1e-9 for a, b in zip(got, expected)), (values, got, expected)
+
+
+def test_thresholds_ignore_empty_days():
+    assert calendar_grid.thresholds([0, 0, 0]) == ()
+    assert calendar_grid.thresholds([0, 1, 2, 3, 4, 5, 0]) == \
+        calendar_grid.thresholds([1, 2, 3, 4, 5])
+    assert calendar_grid.thresholds([7]) == (7, 7, 7)
+
+
+def test_levels():
+    grid = [[0, 1, 2, 3, 4, 5, 100]]                 # one week column
+    bounds = calendar_grid.thresholds(grid[0])
+    assert bounds == (2.25, 3.5, 4.75)               # quartiles of 1..5, 100
+    assert [row[0] for row in calendar_grid.levels(grid)] == [0, 1, 1, 2, 3, 4, 4]
+    assert calendar_grid.levels(grid, bounds) == calendar_grid.levels(grid)
+    # one outlier only lifts its own day: the rest keep their levels
+    assert calendar_grid.levels([[0, 1, 2, 3, 4, 5, 10 ** 6]]) == calendar_grid.levels(grid)
+    # past TABLE_LIMIT the bisect path gives the same levels
+    big = [[c * calendar_grid.TABLE_LIMIT for c in col] for col in grid]
+    assert calendar_grid.levels(big) == calendar_grid.levels(grid)
+
+
+def test_calendar_thresholds_use_drawn_weeks():
+    def week(count):
+        return {"contributionDays": [{"weekday": d, "contributionCount": count}
+                                     for d in range(7)]}
+    calendar = {"weeks": [week(50)] * 10 + [week(c) for c in (1, 2, 3, 4)]}
+    assert calendar_grid.calendar_thresholds(calendar, 4) == \
+        list(calendar_grid.thresholds([1, 2, 3, 4] * 7))
+    assert calendar_grid.calendar_thresholds(calendar) != \
+        calendar_grid.calendar_thresholds(calendar, 4)
+    assert set(calendar["thresholds"]) == {4, None}
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_"):
+            fn()
+            print(f"ok  {name}")
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Rewrite the generated blocks of README.md.
+
+The README has marker pairs such as
+
+    <!-- START_VISUAL -->
+    ...
+    <!-- END_VISUAL -->
+
+and the workflows point the block at whatever they just rendered.  An
+asset can come with smaller variants for narrow screens; they are
+emitted as a <picture> element so phones fetch the small file.
+
+Asset URLs carry ``?v=<content hash>`` rather than a timestamp, so the
+README (and GitHub's image proxy cache) only changes when the bytes do.
+Without an asset argument the block is kept and only the ``?v=`` of the
+local assets it already references is refreshed:
+
+    python scripts/update_readme.py visual shooter.gif --source shooter@0.5x.gif:600
+    python scripts/update_readme.py visual snake.svg
+    python scripts/update_readme.py skills
+"""
+import argparse, hashlib, os, re, sys
+
+README = "README.md"
+
+
+def replace_block(text, name, body):
+    """Replace everything between START_<name> and END_<name> with body."""
+    pattern = re.compile(rf"(<!-- START_{name} -->)\n?.*?\n?(<!-- END_{name} -->)", re.DOTALL)
+    if not pattern.search(text):
+        raise LookupError(f"README has no START_{name}/END_{name} markers")
+    return pattern.sub(lambda m: f"{m.group(1)}\n{body}\n{m.group(2)}", text, count=1)
+
+
+# ./path?v=version inside src="..." / srcset="..."
+ASSET_URL = re.compile(r'\./([^"?\s]+)\?v=[0-9A-Za-z]*')
+
+
+def content_hash(path, length=10):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()[:length]
+
+
+def asset_url(path, base="."):
+    """./path?v=<hash of the file>, path relative to the README's directory."""
+    return f"./{path}?v={content_hash(os.path.join(base, path))}"
+
+
+def block_body(text, name):
+    m = re.search(rf"<!-- START_{name} -->\n?(.*?)\n?<!-- END_{name} -->", text, re.DOTALL)
+    if not m:
+        raise LookupError(f"README has no START_{name}/END_{name} markers")
+    return m.group(1)
+
+
+def rehash_urls(body, base="."):
+    """Point every ./asset?v=... in body at the asset's current content hash."""
+    def sub(m):
+        try:
+            return asset_url(m.group(1), base)
+        except FileNotFoundError:
+            print(f"Warning: {m.group(1)} not found, keeping its URL", file=sys.stderr)
+            return m.group(0)
+    return ASSET_URL.sub(sub, body)
+
+
+def visual_block(asset, sources=(), width="100%", base="."):
+    """
+    <img> for `asset`, or a <picture> when there are (path, max_width_px)
+    sources for narrower viewports (smallest breakpoint first).
+    """
+    img = f'<img src="{asset_url(asset, base)}" width="{width}" />'
+    if not sources:
+        return img
+    lines = ["<picture>"]
+    for path, max_width in sorted(sources, key=lambda s: s[1]):
+        lines.append(f'  <source media="(max-width: {max_width}px)" '
+                     f'srcset="{asset_url(path, base)}" />')
+    lines += [f"  {img}", "</picture>"]
+    return "\n".join(lines)
+
+
+def parse_source(text):
+    """'shooter@0.5x.gif:600' -> ('shooter@0.5x.gif', 600)"""
+    path, _, max_width = text.rpartition(":")
+    if not path or not max_width.isdigit():
+        raise argparse.ArgumentTypeError(f"expected PATH:MAX_WIDTH_PX, got {text!r}")
+    return path, int(max_width)
+
+
+def update(readme, block, body=None):
+    """
+    Replace the block with body (None: re-version its asset URLs).
+    Returns True if the README changed.
+    """
+    with open(readme) as f:
+        text = f.read()
+    if body is None:
+        body = rehash_urls(block_body(text, block), os.path.dirname(readme) or ".")
+    new = replace_block(text, block, body)
+    if new == text:
+        return False
+    with open(readme, "w") as f:
+        f.write(new)
+    return True
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("block", help="marker name, e.g. visual -> START_VISUAL")
+    ap.add_argument("asset", nargs="?",
+                    help="asset to show, relative to the README (omit to only "
+                         "refresh the ?v= hashes of the assets already in the block)")
+    ap.add_argument("--source", type=parse_source, action="append", default=[],
+                    help="PATH:MAX_WIDTH_PX variant for narrower screens (repeatable)")
+    ap.add_argument("--width", default="100%")
+    ap.add_argument("--readme", default=README)
+    args = ap.parse_args(argv)
+
+    if args.source and not args.asset:
+        ap.error("--source needs an asset")
+    base = os.path.dirname(args.readme) or "."
+    body = (visual_block(args.asset, args.source, args.width, base)
+            if args.asset else None)
+    changed = update(args.readme, args.block.upper(), body)
+    print(f"{args.readme}: {args.block.upper()} {'updated' if changed else 'unchanged'}")
+
+
+if __name__ == "__main__":
+    main()
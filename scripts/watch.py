@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Watch mode: re-render quick previews while the generators are edited.
+
+    python scripts/pipeline.py --watch                      # snake + shooter
+    python scripts/pipeline.py --watch --stages shooter --preview-fps 8
+
+The process keeps the expensive inputs in memory: the calendar, the
+decoded shooter frames, the HUD and STAGE CLEAR frames, and the caches
+(glyph masks, sprites) of every module that did not change.  It polls
+scripts/*.py and the shooter input; on a change it reloads the edited
+modules and the modules importing them, compares every top-level name
+with its previous source or value, and rebuilds a preview part only if
+a changed name is reachable from that part's entry point:
+
+    BODY_COLORS, LOOP, snake_track ...   -> snake
+    draw_hud, HUD_H, pixel_font ...      -> HUD frames + stage clear (it draws the HUD)
+    make_stage_clear_frame ...           -> stage clear only
+    shooter input file                   -> decode, then everything after it
+
+Previews go to --preview-dir: snake.svg, and shooter.gif retimed to
+--preview-fps.  The real outputs are never touched.
+"""
+import hashlib, importlib, inspect, linecache, os, re, sys, time, types
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+NATIVE_PREVIEW_FRAMES = 120
+_ADDRESS = re.compile(r" at 0x[0-9a-fA-F]+")
+
+
+# ---------------------------------------------------------------------------
+# Modules and what changed in them
+# ---------------------------------------------------------------------------
+def script_modules():
+    """Loaded modules from scripts/, minus the running script and this one."""
+    out = {}
+    for name, mod in list(sys.modules.items()):
+        path = getattr(mod, "__file__", None)
+        if (path and name not in ("__main__", "__mp_main__", __name__)
+                and os.path.dirname(os.path.abspath(path)) == SCRIPTS_DIR):
+            out[name] = mod
+    return out
+
+
+def mtimes(paths):
+    out = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+            out[path] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            out[path] = None
+    return out
+
+
+def _code_text(value):
+    """Source of a function/class, or None for anything else."""
+    value = getattr(value, "__wrapped__", value)          # lru_cache
+    if not (inspect.isfunction(value) or inspect.isclass(value)):
+        return None
+    try:
+        return inspect.getsource(value)
+    except (OSError, TypeError):
+        return value.__qualname__
+
+
+def _stable_repr(value):
+    """
+    repr() without per-reload noise: callables anywhere inside containers
+    (e.g. OUTPUT_FORMATS' encoders) become module.qualname plus source
+    instead of "<function ... at 0x...>".
+    """
+    if isinstance(value, dict):
+        return "{%s}" % ", ".join(f"{_stable_repr(k)}: {_stable_repr(v)}"
+                                  for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = sorted(value, key=repr) if isinstance(value, (set, frozenset)) else value
+        return "%s(%s)" % (type(value).__name__, ", ".join(_stable_repr(v) for v in items))
+    if inspect.ismodule(value):
+        return value.__name__
+    if callable(value) and hasattr(value, "__qualname__"):
+        inner = getattr(value, "__wrapped__", value)
+        return f"{getattr(inner, '__module__', '')}.{inner.__qualname__}" + (
+            _code_text(inner) or "")
+    text = repr(value)
+    if " at 0x" in text and hasattr(value, "__dict__"):
+        return type(value).__qualname__ + _stable_repr(dict(sorted(vars(value).items())))
+    return _ADDRESS.sub("", text)             # e.g. <_struct.Struct object at 0x...>
+
+
+def _digest(value):
+    """Stable fingerprint of a top-level name: source for code, repr for data."""
+    text = _code_text(value)
+    if text is None:
+        text = _stable_repr(value)
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def snapshot(modules):
+    """{(module, name): digest} of every public-or-private top-level name."""
+    linecache.checkcache()
+    return {(mod_name, attr): _digest(value)
+            for mod_name, mod in modules.items()
+            for attr, value in list(vars(mod).items()) if not attr.startswith("__")}
+
+
+def _module_deps(mod, names):
+    deps = set()
+    for value in list(vars(mod).values()):
+        home = value.__name__ if inspect.ismodule(value) else getattr(value, "__module__", None)
+        if home in names and home != mod.__name__:
+            deps.add(home)
+    return deps
+
+
+def reload_stale(modules, stale):
+    """
+    Reload the stale modules and everything that imports them, dependencies
+    first.  Returns the reloaded names, or raises the first import error.
+    """
+    deps = {name: _module_deps(mod, modules) for name, mod in modules.items()}
+    dirty = set(stale)
+    grew = True
+    while grew:
+        grew = False
+        for name, uses in deps.items():
+            if name not in dirty and uses & dirty:
+                dirty.add(name)
+                grew = True
+    order, seen = [], set()
+
+    def visit(name):
+        if name in seen:
+            return
+        seen.add(name)
+        for dep in sorted(deps[name]):
+            visit(dep)
+        order.append(name)
+    for name in sorted(dirty):
+        visit(name)
+    reloaded = []
+    for name in order:
+        if name in dirty:
+            importlib.reload(modules[name])
+            reloaded.append(name)
+    return reloaded
+
+
+def _code_names(code):
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _code_names(const)
+    return names
+
+
+def reachable(roots):
+    """
+    (module, name) pairs reachable from the root functions through global
+    names and module attributes (``hud.draw_hud``) in their code.
+    """
+    modules = script_modules()
+    seen, todo = set(), list(roots)
+    while todo:
+        key = todo.pop()
+        if key in seen or key[0] not in modules:
+            continue
+        seen.add(key)
+        g = vars(modules[key[0]])
+        value = getattr(g.get(key[1]), "__wrapped__", g.get(key[1]))
+        if inspect.isclass(value):
+            codes = [getattr(getattr(f, "__wrapped__", f), "__code__", None)
+                     for f in vars(value).values()]
+        elif not callable(value) and getattr(type(value), "__module__", None) in modules:
+            cls = type(value)                    # e.g. pixel_font.SMALL -> Font
+            todo.append((cls.__module__, cls.__name__))
+            continue
+        else:
+            codes = [getattr(value, "__code__", None)]
+        names = set()
+        for code in codes:
+            if code is not None:
+                names |= _code_names(code)
+        for n in names:
+            if n not in g:
+                continue
+            v = g[n]
+            if inspect.ismodule(v):
+                todo.extend((v.__name__, attr) for attr in names if hasattr(v, attr))
+                continue
+            todo.append((key[0], n))
+            home = getattr(v, "__module__", None)
+            if home != key[0] and hasattr(v, "__name__"):
+                todo.append((home, v.__name__))
+    return seen
+
+
+# ---------------------------------------------------------------------------
+# Preview parts
+# ---------------------------------------------------------------------------
+class Previews:
+    """
+    The preview parts in build order.  Each has entry points (roots), the
+    parts it consumes, and an optional input file; its result stays in
+    memory until one of those changes.
+    """
+
+    def __init__(self, args, calendar, stats):
+        self.args, self.calendar, self.stats = args, calendar, stats
+        os.makedirs(args.preview_dir, exist_ok=True)
+        self.results = {}
+        self.parts = []
+        if "snake" in args.stages:
+            self.add("snake", [("generate_snake", "generate")], self.build_snake)
+        if "shooter" in args.stages and args.shooter_native:
+            self.add("native", [("render_shooter", "render")], self.build_native)
+        elif "shooter" in args.stages:
+            hud = ("add_game_over_shooter",)
+            self.add("decode", [hud + ("decode_frames",)], self.build_decode,
+                     watch_file=args.shooter_input)
+            self.add("hud", [hud + ("hud_frames",)], self.build_hud, after=("decode",))
+            self.add("tail", [hud + ("stage_clear_frames",)], self.build_tail, after=("decode",))
+            self.add("shooter", [hud + ("retime",), ("gif_writer", "save_gif")],
+                     self.build_shooter, after=("hud", "tail"))
+
+    def add(self, name, roots, build, after=(), watch_file=None):
+        self.parts.append({"name": name, "roots": roots, "build": build,
+                           "after": after, "file": watch_file})
+
+    def files(self):
+        return [p["file"] for p in self.parts if p["file"]]
+
+    def update(self, changed_names, changed_files):
+        """Rebuild the parts affected by the changes -> names rebuilt."""
+        rebuilt = []
+        for part in self.parts:
+            name = part["name"]
+            hits = changed_names & reachable(part["roots"])
+            if (name in self.results and not hits and part["file"] not in changed_files
+                    and not any(dep in rebuilt for dep in part["after"])):
+                continue
+            why = (", ".join(sorted(f"{m}.{n}" for m, n in hits)[:4]) if hits
+                   else "first run" if name not in self.results else "inputs")
+            start = time.perf_counter()
+            self.results[name] = part["build"]()
+            print(f"  {name:<8} {time.perf_counter() - start:6.2f}s  ({why})")
+            rebuilt.append(name)
+        return rebuilt
+
+    # ---- builds ----
+    def grid(self):
+        import calendar_grid, generate_snake
+        if not self.calendar:
+            return None, None
+        return (generate_snake.grid_from_weeks(self.calendar["weeks"]),
+                calendar_grid.calendar_thresholds(self.calendar, generate_snake.COLS))
+
+    def build_snake(self):
+        import generate_snake
+        grid, thresholds = self.grid()
+        path = os.path.join(self.args.preview_dir, "snake.svg")
+        generate_snake.generate(path, self.args.text, grid, thresholds=thresholds)
+        return path
+
+    def build_native(self):
+        import render_shooter
+        grid, thresholds = self.grid()
+        path = os.path.join(self.args.preview_dir, "shooter.gif")
+        render_shooter.render(
+            path, grid if grid else render_shooter.random_grid(),
+            days_active=self.stats["days_with_contributions"],
+            missed_days=self.stats["missed_days_last_10"],
+            max_frames=min(self.args.shooter_frames, NATIVE_PREVIEW_FRAMES),
+            thresholds=thresholds, workers=self.args.shooter_workers,
+            max_fps=self.args.preview_fps)
+        return path
+
+    def _hud_args(self):
+        lives_halves = max(0, 10 - min(10, self.stats["missed_days_last_10"]))
+        return (self.stats["total_contributions"], self.stats["days_with_contributions"],
+                lives_halves)
+
+    def build_decode(self):
+        import add_game_over_shooter as hud
+        frames, durations = hud.decode_frames(self.args.shooter_input)
+        return list(frames), durations
+
+    def build_hud(self):
+        import add_game_over_shooter as hud
+        game, durations = self.results["decode"]
+        out = []
+        hud.hud_frames(game, durations, *self._hud_args(),
+                       lambda frame, duration: out.append((frame, duration)))
+        return out
+
+    def build_tail(self):
+        import add_game_over_shooter as hud
+        game, _ = self.results["decode"]
+        total, level, lives_halves = self._hud_args()
+        # same HUD blink phase as build_frames uses for the tail
+        return list(hud.stage_clear_frames(game[-1], total, level, lives_halves,
+                                           frame_index=len(game) + 9999))
+
+    def build_shooter(self):
+        import add_game_over_shooter as hud, gif_writer
+        frames = self.results["hud"] + self.results["tail"]
+        kept, durations = hud.retime([f for f, _ in frames], [d for _, d in frames],
+                                     self.args.preview_fps)
+        path = os.path.join(self.args.preview_dir, "shooter.gif")
+        gif_writer.save_gif([frames[i][0] for i in kept], path, duration=durations,
+                            loop=0, workers=self.args.shooter_workers)
+        return path
+
+
+def watch(args, calendar, stats, interval=0.5, cycles=None):
+    """
+    Build every preview once, then rebuild on changes until interrupted
+    (or after `cycles` rebuilds).
+    """
+    previews = Previews(args, calendar, stats)
+    print(f"Watching scripts/ -> previews in {args.preview_dir}/  (Ctrl-C to stop)")
+    try:
+        previews.update(set(), set())
+    except Exception as e:
+        print(f"  build failed: {type(e).__name__}: {e}", file=sys.stderr)
+    modules = script_modules()
+    digests = snapshot(modules)
+    seen = mtimes([m.__file__ for m in modules.values()] + previews.files())
+    done = 0
+    try:
+        while cycles is None or done < cycles:
+            time.sleep(interval)
+            modules = script_modules()
+            now = mtimes([m.__file__ for m in modules.values()] + previews.files())
+            changed_files = {p for p, stamp in now.items() if seen.get(p) != stamp}
+            if not changed_files:
+                continue
+            seen = now
+            stale = {name for name, m in modules.items() if m.__file__ in changed_files}
+            try:
+                reload_stale(modules, stale)
+            except Exception as e:
+                print(f"  reload failed: {type(e).__name__}: {e}", file=sys.stderr)
+                continue
+            after = snapshot(script_modules())
+            changed = {key for key, d in after.items() if digests.get(key) != d}
+            digests = after
+            if not changed and not changed_files & set(previews.files()):
+                print("  no effective change")
+                continue
+            try:
+                if not previews.update(changed, changed_files):
+                    print("  no preview affected by " + ", ".join(
+                        sorted(f"{m}.{n}" for m, n in changed)[:4]))
+            except Exception as e:
+                print(f"  build failed: {type(e).__name__}: {e}", file=sys.stderr)
+            done += 1
+    except KeyboardInterrupt:
+        pass